@@ -6,11 +6,20 @@ This script provides insights into category groupings and their daily/weekly tre
 
 import os
 import pandas as pd
+import argparse
+import matplotlib
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
 import numpy as np
-from db_utils import get_mysql_connection
+from report_data import load_history, load_stats_store
+from category_groups import CategoryClassifier, TREND_CATEGORY_GROUPS as CATEGORY_GROUPS
+from plot_pool import figure_pool
+from build_cache import BuildCache
+from correlation_engine import all_pairs, correlation_frame, top_pairs_of_frame
+from figure_output import (PROFILES, DEFAULT_PROFILE, FIGURE_STATS, active_profile, figure_file,
+                           save_figure, set_profile)
+from html_render import RowTemplate, escape, format_number, sign_class, write_table
 import re
 from pathlib import Path
 from collections import Counter
@@ -19,8 +28,13 @@ from sklearn.cluster import KMeans
 import matplotlib.dates as mdates
 
 # Set style for plots
-plt.style.use('fivethirtyeight')
-sns.set_palette("viridis")
+PLOT_STYLE = 'fivethirtyeight'
+PLOT_PALETTE = 'viridis'
+plt.style.use(PLOT_STYLE)
+sns.set_palette(PLOT_PALETTE)
+
+# Rendering settings that are not part of the report code, for the build cache
+PLOT_PARAMS = {'style': PLOT_STYLE, 'palette': PLOT_PALETTE, 'matplotlib': matplotlib.__version__}
 
 # Create reports directory if it doesn't exist
 REPORTS_DIR = Path(__file__).parent / 'reports'
@@ -28,121 +42,30 @@ CATEGORIES_DIR = REPORTS_DIR / 'categories_analysis'
 os.makedirs(REPORTS_DIR, exist_ok=True)
 os.makedirs(CATEGORIES_DIR, exist_ok=True)
 
-# Define main category groups based on keywords
-CATEGORY_GROUPS = {
-    'Development': [
-        'entwickl', 'develop', 'software', 'web', 'app', 'mobile', 'java', 'python', 
-        'c#', 'c++', '.net', 'php', 'javascript', 'typescript', 'react', 'angular', 
-        'vue', 'node', 'full-stack', 'frontend', 'backend', 'ios', 'android', 'swift', 
-        'kotlin', 'flutter', 'devops', 'docker', 'kubernetes', 'aws', 'azure', 'cloud',
-        'programm', 'coding', 'coder', 'entwickler'
-    ],
-    'Data': [
-        'data', 'analytics', 'business intelligence', 'bi', 'tableau', 'power bi',
-        'sql', 'database', 'datenbank', 'etl', 'data warehouse', 'data lake',
-        'big data', 'hadoop', 'spark', 'data science', 'machine learning', 'ml',
-        'ai', 'artificial intelligence', 'deep learning', 'nlp', 'statistik', 'daten',
-        'analyst', 'scientist', 'engineer'
-    ],
-    'Management': [
-        'project', 'projekt', 'management', 'manager', 'pmo', 'scrum', 'agile',
-        'product owner', 'po', 'scrum master', 'kanban', 'lean', 'projektleiter',
-        'projektmanager', 'projektleitung', 'führung', 'lead', 'leitung'
-    ],
-    'Design': [
-        'design', 'ux', 'ui', 'user experience', 'user interface', 'graphic',
-        'grafik', 'visual', 'creative', 'kreativ', 'illustration', 'animation',
-        'video', 'media', 'medien', '3d', 'cad'
-    ],
-    'Infrastructure': [
-        'system', 'network', 'netzwerk', 'security', 'sicherheit', 'admin',
-        'administrator', 'it-administration', 'support', 'helpdesk', 'service desk',
-        'infrastructure', 'infrastruktur', 'server', 'hardware', 'virtualization',
-        'vmware', 'hyper-v', 'windows', 'linux', 'unix'
-    ],
-    'SAP': [
-        'sap', 'abap', 's/4hana', 'erp', 'fi', 'co', 'mm', 'sd', 'pp', 'hcm',
-        'crm', 'bw', 'fiori', 'hana'
-    ],
-    'Testing': [
-        'test', 'qa', 'quality assurance', 'qualitätssicherung', 'testing',
-        'tester', 'selenium', 'cypress', 'automation', 'automatisierung'
-    ],
-    'Consulting': [
-        'consulting', 'beratung', 'berater', 'consultant', 'strategy', 'strategie',
-        'business', 'geschäft', 'process', 'prozess', 'optimization', 'optimierung'
-    ],
-    'Marketing': [
-        'marketing', 'seo', 'sea', 'sem', 'social media', 'content', 'online marketing',
-        'digital marketing', 'e-commerce', 'ecommerce', 'crm', 'customer', 'kunde'
-    ],
-    'Healthcare': [
-        'gesundheit', 'health', 'medical', 'medizin', 'arzt', 'ärzte', 'pflege', 
-        'pharma', 'krankenhaus', 'hospital', 'klinik', 'clinic'
-    ],
-    'Engineering': [
-        'ingenieur', 'engineer', 'maschinenbau', 'mechanical', 'electrical', 
-        'elektronik', 'elektro', 'automotive', 'automobil', 'construction', 'bau'
-    ],
-    'Finance': [
-        'finanz', 'finance', 'accounting', 'buchhaltung', 'controlling', 'bank', 
-        'versicherung', 'insurance', 'steuer', 'tax', 'wirtschaft', 'economic'
-    ],
-    'Legal': [
-        'legal', 'recht', 'law', 'anwalt', 'attorney', 'compliance', 'vertrag', 
-        'contract', 'datenschutz', 'privacy'
-    ],
-    'Location': [
-        'deutschland', 'germany', 'berlin', 'hamburg', 'münchen', 'munich', 'köln', 
-        'cologne', 'frankfurt', 'stuttgart', 'düsseldorf', 'dortmund', 'essen', 
-        'bremen', 'dresden', 'leipzig', 'hannover', 'nürnberg', 'nuremberg', 
-        'duisburg', 'bochum', 'wuppertal', 'bielefeld', 'bonn', 'mannheim',
-        'nordrhein-westfalen', 'bayern', 'bavaria', 'baden-württemberg', 'hessen',
-        'niedersachsen', 'sachsen', 'rheinland-pfalz', 'berlin', 'schleswig-holstein',
-        'brandenburg', 'sachsen-anhalt', 'thüringen', 'hamburg', 'mecklenburg-vorpommern',
-        'saarland', 'bremen'
-    ],
-    'Work Model': [
-        'remote', 'vor ort', 'hybrid', 'homeoffice', 'home office', 'onsite', 
-        'on-site', 'offsite', 'off-site', 'freiberuflich', 'freelance'
-    ]
-}
 
-def fetch_data():
-    """Fetch data from MySQL database."""
-    conn = get_mysql_connection()
-    try:
-        # Fetch projects data with all dates
-        projects_df = pd.read_sql("""
-            SELECT date, category, num, href 
-            FROM projects 
-            ORDER BY date, category
-        """, conn)
-        
-        # Convert date strings to datetime objects
-        projects_df['date'] = pd.to_datetime(projects_df['date'])
-        
-        # Convert num to integer
-        projects_df['num'] = pd.to_numeric(projects_df['num'], errors='coerce').fillna(0).astype(int)
-        
-        return projects_df
-    
-    finally:
-        conn.close()
+# Compiled once; classifies each distinct category a single time
+CLASSIFIER = CategoryClassifier(CATEGORY_GROUPS)
+
+# Table rows of the HTML report, parsed once
+GROUP_GROWTH_ROW = RowTemplate("""
+                    <tr>
+                        <td>$group</td>
+                        <td>$first_avg</td>
+                        <td>$last_avg</td>
+                        <td class="$growth_class">$growth_rate</td>
+                    </tr>
+            """)
+CORRELATION_ROW = RowTemplate("""
+                    <tr>
+                        <td>$group1</td>
+                        <td>$group2</td>
+                        <td class="$corr_class">$correlation</td>
+                    </tr>
+            """)
 
 def assign_category_group(category):
     """Assign a category to a group based on keywords."""
-    if pd.isna(category) or category == '':
-        return 'Other'
-    
-    category_lower = category.lower()
-    
-    for group, keywords in CATEGORY_GROUPS.items():
-        for keyword in keywords:
-            if keyword.lower() in category_lower:
-                return group
-    
-    return 'Other'
+    return CLASSIFIER.classify(category)
 
 def analyze_distinct_categories(df):
     """Analyze distinct categories and their groupings."""
@@ -184,8 +107,7 @@ def analyze_distinct_categories(df):
                  f'{int(height)}', ha='center', va='bottom', rotation=0)
     
     plt.tight_layout()
-    plt.savefig(CATEGORIES_DIR / 'category_groups_distribution.png', dpi=300)
-    plt.close()
+    FIGURE_STATS.add(save_figure(CATEGORIES_DIR, 'category_groups_distribution'))
     
     # Create a detailed report
     with open(CATEGORIES_DIR / 'category_groups_report.txt', 'w') as f:
@@ -202,82 +124,45 @@ def analyze_distinct_categories(df):
     # Return the grouped categories for further analysis
     return category_groups
 
-def analyze_daily_trends(df, category_groups):
-    """Analyze daily trends for each category group."""
-    print("Analyzing daily trends...")
-    
-    # Add group column to the dataframe
-    df['group'] = df['category'].apply(assign_category_group)
-    
-    # Get date range
-    min_date = df['date'].min()
-    max_date = df['date'].max()
-    date_range = (max_date - min_date).days
-    
-    print(f"Analyzing trends over {date_range} days from {min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')}")
-    
-    # Aggregate by date and group
-    daily_trends = df.groupby(['date', 'group'])['num'].sum().reset_index()
-    
-    # Create a pivot table for easier plotting
-    pivot_trends = daily_trends.pivot(index='date', columns='group', values='num')
-    
-    # Fill NaN values with 0
-    pivot_trends = pivot_trends.fillna(0)
-    
-    # Plot trends for each group
-    for group in pivot_trends.columns:
-        if group == 'Other':
-            continue  # Skip the "Other" group
-            
-        plt.figure(figsize=(14, 8))
-        plt.plot(pivot_trends.index, pivot_trends[group], marker='', linewidth=2)
-        plt.title(f'Daily Trend for {group} Category')
-        plt.xlabel('Date')
-        plt.ylabel('Number of Projects')
-        plt.grid(True, linestyle='--', alpha=0.7)
-        
-        # Format x-axis to show dates nicely
-        plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-        plt.gca().xaxis.set_major_locator(mdates.MonthLocator())
-        plt.gcf().autofmt_xdate()
-        
-        plt.tight_layout()
-        plt.savefig(CATEGORIES_DIR / f'daily_trend_{group}.png', dpi=300)
-        plt.close()
-    
-    # Plot trends for top 5 groups
-    top_groups = pivot_trends.mean().sort_values(ascending=False).head(5).index
+def _format_date_axis():
+    """Format x-axis to show dates nicely."""
+    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+    plt.gca().xaxis.set_major_locator(mdates.MonthLocator())
+    plt.gcf().autofmt_xdate()
+
+def plot_group_daily_trend(series, group, stem):
+    """Plot the daily totals of one group (runs in a figure_pool worker)."""
+    plt.figure(figsize=(14, 8))
+    plt.plot(series.index, series, marker='', linewidth=2)
+    plt.title(f'Daily Trend for {group} Category')
+    plt.xlabel('Date')
+    plt.ylabel('Number of Projects')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    _format_date_axis()
     
+    plt.tight_layout()
+    return save_figure(CATEGORIES_DIR, stem)
+
+def plot_top_groups_daily(top_trends, stem):
+    """Plot the daily totals of the top groups, one column each."""
     plt.figure(figsize=(14, 8))
-    for group in top_groups:
-        plt.plot(pivot_trends.index, pivot_trends[group], marker='', linewidth=2, label=group)
+    for group in top_trends.columns:
+        plt.plot(top_trends.index, top_trends[group], marker='', linewidth=2, label=group)
     
     plt.title('Daily Trends for Top 5 Category Groups')
     plt.xlabel('Date')
     plt.ylabel('Number of Projects')
     plt.legend(loc='upper left', bbox_to_anchor=(1, 1))
     plt.grid(True, linestyle='--', alpha=0.7)
-    
-    # Format x-axis to show dates nicely
-    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-    plt.gca().xaxis.set_major_locator(mdates.MonthLocator())
-    plt.gcf().autofmt_xdate()
+    _format_date_axis()
     
     plt.tight_layout()
-    plt.savefig(CATEGORIES_DIR / 'daily_trends_top_groups.png', dpi=300)
-    plt.close()
-    
-    # Calculate weekly averages to smooth out the data
-    pivot_trends['week'] = pivot_trends.index.isocalendar().week
-    pivot_trends['year'] = pivot_trends.index.isocalendar().year
-    
-    weekly_trends = pivot_trends.groupby(['year', 'week']).mean()
-    weekly_trends.index = weekly_trends.index.map(lambda x: f"{x[0]}-W{x[1]:02d}")
-    
-    # Plot weekly trends for top 5 groups
+    return save_figure(CATEGORIES_DIR, stem)
+
+def plot_top_groups_weekly(weekly_trends, stem):
+    """Plot the weekly averages of the top groups, indexed by week label."""
     plt.figure(figsize=(14, 8))
-    for group in top_groups:
+    for group in weekly_trends.columns:
         plt.plot(weekly_trends.index, weekly_trends[group], marker='o', linewidth=2, label=group)
     
     plt.title('Weekly Trends for Top 5 Category Groups')
@@ -288,38 +173,12 @@ def analyze_daily_trends(df, category_groups):
     plt.xticks(rotation=45, ha='right')
     
     plt.tight_layout()
-    plt.savefig(CATEGORIES_DIR / 'weekly_trends_top_groups.png', dpi=300)
-    plt.close()
-    
-    # Calculate growth rates for each group
-    growth_rates = {}
-    
-    for group in pivot_trends.columns:
-        if group in ['week', 'year'] or group == 'Other':
-            continue
-            
-        # Get the first and last 30 days average
-        first_30_days = pivot_trends[group].head(30).mean()
-        last_30_days = pivot_trends[group].tail(30).mean()
-        
-        if first_30_days > 0:
-            growth_rate = ((last_30_days - first_30_days) / first_30_days) * 100
-        else:
-            growth_rate = 0 if last_30_days == 0 else float('inf')
-            
-        growth_rates[group] = {
-            'first_30_days_avg': first_30_days,
-            'last_30_days_avg': last_30_days,
-            'growth_rate': growth_rate
-        }
-    
-    # Convert to DataFrame for easier visualization
-    growth_df = pd.DataFrame.from_dict(growth_rates, orient='index')
-    growth_df = growth_df.sort_values('growth_rate', ascending=False)
-    
-    # Plot growth rates
+    return save_figure(CATEGORIES_DIR, stem)
+
+def plot_growth_rates(growth_rates, stem):
+    """Bar chart of the growth rate per group, indexed by group."""
     plt.figure(figsize=(14, 8))
-    bars = plt.bar(growth_df.index, growth_df['growth_rate'], color=sns.color_palette("viridis", len(growth_df)))
+    bars = plt.bar(growth_rates.index, growth_rates, color=sns.color_palette("viridis", len(growth_rates)))
     plt.axhline(y=0, color='r', linestyle='-', alpha=0.3)
     plt.xlabel('Category Group')
     plt.ylabel('Growth Rate (%)')
@@ -339,8 +198,92 @@ def analyze_daily_trends(df, category_groups):
                  label, ha='center', va='bottom' if height >= 0 else 'top', rotation=0)
     
     plt.tight_layout()
-    plt.savefig(CATEGORIES_DIR / 'growth_rates_by_group.png', dpi=300)
-    plt.close()
+    return save_figure(CATEGORIES_DIR, stem)
+
+def analyze_daily_trends(df, category_groups, stats):
+    """
+    Analyze daily trends for each category group.
+    
+    The daily charts are drawn from `df`; the top groups, weekly averages
+    and first/last 30 day averages are read from the statistics store
+    `stats` (see report_data.load_stats_store).
+    """
+    print("Analyzing daily trends...")
+    
+    # Add group column to the dataframe
+    df['group'] = CLASSIFIER.classify_series(df['category'])
+    
+    # Get date range
+    min_date = df['date'].min()
+    max_date = df['date'].max()
+    date_range = (max_date - min_date).days
+    
+    print(f"Analyzing trends over {date_range} days from {min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')}")
+    
+    # Aggregate by date and group
+    daily_trends = df.groupby(['date', 'group'], observed=True)['num'].sum().reset_index()
+    
+    # Create a pivot table for easier plotting
+    pivot_trends = daily_trends.pivot(index='date', columns='group', values='num').sort_index(axis=1)
+    
+    # Fill NaN values with 0
+    pivot_trends = pivot_trends.fillna(0)
+    
+    # Render the charts in worker processes while the statistics are computed here
+    figures = []
+    with figure_pool(style=PLOT_STYLE, palette=PLOT_PALETTE) as pool:
+        # Plot trends for each group
+        for group in pivot_trends.columns:
+            if group == 'Other':
+                continue  # Skip the "Other" group
+            figures.append(pool.submit(plot_group_daily_trend, pivot_trends[group], group,
+                                       f'daily_trend_{group}'))
+        
+        # Plot trends for top 5 groups
+        top_groups = stats.group_means().sort_values(ascending=False).head(5).index
+        figures.append(pool.submit(plot_top_groups_daily, pivot_trends[list(top_groups)],
+                                   'daily_trends_top_groups'))
+        
+        # Weekly averages smooth out the data
+        weekly_trends = stats.weekly_means()
+        
+        # Plot weekly trends for top 5 groups
+        figures.append(pool.submit(plot_top_groups_weekly, weekly_trends[list(top_groups)],
+                                   'weekly_trends_top_groups'))
+        
+        # Calculate growth rates for each group
+        growth_rates = {}
+        
+        for group in sorted(stats.groups):
+            if group == 'Other':
+                continue
+                
+            # Get the first and last 30 days average
+            first_30_days = stats.first_mean(group)
+            last_30_days = stats.last_mean(group)
+            
+            if first_30_days > 0:
+                growth_rate = ((last_30_days - first_30_days) / first_30_days) * 100
+            else:
+                growth_rate = 0 if last_30_days == 0 else float('inf')
+                
+            growth_rates[group] = {
+                'first_30_days_avg': first_30_days,
+                'last_30_days_avg': last_30_days,
+                'growth_rate': growth_rate
+            }
+        
+        # Convert to DataFrame for easier visualization
+        growth_df = pd.DataFrame.from_dict(growth_rates, orient='index')
+        growth_df = growth_df.sort_values('growth_rate', ascending=False)
+        
+        # Plot growth rates
+        figures.append(pool.submit(plot_growth_rates, growth_df['growth_rate'],
+                                   'growth_rates_by_group'))
+    
+    # Workers report what they wrote
+    for figure in figures:
+        FIGURE_STATS.add(figure.result())
     
     # Save growth rates to CSV
     growth_df.to_csv(CATEGORIES_DIR / 'growth_rates_by_group.csv')
@@ -371,19 +314,19 @@ def analyze_category_correlations(df):
     
     # Add group column to the dataframe if not already present
     if 'group' not in df.columns:
-        df['group'] = df['category'].apply(assign_category_group)
+        df['group'] = CLASSIFIER.classify_series(df['category'])
     
     # Aggregate by date and group
-    daily_trends = df.groupby(['date', 'group'])['num'].sum().reset_index()
+    daily_trends = df.groupby(['date', 'group'], observed=True)['num'].sum().reset_index()
     
     # Create a pivot table
-    pivot_trends = daily_trends.pivot(index='date', columns='group', values='num')
+    pivot_trends = daily_trends.pivot(index='date', columns='group', values='num').sort_index(axis=1)
     
     # Fill NaN values with 0
     pivot_trends = pivot_trends.fillna(0)
     
-    # Calculate correlation matrix
-    corr_matrix = pivot_trends.corr()
+    # Calculate correlation matrix (standardized once, one matrix product)
+    corr_matrix = correlation_frame(pivot_trends)
     
     # Plot correlation matrix
     plt.figure(figsize=(12, 10))
@@ -391,34 +334,20 @@ def analyze_category_correlations(df):
                 square=True, linewidths=.5, cbar_kws={"shrink": .8})
     plt.title('Correlation Between Category Groups')
     plt.tight_layout()
-    plt.savefig(CATEGORIES_DIR / 'category_correlations.png', dpi=300)
-    plt.close()
+    FIGURE_STATS.add(save_figure(CATEGORIES_DIR, 'category_correlations'))
     
     # Save correlation matrix to CSV
     corr_matrix.to_csv(CATEGORIES_DIR / 'category_correlations.csv')
     
-    # Find the most correlated pairs
-    corr_pairs = []
-    
-    for i in range(len(corr_matrix.columns)):
-        for j in range(i+1, len(corr_matrix.columns)):
-            group1 = corr_matrix.columns[i]
-            group2 = corr_matrix.columns[j]
-            correlation = corr_matrix.iloc[i, j]
-            
-            corr_pairs.append({
-                'group1': group1,
-                'group2': group2,
-                'correlation': correlation
-            })
-    
-    # Convert to DataFrame and sort
-    corr_pairs_df = pd.DataFrame(corr_pairs)
-    corr_pairs_df = corr_pairs_df.sort_values('correlation', ascending=False)
+    # All pairs of the upper triangle, most correlated first
+    corr_pairs_df = all_pairs(corr_matrix)
     
     # Save to CSV
     corr_pairs_df.to_csv(CATEGORIES_DIR / 'category_correlation_pairs.csv', index=False)
     
+    # Strongest positive and negative pairs, from the matrix computed above
+    top_positive, top_negative = top_pairs_of_frame(corr_matrix, k=10)
+    
     # Generate a detailed report
     with open(CATEGORIES_DIR / 'category_correlations_report.txt', 'w') as f:
         f.write(f"Category Correlations Analysis\n")
@@ -427,14 +356,15 @@ def analyze_category_correlations(df):
         f.write(f"Top Positive Correlations:\n")
         f.write(f"-------------------------\n\n")
         
-        for _, row in corr_pairs_df.head(10).iterrows():
-            f.write(f"{row['group1']} and {row['group2']}: {row['correlation']:.4f}\n")
+        for row in top_positive.itertuples():
+            f.write(f"{row.group1} and {row.group2}: {row.correlation:.4f}\n")
         
         f.write(f"\nTop Negative Correlations:\n")
         f.write(f"-------------------------\n\n")
         
-        for _, row in corr_pairs_df.tail(10).iterrows():
-            f.write(f"{row['group1']} and {row['group2']}: {row['correlation']:.4f}\n")
+        # Listed like the tail of the descending order, lowest last
+        for row in top_negative[::-1].itertuples():
+            f.write(f"{row.group1} and {row.group2}: {row.correlation:.4f}\n")
     
     return corr_pairs_df
 
@@ -478,18 +408,18 @@ def generate_html_report():
             <div class="report-section">
                 <h2>Category Groups Distribution</h2>
                 <p>Analysis of how categories are distributed across different groups.</p>
-                <img src="category_groups_distribution.png" alt="Category Groups Distribution">
+                <img src="{figure_file("category_groups_distribution")}" alt="Category Groups Distribution">
                 <p>For a detailed list of categories in each group, see the <a href="category_groups_report.txt">Category Groups Report</a>.</p>
             </div>
             
             <div class="report-section">
                 <h2>Daily Trends</h2>
                 <p>Analysis of daily trends for the top category groups.</p>
-                <img src="daily_trends_top_groups.png" alt="Daily Trends for Top Groups">
-                <img src="weekly_trends_top_groups.png" alt="Weekly Trends for Top Groups">
+                <img src="{figure_file("daily_trends_top_groups")}" alt="Daily Trends for Top Groups">
+                <img src="{figure_file("weekly_trends_top_groups")}" alt="Weekly Trends for Top Groups">
                 
                 <h3>Growth Rates by Category Group</h3>
-                <img src="growth_rates_by_group.png" alt="Growth Rates by Category Group">
+                <img src="{figure_file("growth_rates_by_group")}" alt="Growth Rates by Category Group">
                 
                 <h3>Top Growing Categories</h3>
                 <table>
@@ -505,20 +435,16 @@ def generate_html_report():
         growth_df = pd.read_csv(CATEGORIES_DIR / 'growth_rates_by_group.csv')
         growth_df = growth_df.sort_values('growth_rate', ascending=False)
         
-        for _, row in growth_df.head(10).iterrows():
-            growth_class = "positive" if row['growth_rate'] >= 0 else "negative"
-            growth_str = "∞" if np.isinf(row['growth_rate']) else f"{row['growth_rate']:.2f}%"
-            
-            f.write(f"""
-                    <tr>
-                        <td>{row['Unnamed: 0']}</td>
-                        <td>{row['first_30_days_avg']:.2f}</td>
-                        <td>{row['last_30_days_avg']:.2f}</td>
-                        <td class="{growth_class}">{growth_str}</td>
-                    </tr>
-            """)
+        top_growth = growth_df.head(10)
+        write_table(f, GROUP_GROWTH_ROW,
+                    group=escape(top_growth['Unnamed: 0']),
+                    first_avg=format_number(top_growth['first_30_days_avg'], '.2f'),
+                    last_avg=format_number(top_growth['last_30_days_avg'], '.2f'),
+                    growth_class=sign_class(top_growth['growth_rate']),
+                    growth_rate=(format_number(top_growth['growth_rate'], '.2f') + '%')
+                    .where(~np.isinf(top_growth['growth_rate']), "∞"))
         
-        f.write("""
+        f.write(f"""
                 </table>
                 <p>For a detailed analysis of daily trends, see the <a href="daily_trends_report.txt">Daily Trends Report</a>.</p>
             </div>
@@ -526,7 +452,7 @@ def generate_html_report():
             <div class="report-section">
                 <h2>Category Correlations</h2>
                 <p>Analysis of correlations between different category groups.</p>
-                <img src="category_correlations.png" alt="Category Correlations">
+                <img src="{figure_file("category_correlations")}" alt="Category Correlations">
                 
                 <h3>Top Correlated Category Pairs</h3>
                 <table>
@@ -541,16 +467,12 @@ def generate_html_report():
         corr_pairs_df = pd.read_csv(CATEGORIES_DIR / 'category_correlation_pairs.csv')
         corr_pairs_df = corr_pairs_df.sort_values('correlation', ascending=False)
         
-        for _, row in corr_pairs_df.head(10).iterrows():
-            corr_class = "positive" if row['correlation'] >= 0 else "negative"
-            
-            f.write(f"""
-                    <tr>
-                        <td>{row['group1']}</td>
-                        <td>{row['group2']}</td>
-                        <td class="{corr_class}">{row['correlation']:.4f}</td>
-                    </tr>
-            """)
+        top_pairs = corr_pairs_df.head(10)
+        write_table(f, CORRELATION_ROW,
+                    group1=escape(top_pairs['group1']),
+                    group2=escape(top_pairs['group2']),
+                    corr_class=sign_class(top_pairs['correlation']),
+                    correlation=format_number(top_pairs['correlation'], '.4f'))
         
         f.write("""
                 </table>
@@ -563,10 +485,11 @@ def generate_html_report():
         """)
         
         # List all trend images
-        trend_images = [f for f in os.listdir(CATEGORIES_DIR) if f.startswith('daily_trend_') and f.endswith('.png')]
+        extension = figure_file('')
+        trend_images = [f for f in os.listdir(CATEGORIES_DIR) if f.startswith('daily_trend_') and f.endswith(extension)]
         
         for image in trend_images:
-            group_name = image.replace('daily_trend_', '').replace('.png', '')
+            group_name = image.replace('daily_trend_', '').replace(extension, '')
             f.write(f"""
                 <h3>{group_name}</h3>
                 <img src="{image}" alt="Daily Trend for {group_name}">
@@ -591,22 +514,57 @@ def generate_html_report():
 
 def main():
     """Main function to run the analysis."""
+    parser = argparse.ArgumentParser(description="Analyze category groups and daily trends")
+    parser.add_argument('--force', action='store_true',
+                        help="Rebuild all outputs even if their inputs did not change")
+    parser.add_argument('--full-refresh', action='store_true',
+                        help="Rebuild the local data cache and the statistics store from the full MySQL tables")
+    parser.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help="Figure output profile: web (small WebP), print (300 dpi PNG) or vector (SVG)")
+    args = parser.parse_args()
+    set_profile(args.profile)
+    
     print("Starting category analysis and daily trends...")
     
-    # Fetch data from MySQL
-    df = fetch_data()
+    # Fetch the project history, oldest first (through the local cache)
+    df = load_history('projects', full_refresh=args.full_refresh, ascending=True)
+    
+    # Running statistics (updated with the new days only)
+    stats = load_stats_store('projects', full_refresh=args.full_refresh)
+    
+    # The analyses add a group column, so fingerprint the loaded columns only
+    history = df[['date', 'category', 'num']]
+    cache = BuildCache(CATEGORIES_DIR, force=args.force)
+    plot_params = {**PLOT_PARAMS, 'figures': active_profile()}
     
     # Analyze distinct categories
-    category_groups = analyze_distinct_categories(df)
+    category_groups = cache.build('distinct_categories', [figure_file('category_groups_distribution'),
+                                                          'category_groups_report.txt'],
+                                  analyze_distinct_categories, df, inputs=[history], params=plot_params,
+                                  code=[CATEGORY_GROUPS])
     
     # Analyze daily trends
-    growth_df = analyze_daily_trends(df, category_groups)
+    cache.build('daily_trends', [figure_file('daily_trend_*'), figure_file('daily_trends_top_groups'),
+                                 figure_file('weekly_trends_top_groups'), figure_file('growth_rates_by_group'),
+                                 'growth_rates_by_group.csv', 'daily_trends_report.txt'],
+                analyze_daily_trends, df, category_groups, stats, inputs=[history], params=plot_params,
+                code=[CATEGORY_GROUPS, plot_group_daily_trend, plot_top_groups_daily,
+                      plot_top_groups_weekly, plot_growth_rates, _format_date_axis])
     
     # Analyze category correlations
-    corr_pairs_df = analyze_category_correlations(df)
+    cache.build('category_correlations', [figure_file('category_correlations'), 'category_correlations.csv',
+                                          'category_correlation_pairs.csv',
+                                          'category_correlations_report.txt'],
+                analyze_category_correlations, df, inputs=[history], params=plot_params,
+                code=[CATEGORY_GROUPS])
     
     # Generate HTML report
-    generate_html_report()
+    cache.build('index', ['index.html'], generate_html_report,
+                inputs=[CATEGORIES_DIR / 'growth_rates_by_group.csv',
+                        CATEGORIES_DIR / 'category_correlation_pairs.csv'],
+                params={'figures': active_profile()})
+    cache.save()
+    FIGURE_STATS.print_summary()
     
     print(f"Analysis completed. View the report at {CATEGORIES_DIR / 'index.html'}")
 
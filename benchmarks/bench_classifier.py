@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+Benchmark category-group classification over a multi-year history.
+
+Compares the old per-row keyword loop (Series.apply) with the compiled
+CategoryClassifier, which classifies every distinct category once and maps
+the result back through categorical codes.
+
+Usage: python benchmarks/bench_classifier.py [--days 1500 --categories 450]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from category_groups import TREND_CATEGORY_GROUPS as CATEGORY_GROUPS
+from category_groups import CategoryClassifier
+
+
+def legacy_assign_category_group(category):
+    """The previous keyword loop from analyze_categories_trends.py."""
+    if pd.isna(category) or category == '':
+        return 'Other'
+
+    category_lower = category.lower()
+
+    for group, keywords in CATEGORY_GROUPS.items():
+        for keyword in keywords:
+            if keyword.lower() in category_lower:
+                return group
+
+    return 'Other'
+
+
+def history_categories(days, categories):
+    """A category column shaped like the projects history."""
+    known = pd.read_csv(ROOT / 'reports' / 'category_groups_detailed.csv')['category'].tolist()
+    names = (known + [f"Kategorie {i}" for i in range(categories)])[:categories]
+    return pd.Series(np.tile(np.array(names, dtype=object), days))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Category classifier benchmark")
+    parser.add_argument('--days', type=int, default=1500)
+    parser.add_argument('--categories', type=int, default=450)
+    args = parser.parse_args()
+
+    categories = history_categories(args.days, args.categories)
+    n_rows = len(categories)
+
+    started = time.perf_counter()
+    legacy = categories.apply(legacy_assign_category_group)
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    classifier = CategoryClassifier(CATEGORY_GROUPS)
+    compiled = classifier.classify_series(categories)
+    compiled_seconds = time.perf_counter() - started
+
+    categorical = categories.astype('category')
+    started = time.perf_counter()
+    classifier.classify_series(categorical)
+    categorical_seconds = time.perf_counter() - started
+
+    assert (compiled.astype(str) == legacy).all(), "classifiers disagree"
+
+    print(f"{n_rows:,} rows, {categories.nunique()} distinct categories\n")
+    for label, seconds in (('per-row apply (legacy)', legacy_seconds),
+                           ('compiled, object column', compiled_seconds),
+                           ('compiled, categorical column', categorical_seconds)):
+        print(f"{label:<30} {seconds:>8.3f}s {seconds / n_rows * 1e9:>10.0f} ns/row "
+              f"{legacy_seconds / seconds:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
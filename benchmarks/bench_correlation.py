@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Benchmark correlating many daily series.
+
+Compares DataFrame.corr() plus the previous nested iloc loop over all pairs
+with correlation_engine: the full matrix as one matrix product, and the
+top-k pairs selected block by block with argpartition. The nested loop is
+only timed up to --legacy-max series, above that it takes minutes.
+
+Usage: python benchmarks/bench_correlation.py [--series 500 2000 --days 1500 --block-size 256]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from correlation_engine import correlation_frame, top_correlated_pairs
+
+
+def legacy_pairs(corr_matrix):
+    """The previous pair loop from analyze_category_correlations."""
+    corr_pairs = []
+    for i in range(len(corr_matrix.columns)):
+        for j in range(i+1, len(corr_matrix.columns)):
+            corr_pairs.append({
+                'group1': corr_matrix.columns[i],
+                'group2': corr_matrix.columns[j],
+                'correlation': corr_matrix.iloc[i, j]
+            })
+    return pd.DataFrame(corr_pairs).sort_values('correlation', ascending=False)
+
+
+def synthetic_series(n_series, days, seed=0):
+    """Daily counts with a few shared trends, like category histories."""
+    rng = np.random.default_rng(seed)
+    trends = rng.normal(size=(days, 8)).cumsum(axis=0)
+    loadings = rng.normal(size=(8, n_series))
+    values = 500 + trends @ loadings + rng.normal(scale=20, size=(days, n_series))
+    return pd.DataFrame(np.maximum(values, 0).round(),
+                        columns=[f"Kategorie {i}" for i in range(n_series)])
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Correlation engine benchmark")
+    parser.add_argument('--series', type=int, nargs='+', default=[500, 2000])
+    parser.add_argument('--days', type=int, default=1500)
+    parser.add_argument('--block-size', type=int, default=256)
+    parser.add_argument('--legacy-max', type=int, default=500)
+    args = parser.parse_args()
+
+    for n_series in args.series:
+        frame = synthetic_series(n_series, args.days)
+        print(f"\n{n_series} series x {args.days} days")
+
+        pandas_seconds, pandas_corr = timed(frame.corr)
+        print(f"  {'DataFrame.corr()':<36} {pandas_seconds:>8.3f}s")
+        if n_series <= args.legacy_max:
+            loop_seconds, _ = timed(legacy_pairs, pandas_corr)
+            print(f"  {'nested iloc pair loop':<36} {loop_seconds:>8.3f}s")
+
+        engine_seconds, engine_corr = timed(correlation_frame, frame)
+        error = np.nanmax(np.abs(engine_corr.to_numpy() - pandas_corr.to_numpy()))
+        print(f"  {'engine matrix':<36} {engine_seconds:>8.3f}s  (max diff {error:.1e})")
+
+        top_seconds, (positive, negative) = timed(top_correlated_pairs, frame, 10)
+        print(f"  {'engine top-10 pairs':<36} {top_seconds:>8.3f}s")
+
+        blocked_seconds, (blocked_positive, _) = timed(top_correlated_pairs, frame, 10,
+                                                       block_size=args.block_size)
+        print(f"  {f'engine top-10 pairs, blocks of {args.block_size}':<36} {blocked_seconds:>8.3f}s  "
+              f"(peak block {args.block_size * n_series * 8 / 1024 ** 2:.1f} MB)")
+
+        assert positive[['group1', 'group2']].equals(blocked_positive[['group1', 'group2']])
+        print(f"  strongest pair: {positive.iloc[0]['group1']} / {positive.iloc[0]['group2']} "
+              f"({positive.iloc[0]['correlation']:.4f}), weakest: {negative.iloc[0]['correlation']:.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Benchmark one dashboard interaction for 5, 20 and 100 selected job groups.
+
+Compares the previous per-interaction work of streamlit_app.py (pivot_table
+plus fillna and diff for jobs and experts, then melt for each of the three
+charts) with slicing the rows materialized by daily_series.build_daily_series.
+The database query is simulated by the same boolean selection on both
+frames (raw rows and materialized rows); "chart prep" is the pandas work the
+legacy variant did on top of it on every interaction, which is gone.
+
+Usage: python benchmarks/bench_dashboard.py [--groups 5 20 100 --categories 800 --days 730 --range-days 90]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from daily_series import build_daily_series
+
+
+def synthetic_rows(categories, days, seed=0):
+    """Daily rows like the projects table, with about 10% of (date, category) missing."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2023-01-01', periods=days)
+    frame = pd.DataFrame({
+        'date': np.repeat(dates, categories),
+        'category': np.tile([f"Kategorie {i}" for i in range(categories)], days),
+        'num': rng.integers(0, 2000, days * categories),
+    })
+    return frame[rng.random(len(frame)) > 0.1].reset_index(drop=True)
+
+
+def select(frame, start_date, end_date, groups, column='category'):
+    """The WHERE clause of the dashboard query."""
+    mask = frame['date'].between(start_date, end_date) & frame[column].isin(groups)
+    return frame[mask]
+
+
+def legacy_interaction(projects, freelances):
+    """The previous chart preparation of streamlit_app.py."""
+    job_pivot_df = projects.pivot_table(index='date', columns='job_group', values='num', aggfunc='sum').fillna(0)
+    expert_pivot_df = freelances.pivot_table(index='date', columns='job_group', values='num', aggfunc='sum').fillna(0)
+    job_daily_diff = job_pivot_df.diff().fillna(0)
+    expert_daily_diff = expert_pivot_df.diff().fillna(0)
+    return (job_pivot_df.reset_index().melt('date'),
+            job_daily_diff.reset_index().melt('date'),
+            expert_daily_diff.reset_index().melt('date'))
+
+
+def timed(func, *args, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard interaction benchmark")
+    parser.add_argument('--groups', type=int, nargs='+', default=[5, 20, 100])
+    parser.add_argument('--categories', type=int, default=800)
+    parser.add_argument('--days', type=int, default=730)
+    parser.add_argument('--range-days', type=int, default=90)
+    args = parser.parse_args()
+
+    projects = synthetic_rows(args.categories, args.days, seed=0)
+    freelances = synthetic_rows(args.categories, args.days, seed=1)
+
+    build_seconds, _ = timed(lambda: (build_daily_series(projects), build_daily_series(freelances)), repeat=1)
+    daily_projects = build_daily_series(projects).rename(columns={'category': 'job_group'})
+    daily_freelances = build_daily_series(freelances).rename(columns={'category': 'job_group'})
+    print(f"{args.categories} categories x {args.days} days, nightly materialization {build_seconds:.2f}s "
+          f"({len(daily_projects) + len(daily_freelances):,} rows)")
+
+    end_date = projects['date'].max()
+    start_date = end_date - pd.Timedelta(days=args.range_days)
+    categories = sorted(projects['category'].unique())
+
+    print(f"{'groups':>6} {'query rows':>11} {'chart prep':>11} {'legacy':>10} {'materialized':>13} {'speedup':>8}")
+    for n_groups in args.groups:
+        groups = categories[:n_groups]
+        selected = [select(frame, start_date, end_date, groups).rename(columns={'category': 'job_group'})
+                    for frame in (projects, freelances)]
+
+        prep_seconds, (job_chart, _, _) = timed(legacy_interaction, *selected)
+        query_seconds, _ = timed(lambda: [select(frame, start_date, end_date, groups) for frame in (projects, freelances)])
+        sliced_seconds, (job_rows, _) = timed(
+            lambda: [select(frame, start_date, end_date, groups, 'job_group')
+                     for frame in (daily_projects, daily_freelances)])
+
+        # Same chart values; on the first date of the range the legacy diff is
+        # 0 (nothing to diff against) where the materialized one is the real change
+        job_chart = job_chart.sort_values(['date', 'job_group'], ignore_index=True)
+        assert (job_chart['value'].to_numpy() == job_rows['num'].to_numpy()).all(), "series disagree"
+
+        legacy_seconds = query_seconds + prep_seconds
+        print(f"{n_groups:>6} {len(job_rows):>11,} {prep_seconds * 1000:>9.1f}ms {legacy_seconds * 1000:>8.1f}ms "
+              f"{sliced_seconds * 1000:>11.1f}ms {legacy_seconds / sliced_seconds:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
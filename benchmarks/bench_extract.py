@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for the freelance.de list extraction.
+
+Loads a saved HTML fixture into Chromium and compares the per-element
+extraction with a single page.evaluate call (and, for reference, the
+browser-free lxml parsing of sources.parse_list that the scrape engine
+uses). All strategies must return the same rows.
+
+Usage: python benchmarks/bench_extract.py [--repeat 20] [--fixture path.html]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from lxml import html as lxml_html
+from playwright.sync_api import sync_playwright
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sources import FREELANCE_DE, parse_list
+from static_extract import LIST_SELECTORS
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'freelance_de_categories.html'
+
+# CSS selector of the count badge inside a list item, for the browser strategies
+COUNT_SELECTORS = {
+    'jobs': 'span.ms-2',
+    'freelancers': 'span',
+}
+
+# Reads anchor text, href and count badge text of every list item in one round-trip
+_EXTRACT_ROWS_JS = """
+([xpath, countSelector]) => {
+    const snapshot = document.evaluate(xpath, document, null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const rows = [];
+    for (let i = 0; i < snapshot.snapshotLength; i++) {
+        const item = snapshot.snapshotItem(i);
+        const anchor = item.querySelector('a');
+        if (!anchor) continue;
+        const span = item.querySelector(countSelector);
+        rows.push([anchor.textContent, anchor.getAttribute('href'), span ? span.textContent : null]);
+    }
+    return rows;
+}
+"""
+
+
+def build_row(data_type, anchor_text, href, count_text, date):
+    """Turn the raw anchor text, href and count badge text of a list item into a row."""
+    text = anchor_text.strip().split('(')[0].strip()
+    if count_text is None:
+        count = '0'
+    elif data_type == 'jobs':
+        count = count_text.strip('()')
+    else:
+        count = count_text.strip().strip('()')
+
+    return {
+        'category': text,
+        'num': count,
+        'date': date,
+        'href': href
+    }
+
+
+def extract_data(page, data_type='jobs'):
+    """The category list of the current page from a single page.evaluate call (the former scraper extraction)."""
+    if data_type not in LIST_SELECTORS:
+        return [{'error':'data_type case not found'}]
+    
+    rows = page.evaluate(_EXTRACT_ROWS_JS, [LIST_SELECTORS[data_type], COUNT_SELECTORS[data_type]])
+    date = datetime.now().strftime("%Y-%m-%d")
+    return [build_row(data_type, text, href, count, date) for text, href, count in rows]
+
+
+def extract_data_per_element(page, data_type='jobs'):
+    """Element-by-element extraction (several IPC calls per item), kept for benchmarking."""
+    data = []
+    
+    if data_type == 'jobs':
+        list_items = page.query_selector_all(LIST_SELECTORS['jobs'])
+        for item in list_items:
+            anchor = item.query_selector('a')
+            if anchor:
+                text = anchor.text_content().strip()
+                text = text.split('(')[0].strip()
+                href = anchor.get_attribute('href')
+                span = item.query_selector('span.ms-2')
+                count = span.text_content().strip('()') if span else '0'
+                
+                data.append({
+                    'category': text,
+                    'num': count,
+                    'date': datetime.now().strftime("%Y-%m-%d"),
+                    'href': href
+                })
+    elif data_type == 'freelancers':
+        list_items = page.query_selector_all(LIST_SELECTORS['freelancers'])
+        for item in list_items:
+            anchor = item.query_selector('a')
+            if anchor:
+                text = anchor.text_content().split('(')[0].strip()
+                href = anchor.get_attribute('href')
+                span = item.query_selector('span')
+                count = span.text_content().strip().strip('()') if span else '0'
+                
+                data.append({
+                    'category': text,
+                    'num': count,
+                    'date': datetime.now().strftime("%Y-%m-%d"),
+                    'href': href
+                })
+    else :
+        data.append({'error':'data_type case not found'})
+    
+    return data
+
+
+def extract_lxml(html, data_type='jobs'):
+    """The scrape engine's extraction: lxml with the list spec of the freelance.de section."""
+    section = next(section for section in FREELANCE_DE.sections if section.name == data_type)
+    return parse_list(lxml_html.fromstring(html), section.items, datetime.now().strftime("%Y-%m-%d"))
+
+
+def time_strategy(extract, repeat):
+    """Run `extract` `repeat` times and return (rows of the last run, timings in ms)."""
+    timings = []
+    rows = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = extract()
+        timings.append((time.perf_counter() - started) * 1000)
+    return rows, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--fixture', type=Path, default=FIXTURE)
+    args = parser.parse_args()
+
+    html = args.fixture.read_text(encoding='utf-8')
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.set_content(html)
+
+        results = {}
+        for data_type in ('jobs', 'freelancers'):
+            strategies = {
+                'per-element': lambda: extract_data_per_element(page, data_type),
+                'page.evaluate': lambda: extract_data(page, data_type),
+                'lxml (no browser)': lambda: extract_lxml(html, data_type),
+            }
+            for name, extract in strategies.items():
+                results[(data_type, name)] = time_strategy(extract, args.repeat)
+
+        browser.close()
+
+    print(f"Fixture: {args.fixture.name}, {args.repeat} runs per strategy\n")
+    print(f"{'data_type':<12} {'strategy':<18} {'rows':>6} {'median ms':>10} {'min ms':>8} {'speedup':>8}")
+    for data_type in ('jobs', 'freelancers'):
+        baseline_rows, baseline = results[(data_type, 'per-element')]
+        for (dt, name), (rows, timings) in results.items():
+            if dt != data_type:
+                continue
+            if rows != baseline_rows:
+                print(f"WARNING: {name} rows differ from the per-element extraction for {data_type}")
+            speedup = statistics.median(baseline) / statistics.median(timings)
+            print(f"{data_type:<12} {name:<18} {len(rows):>6} {statistics.median(timings):>10.2f} "
+                  f"{min(timings):>8.2f} {speedup:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Benchmark the detailed breakdown table of the category groups report.
+
+Compares the previous iterrows loop, which also re-summed the group for
+every group header, with html_render.write_grouped_tables, which renders
+all rows in one vectorized pass with group totals from a single groupby.
+Both write the same bytes.
+
+Usage: python benchmarks/bench_html_render.py [--categories 1000 20000 50000 --groups 15]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from generate_reports import GROUP_SHARE_ROW, GROUP_TABLE_HEADER
+from html_render import escape, format_number, format_percent, write_grouped_tables
+
+
+def legacy_write(f, detailed):
+    """The previous loop from generate_category_groups_report."""
+    current_group = None
+    for _, row in detailed.iterrows():
+        if current_group != row['group']:
+            if current_group is not None:
+                f.write("</table>")
+
+            current_group = row['group']
+            group_total = detailed[detailed['group'] == current_group]['num'].sum()
+
+            f.write(f"""
+                    <h3>{current_group} ({group_total:,} projects)</h3>
+                    <table>
+                        <tr>
+                            <th>Category</th>
+                            <th>Number of Projects</th>
+                            <th>Percentage of Group</th>
+                        </tr>
+                """)
+
+        percentage = (row['num'] / group_total) * 100
+        f.write(f"""
+                <tr>
+                    <td>{row['category']}</td>
+                    <td>{row['num']:,}</td>
+                    <td>{percentage:.1f}%</td>
+                </tr>
+            """)
+
+    if current_group is not None:
+        f.write("</table>")
+
+
+def vectorized_write(f, detailed):
+    """The same table through html_render."""
+    group_totals = detailed.groupby('group', sort=False)['num'].sum()
+    write_grouped_tables(
+        f, GROUP_TABLE_HEADER, GROUP_SHARE_ROW, detailed['group'],
+        header_columns={'group': escape(group_totals.index),
+                        'group_total': format_number(group_totals.to_numpy(), ',')},
+        row_columns={'name': escape(detailed['category']),
+                     'num': format_number(detailed['num'], ','),
+                     'percentage': format_percent(
+                         detailed['num'] / detailed['group'].map(group_totals) * 100)})
+
+
+def synthetic_breakdown(categories, groups, seed=0):
+    """A detailed breakdown sorted like the report sorts it."""
+    rng = np.random.default_rng(seed)
+    detailed = pd.DataFrame({
+        'group': rng.choice([f"Group {i:02d}" for i in range(groups)], categories),
+        'category': [f"Kategorie {i}" for i in range(categories)],
+        'num': rng.integers(1, 5000, categories),
+    })
+    return detailed.sort_values(['group', 'num'], ascending=[True, False], ignore_index=True)
+
+
+def timed(write, detailed):
+    with tempfile.TemporaryFile('w+', encoding='utf-8') as f:
+        started = time.perf_counter()
+        write(f, detailed)
+        seconds = time.perf_counter() - started
+        f.seek(0)
+        return seconds, f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML table rendering benchmark")
+    parser.add_argument('--categories', type=int, nargs='+', default=[1000, 20000, 50000])
+    parser.add_argument('--groups', type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"{'categories':>10} {'legacy':>10} {'vectorized':>12} {'speedup':>9}")
+    for categories in args.categories:
+        detailed = synthetic_breakdown(categories, args.groups)
+        legacy_seconds, legacy_html = timed(legacy_write, detailed)
+        vectorized_seconds, vectorized_html = timed(vectorized_write, detailed)
+        assert legacy_html == vectorized_html, "renderers disagree"
+        print(f"{categories:>10,} {legacy_seconds:>9.3f}s {vectorized_seconds:>11.3f}s "
+              f"{legacy_seconds / vectorized_seconds:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
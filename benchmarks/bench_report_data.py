@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+Measure the memory footprint of the report frames.
+
+Compares the frames the report scripts used to build (object category,
+int64 num, datetime64[ns] date, href always loaded) with the compact frames
+from report_data. By default a synthetic history is used; --live reads the
+projects table from MySQL instead.
+
+Usage: python benchmarks/bench_report_data.py [--days 1500 --categories 450] [--live]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from report_cache import normalize_frame
+from report_data import frame_memory_mb
+
+
+def synthetic_history(days, categories, seed=0):
+    """Raw rows as pd.read_sql returns them: date objects, strings, integers."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2021-01-01', periods=days, freq='D').date
+    names = np.array([f"Kategorie {i} / Unterkategorie" for i in range(categories)], dtype=object)
+    hrefs = np.array([f"/projekte/kategorie-{i}-unterkategorie" for i in range(categories)], dtype=object)
+    idx = np.arange(days * categories)
+    return pd.DataFrame({
+        'date': dates[idx // categories],
+        'category': names[idx % categories],
+        'num': rng.integers(0, 8000, len(idx)),
+        'href': hrefs[idx % categories],
+    })
+
+
+def legacy_frame(raw):
+    """The post-processing the old fetch_data functions applied."""
+    df = raw.copy()
+    df['date'] = pd.to_datetime(df['date'])
+    df['num'] = pd.to_numeric(df['num'], errors='coerce').fillna(0).astype(int)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report frame memory benchmark")
+    parser.add_argument('--days', type=int, default=1500)
+    parser.add_argument('--categories', type=int, default=450)
+    parser.add_argument('--live', action='store_true', help="Use the projects table from MySQL")
+    args = parser.parse_args()
+
+    if args.live:
+        from db_utils import pooled_connection
+        with pooled_connection() as conn:
+            raw = pd.read_sql("SELECT date, category, num, href FROM projects", conn)
+    else:
+        raw = synthetic_history(args.days, args.categories)
+
+    legacy = legacy_frame(raw)
+    compact = normalize_frame(raw[['date', 'category', 'num']].copy())
+
+    legacy_mb = frame_memory_mb(legacy)
+    compact_mb = frame_memory_mb(compact)
+    print(f"{len(raw):,} rows")
+    print(f"legacy frame  (object category, int64 num, href): {legacy_mb:8.1f} MB")
+    print(f"compact frame (categorical, int32, no href):      {compact_mb:8.1f} MB")
+    print(f"reduction: {legacy_mb / compact_mb:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
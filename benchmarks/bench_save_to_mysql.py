@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+Benchmark the MySQL upsert path with synthetic rows.
+
+Compares the previous row-by-row save (iterrows + executemany + commit per
+batch) with the vectorized save_to_mysql. Run it against a throwaway local
+server, never against production:
+
+    docker run -d --name bench-mariadb -p 3307:3306 -e MARIADB_ROOT_PASSWORD=bench \
+        -e MARIADB_DATABASE=bench mariadb:11
+    DB_HOST=127.0.0.1 DB_PORT=3307 DB_USER=root DB_PASSWORD=bench DB_NAME=bench \
+        python benchmarks/bench_save_to_mysql.py --rows 100000
+
+Each run inserts into a fresh `bench_projects` table, then upserts the same
+rows again to measure the ON DUPLICATE KEY UPDATE path.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db_utils import get_mysql_connection, save_to_mysql
+
+TABLE = 'bench_projects'
+
+
+def synthetic_rows(n_rows, n_categories=500, seed=42):
+    """Rows spread over consecutive days with string counts, like the scrapers produce."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range('2020-01-01', periods=n_rows // n_categories + 1, freq='D').strftime('%Y-%m-%d')
+    idx = np.arange(n_rows)
+    return pd.DataFrame({
+        'date': days[idx // n_categories],
+        'category': [f"Category {i}" for i in idx % n_categories],
+        'num': rng.integers(0, 10000, n_rows).astype(str),
+        'href': [f"/projekte/category-{i}" for i in idx % n_categories],
+    })
+
+
+def legacy_save(df, table_name):
+    """The previous save_to_mysql insert loop, kept here for comparison."""
+    conn = get_mysql_connection()
+    try:
+        cursor = conn.cursor()
+        batch_size = 1000
+        for i in range(0, len(df), batch_size):
+            batch = df.iloc[i:i+batch_size]
+            values = []
+            for _, row in batch.iterrows():
+                values.append((
+                    row['date'],
+                    row['category'],
+                    int(row['num']) if isinstance(row['num'], str) and row['num'].isdigit() else row['num'],
+                    row.get('href', '')
+                ))
+            cursor.executemany(f"""
+                INSERT INTO {table_name} (date, category, num, href)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE num = VALUES(num), href = VALUES(href)
+            """, values)
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def reset_table():
+    conn = get_mysql_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        cursor.execute(f"""
+            CREATE TABLE {TABLE} (
+                date DATE,
+                category VARCHAR(255),
+                num INTEGER,
+                href TEXT,
+                PRIMARY KEY (date, category)
+            )
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def timed(label, func, df, n_rows):
+    started = time.perf_counter()
+    func(df.copy(), TABLE)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<34} {elapsed:>8.2f}s {n_rows / elapsed:>12,.0f} rows/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MySQL upserts")
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    df = synthetic_rows(args.rows)
+    print(f"{args.rows:,} synthetic rows, table {TABLE}\n")
+
+    results = {}
+    for label, func in (('legacy iterrows + executemany', legacy_save),
+                        ('vectorized save_to_mysql', save_to_mysql)):
+        reset_table()
+        insert = timed(f"{label} (insert)", func, df, args.rows)
+        update = timed(f"{label} (upsert)", func, df, args.rows)
+        results[label] = insert + update
+
+    legacy, vectorized = results.values()
+    print(f"\nSpeedup: {legacy / vectorized:.1f}x")
+
+    conn = get_mysql_connection()
+    try:
+        conn.cursor().execute(f"DROP TABLE IF EXISTS {TABLE}")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+"""
+Benchmark the scrapers' extraction strategies offline, on a recorded page archive.
+
+Every strategy crawls the sources through scrape_engine.ScrapeEngine against
+the local replay stand-ins (see replay.py), with the page cache off:
+
+    static   plain HTTP and lxml; pages the adapter can only read in the
+             browser fall back to it
+    browser  Chromium with the sources' route policies, then lxml on the
+             rendered page
+
+Reported per strategy and source: pages, rows, end-to-end crawl time (median
+of --repeat runs), pages/sec, and the fetch and parse time per page. The rows
+of all runs must match. --latency-ms adds a delay to every response to
+approximate the live sites.
+
+Without a recorded archive (python scrape_engine.py --record DIR --no-save),
+or with --synthetic, the crawl runs on pages generated from the freelance.de
+fixture and a freelancermap page of the same size.
+
+Usage: python benchmarks/bench_scrapers.py [--archive DIR | --synthetic] [--strategies static browser]
+                                           [--repeat 3] [--latency-ms 0] [--categories 50] [--subcategories 20]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from lxml import html as lxml_html
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from browser_session import BrowserSession
+from replay import ARCHIVE_DIR, PageArchive, Replay
+from scrape_engine import PageCache, ScrapeEngine
+from sources import SOURCES
+from static_extract import SHOW_ALL_XPATH
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'freelance_de_categories.html'
+
+
+def _freelance_de_page(fixture, items, section_path, show_all=None):
+    """The fixture with its first `items` list entries, linking to `section_path` pages."""
+    tree = lxml_html.fromstring(fixture)
+    for li in tree.xpath("//ul[contains(@class, 'list-inline')]/li")[items:]:
+        li.getparent().remove(li)
+    for a in tree.xpath("//ul[contains(@class, 'list-inline')]/li/a"):
+        a.set('href', a.get('href').replace('/projekte/', f'/{section_path}/'))
+    for a in tree.xpath(SHOW_ALL_XPATH):
+        if show_all is None:
+            a.getparent().remove(a)
+        else:
+            a.set('href', show_all)
+    return lxml_html.tostring(tree, encoding='unicode', doctype='<!DOCTYPE html>')
+
+
+def _freelancermap_page(items):
+    entries = "\n".join(f'<div class="checkbox-item"><span class="item-name">Kategorie {i}</span>'
+                        f'<span class="count">{(i * 7919) % 20000:,}</span></div>'.replace(',', '.')
+                        for i in range(items))
+    return (f'<!DOCTYPE html><html lang="de"><body><div id="project-search">{entries}'
+            f'<button class="show-more-button">weniger anzeigen</button></div></body></html>')
+
+
+def synthetic_archive(directory, categories, subcategories):
+    """
+    Archive of generated pages: the freelance.de start pages (10 entries and an
+    'Alle anzeigen' link to `categories` entries), a page with `subcategories`
+    entries per category, and the expanded freelancermap projektboerse.
+    """
+    fixture = FIXTURE.read_text(encoding='utf-8')
+    archive = PageArchive(directory)
+    for section in SOURCES['freelance.de'].sections:
+        path = section.url.rsplit('/', 1)[1]
+        archive.record(section.url, _freelance_de_page(fixture, 10, path, show_all='?alle=1'), source='freelance.de')
+        full = _freelance_de_page(fixture, categories, path, show_all='?alle=1')
+        archive.record(section.url + '?alle=1', full, source='freelance.de')
+        subpage = _freelance_de_page(fixture, subcategories, path)
+        for href in lxml_html.fromstring(full).xpath("//ul[contains(@class, 'list-inline')]/li/a/@href"):
+            archive.record('https://www.freelance.de' + href, subpage, source='freelance.de')
+    archive.record(SOURCES['freelancermap.de'].sections[0].url, _freelancermap_page(categories * 4),
+                   source='freelancermap.de')
+    archive.save()
+    return archive
+
+
+def crawl(strategy, sources, archive, args):
+    """One crawl of `sources` on the replay stand-ins; returns {source: SourceMetrics, rows or exception}."""
+    results = {}
+
+    async def run(replay):
+        session = BrowserSession()
+        engine = ScrapeEngine(session, cache=PageCache(ttl=0), pool_size=args.pool_size, per_host=args.per_host,
+                              delay=0, fetch_mode=strategy, replay=replay)
+        try:
+            for source in sources:
+                try:
+                    rows = await engine.run_source(source)
+                    results[source.name] = (engine.metrics[source.name], rows)
+                except Exception as e:
+                    results[source.name] = (None, e)
+        finally:
+            await session.close()
+
+    output = sys.stdout if args.verbose else io.StringIO()
+    with Replay(archive, latency_ms=args.latency_ms) as replay, contextlib.redirect_stdout(output):
+        asyncio.run(run(replay))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--archive', type=Path, default=ARCHIVE_DIR)
+    parser.add_argument('--synthetic', action='store_true', help="Use generated pages even if an archive exists")
+    parser.add_argument('--strategies', nargs='+', choices=['static', 'browser'], default=['static', 'browser'])
+    parser.add_argument('--sources', nargs='+', choices=list(SOURCES), default=list(SOURCES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--pool-size', type=int, default=4)
+    parser.add_argument('--per-host', type=int, default=4)
+    parser.add_argument('--categories', type=int, default=50, help="Synthetic archive: entries of a full list")
+    parser.add_argument('--subcategories', type=int, default=20, help="Synthetic archive: entries of a subpage")
+    parser.add_argument('--verbose', action='store_true', help="Show the crawl output")
+    args = parser.parse_args()
+
+    archive = PageArchive(args.archive)
+    if args.synthetic or not len(archive):
+        archive = synthetic_archive(tempfile.mkdtemp(prefix='bench_scrapers_'), args.categories, args.subcategories)
+        label = f"synthetic ({args.categories} categories, {args.subcategories} subcategories)"
+    else:
+        label = str(args.archive)
+    sources = [SOURCES[name] for name in args.sources]
+
+    print(f"Archive: {label}, {len(archive)} responses, {args.latency_ms:g}ms latency, "
+          f"{args.repeat} runs per strategy\n")
+    print(f"{'strategy':<9} {'source':<17} {'pages':>6} {'rows':>7} {'crawl s':>8} {'pages/s':>8} "
+          f"{'fetch ms/pg':>12} {'parse ms/pg':>12} {'fallbacks':>10}")
+
+    reference_rows = {}
+    for strategy in args.strategies:
+        runs = {source.name: [] for source in sources}
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            for name, result in crawl(strategy, sources, archive, args).items():
+                runs[name].append(result)
+            if args.verbose:
+                print(f"{strategy} run in {time.perf_counter() - started:.2f}s")
+
+        for name, results in runs.items():
+            errors = [result for metrics, result in results if metrics is None]
+            if errors:
+                print(f"{strategy:<9} {name:<17} failed: {type(errors[0]).__name__}: {str(errors[0]).splitlines()[0]}")
+                continue
+            rows = results[0][1]
+            reference = reference_rows.setdefault(name, rows)
+            if any(result != reference for _, result in results):
+                print(f"WARNING: {strategy} rows of {name} differ between runs or from the first strategy")
+            metrics = [m for m, _ in results]
+            seconds = statistics.median(m.seconds for m in metrics)
+            pages = metrics[0].pages
+            fetch_ms = statistics.median(m.fetch_seconds / m.pages * 1000 for m in metrics)
+            parse_ms = statistics.median(m.parse_seconds / m.pages * 1000 for m in metrics)
+            print(f"{strategy:<9} {name:<17} {pages:>6} {metrics[0].rows:>7} {seconds:>8.2f} "
+                  f"{pages / seconds:>8.1f} {fetch_ms:>12.2f} {parse_ms:>12.3f} "
+                  f"{metrics[0].browser_fallbacks:>10}")
+
+
+if __name__ == '__main__':
+    main()
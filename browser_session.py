@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+"""
+One headless Chromium shared by all scrapers of a run.
+
+The browser is launched once and every source gets its own isolated
+context from it. The storage state of a context (cookies and local storage,
+among them the cookie consent) is saved per source under STATE_DIR and
+loaded into that source's next context, so a scraper can skip its consent
+step while the consent cookie is still valid.
+
+Launching a browser costs more than opening a context, so the summary
+reports the launch time and the launches saved by sharing it, and which
+consent steps were skipped (with the time the step took when it last ran).
+
+BrowserSession is used with playwright.async_api.
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+STATE_DIR = Path(os.getenv('SCRAPER_STATE_DIR', Path(__file__).parent / '.cache' / 'browser_state'))
+
+# Saved state older than this is not reused
+STATE_MAX_AGE_DAYS = float(os.getenv('SCRAPER_STATE_MAX_AGE_DAYS', 7))
+
+
+def state_path(source):
+    """Storage state file of `source`, e.g. '.cache/browser_state/freelance.de.json'."""
+    return STATE_DIR / f"{source}.json"
+
+
+def _meta_path(source):
+    return STATE_DIR / f"{source}.meta.json"
+
+
+def _read_meta(source):
+    try:
+        return json.loads(_meta_path(source).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def load_state(source, consent_cookie=None):
+    """
+    Saved storage state of `source` if it can be reused.
+
+    Returns:
+        (path or None, consented): consented is True if `consent_cookie` is
+        in the state and has not expired
+    """
+    path = state_path(source)
+    if not path.exists() or time.time() - path.stat().st_mtime > STATE_MAX_AGE_DAYS * 86400:
+        return None, False
+    if consent_cookie is None:
+        return path, False
+    try:
+        cookies = json.loads(path.read_text()).get('cookies', [])
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable browser state {path.name}: {e}")
+        return None, False
+    now = time.time()
+    consented = any(cookie['name'] == consent_cookie
+                    and (cookie.get('expires', -1) < 0 or cookie['expires'] > now)
+                    for cookie in cookies)
+    return path, consented
+
+
+def _write_meta(source, consent_seconds):
+    meta = _read_meta(source)
+    if consent_seconds is not None:
+        meta['consent_seconds'] = consent_seconds
+    meta['saved_at'] = time.strftime("%Y-%m-%d %H:%M:%S")
+    _meta_path(source).write_text(json.dumps(meta))
+
+
+class _SessionStats:
+    """Launch time, contexts and skipped consent steps of one session."""
+
+    def __init__(self):
+        self.launch_seconds = 0.0
+        self.contexts = []          # source of every context handed out
+        self.consent_skipped = {}   # source -> seconds the consent step took when it last ran
+
+    def record_context(self, source, consented):
+        self.contexts.append(source)
+        if consented:
+            self.consent_skipped[source] = _read_meta(source).get('consent_seconds', 0.0)
+
+    def summary_lines(self):
+        saved_launches = max(0, len(self.contexts) - 1)
+        lines = [f"launched once in {self.launch_seconds:.1f}s for {len(self.contexts)} contexts "
+                 f"({', '.join(self.contexts) or 'none'}), ~{saved_launches * self.launch_seconds:.1f}s "
+                 f"of launches saved"]
+        lines += [f"{source}: consent restored from saved state, skipped a ~{seconds:.1f}s step"
+                  for source, seconds in self.consent_skipped.items()]
+        return lines
+
+    def print_summary(self):
+        for line in self.summary_lines():
+            print(f"[browser] {line}")
+
+
+class BrowserSession:
+    """
+    Shared async browser handing out one context per source.
+
+    Usage:
+        async with BrowserSession() as session:
+            context, consented = await session.new_context('freelance.de', 'CookieConsent')
+            ...
+            await session.save_state(context, 'freelance.de')
+    """
+
+    def __init__(self, headless=True):
+        self.headless = headless
+        self.stats = _SessionStats()
+        self._playwright = None
+        self._browser = None
+        # Scrapers running concurrently must not launch a browser each
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        async with self._lock:
+            if self._browser is None:
+                from playwright.async_api import async_playwright
+                started = time.perf_counter()
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                self.stats.launch_seconds = time.perf_counter() - started
+        return self
+
+    async def close(self):
+        if self._browser is not None:
+            await self._browser.close()
+            await self._playwright.stop()
+            self._browser = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def new_context(self, source, consent_cookie=None, **options):
+        """
+        New isolated context for `source`, with its saved storage state if usable.
+
+        Returns:
+            (context, consented): consented is True if the saved state holds
+            a valid `consent_cookie`, so the consent step can be skipped
+        """
+        await self.start()
+        path, consented = load_state(source, consent_cookie)
+        if path is not None:
+            options['storage_state'] = str(path)
+        context = await self._browser.new_context(**options)
+        self.stats.record_context(source, consented)
+        return context, consented
+
+    async def save_state(self, context, source, consent_seconds=None):
+        """Save the storage state of `context` for the next run of `source`."""
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        await context.storage_state(path=str(state_path(source)))
+        _write_meta(source, consent_seconds)
+
+    def print_summary(self):
+        self.stats.print_summary()
+
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+"""
+Skip re-rendering report artifacts whose inputs did not change.
+
+Every artifact (usually one report function and the files it writes) is
+fingerprinted from two hashes: the data it is built from and its
+configuration, i.e. the plotting parameters plus the source code of the
+functions that render it. Both are stored in a JSON manifest next to the
+outputs. When both hashes match and all outputs still exist, the artifact
+is not rebuilt. The manifest also lists what the last run rebuilt and why.
+"""
+
+import hashlib
+import inspect
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+MANIFEST_NAME = '.build_manifest.json'
+
+
+def _update_hash(h, value):
+    """Feed `value` into the hash object `h`, recursing into containers."""
+    if isinstance(value, pd.DataFrame):
+        h.update(repr((list(value.columns), [str(t) for t in value.dtypes])).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, (pd.Series, pd.Index, pd.api.extensions.ExtensionArray)):
+        series = pd.Series(value) if not isinstance(value, pd.Series) else value
+        h.update(repr((series.name, str(series.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(series, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(repr((value.dtype.str, value.shape)).encode())
+        if value.dtype == object:
+            # The bytes of an object array are pointers; hash the elements by value
+            h.update(pd.util.hash_array(value.ravel()).tobytes())
+        else:
+            h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, Path):
+        # Files are hashed by content
+        h.update(value.read_bytes() if value.exists() else b'<missing>')
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            _update_hash(h, key)
+            _update_hash(h, value[key])
+    elif isinstance(value, (list, tuple)):
+        h.update(f'<{len(value)}>'.encode())
+        for item in value:
+            _update_hash(h, item)
+    elif callable(value):
+        h.update(inspect.getsource(value).encode())
+    else:
+        h.update(repr(value).encode())
+
+
+def fingerprint(*values):
+    """Hex digest identifying the content of `values`."""
+    h = hashlib.sha1()
+    for value in values:
+        _update_hash(h, value)
+    return h.hexdigest()
+
+
+class BuildCache:
+    """
+    Manifest of built artifacts in `root`.
+
+    Usage:
+        cache = BuildCache(REPORTS_DIR)
+        cache.build('trending_report', ['trending_categories.csv'],
+                    generate_trending_report, trend_data, top_categories)
+        cache.save()
+    """
+
+    def __init__(self, root, force=False):
+        self.root = Path(root)
+        self.path = self.root / MANIFEST_NAME
+        self.force = force
+        self.artifacts = {}
+        self.rebuilt = []
+        self.skipped = []
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        if self.path.exists():
+            try:
+                self.artifacts = json.loads(self.path.read_text()).get('artifacts', {})
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable build manifest {self.path}: {e}")
+
+    def _missing_output(self, outputs):
+        for pattern in outputs:
+            if not any(self.root.glob(pattern)):
+                return pattern
+        return None
+
+    def _stale_reason(self, name, data_hash, config_hash, outputs):
+        if self.force:
+            return "forced rebuild"
+        entry = self.artifacts.get(name)
+        if entry is None:
+            return "no previous build"
+        if entry.get('config_hash') != config_hash:
+            return "plotting parameters or code changed"
+        if entry.get('data_hash') != data_hash:
+            return "input data changed"
+        missing = self._missing_output(outputs)
+        if missing is not None:
+            return f"output missing: {missing}"
+        return None
+
+    def build(self, name, outputs, func, *args, inputs=None, params=None, code=(), **kwargs):
+        """
+        Call func(*args, **kwargs) unless artifact `name` is up to date.
+
+        Args:
+            name: Artifact name in the manifest
+            outputs: Files written by `func`, relative to the root; glob
+                patterns are allowed and must match at least one file
+            func: Function rendering the artifact
+            inputs: Data the artifact depends on, defaults to args and kwargs
+            params: Rendering parameters that are not visible in the code
+            code: Further functions whose source affects the output
+
+        Returns:
+            The result of `func`, or None if the build was skipped
+        """
+        data_hash = fingerprint(list(args) + [kwargs] if inputs is None else inputs)
+        config_hash = fingerprint(params or {}, [func, *code])
+        reason = self._stale_reason(name, data_hash, config_hash, outputs)
+
+        if reason is None:
+            print(f"Skipping {name}: up to date")
+            self.skipped.append(name)
+            return None
+
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        seconds = round(time.perf_counter() - started, 2)
+
+        self.artifacts[name] = {
+            'data_hash': data_hash,
+            'config_hash': config_hash,
+            'outputs': list(outputs),
+            'built_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        self.rebuilt.append({'artifact': name, 'reason': reason, 'seconds': seconds})
+        return result
+
+    def save(self):
+        """Write the manifest and print a summary of this run."""
+        manifest = {
+            'artifacts': self.artifacts,
+            'last_run': {
+                'started_at': self.started_at,
+                'rebuilt': self.rebuilt,
+                'skipped': self.skipped,
+            },
+        }
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(manifest, indent=2))
+        tmp_path.replace(self.path)
+        print(f"Build cache: {len(self.rebuilt)} rebuilt, {len(self.skipped)} up to date")
+        for entry in self.rebuilt:
+            print(f"  rebuilt {entry['artifact']} ({entry['reason']}, {entry['seconds']}s)")
@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+"""
+Keyword-based assignment of categories to category groups.
+
+A category belongs to the first group (in dict order) that has a keyword
+occurring anywhere in the lowercased category name. All groups are compiled
+into one regular expression: every group is an alternation branch guarded by
+a lookahead, and because branches are tried in order the first matching
+group wins, exactly like looping over the groups and keywords.
+
+The rule sets used by the reports live here so that ingestion can classify
+new categories into the category_groups table (see sync_category_groups).
+Each rule set is versioned by a hash of its rules; when a rule set changes,
+only the categories whose group can have changed are re-classified.
+"""
+
+import hashlib
+import json
+import re
+import numpy as np
+import pandas as pd
+
+DEFAULT_GROUP = 'Other'
+
+# Category groupings used by generate_reports.py
+REPORT_CATEGORY_GROUPS = {
+    'Development': [
+        'Java', 'Python', 'C#', 'C++', '.NET', 'PHP', 'JavaScript', 'TypeScript',
+        'React', 'Angular', 'Vue', 'Node.js', 'Full-Stack', 'Frontend', 'Backend',
+        'Mobile', 'iOS', 'Android', 'Swift', 'Kotlin', 'Flutter', 'React Native',
+        'DevOps', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Cloud',
+        'Entwickler', 'Entwicklung', 'Software', 'Web', 'App', 'Mobile', 'Programmierung'
+    ],
+    'Data': [
+        'Data', 'Analytics', 'Business Intelligence', 'BI', 'Tableau', 'Power BI',
+        'SQL', 'Database', 'Datenbank', 'ETL', 'Data Warehouse', 'Data Lake',
+        'Big Data', 'Hadoop', 'Spark', 'Data Science', 'Machine Learning', 'ML',
+        'AI', 'Artificial Intelligence', 'Deep Learning', 'NLP', 'Natural Language',
+        'Data Engineer', 'Data Analyst', 'Data Scientist', 'Statistik', 'Daten'
+    ],
+    'Management': [
+        'Project', 'Projekt', 'Management', 'Manager', 'PMO', 'Scrum', 'Agile',
+        'Product Owner', 'PO', 'Scrum Master', 'Kanban', 'Lean', 'Projektleiter',
+        'Projektmanager', 'Projektleitung', 'Führung', 'Lead', 'Leitung'
+    ],
+    'Design': [
+        'Design', 'UX', 'UI', 'User Experience', 'User Interface', 'Graphic',
+        'Grafik', 'Visual', 'Creative', 'Kreativ', 'Illustration', 'Animation',
+        'Video', 'Media', 'Medien', '3D', 'CAD'
+    ],
+    'Infrastructure': [
+        'System', 'Network', 'Netzwerk', 'Security', 'Sicherheit', 'Admin',
+        'Administrator', 'IT-Administration', 'Support', 'Helpdesk', 'Service Desk',
+        'Infrastructure', 'Infrastruktur', 'Server', 'Hardware', 'Virtualization',
+        'VMware', 'Hyper-V', 'Windows', 'Linux', 'Unix'
+    ],
+    'SAP': [
+        'SAP', 'ABAP', 'S/4HANA', 'ERP', 'FI', 'CO', 'MM', 'SD', 'PP', 'HCM',
+        'CRM', 'BW', 'BI', 'Fiori', 'HANA'
+    ],
+    'Testing': [
+        'Test', 'QA', 'Quality Assurance', 'Qualitätssicherung', 'Testing',
+        'Tester', 'Selenium', 'Cypress', 'Automation', 'Automatisierung'
+    ],
+    'Consulting': [
+        'Consulting', 'Beratung', 'Berater', 'Consultant', 'Strategy', 'Strategie',
+        'Business', 'Geschäft', 'Process', 'Prozess', 'Optimization', 'Optimierung'
+    ],
+    'Marketing': [
+        'Marketing', 'SEO', 'SEA', 'SEM', 'Social Media', 'Content', 'Online Marketing',
+        'Digital Marketing', 'E-Commerce', 'Ecommerce', 'CRM', 'Customer', 'Kunde'
+    ]
+}
+
+# Category groupings used by analyze_categories_trends.py
+TREND_CATEGORY_GROUPS = {
+    'Development': [
+        'entwickl', 'develop', 'software', 'web', 'app', 'mobile', 'java', 'python', 
+        'c#', 'c++', '.net', 'php', 'javascript', 'typescript', 'react', 'angular', 
+        'vue', 'node', 'full-stack', 'frontend', 'backend', 'ios', 'android', 'swift', 
+        'kotlin', 'flutter', 'devops', 'docker', 'kubernetes', 'aws', 'azure', 'cloud',
+        'programm', 'coding', 'coder', 'entwickler'
+    ],
+    'Data': [
+        'data', 'analytics', 'business intelligence', 'bi', 'tableau', 'power bi',
+        'sql', 'database', 'datenbank', 'etl', 'data warehouse', 'data lake',
+        'big data', 'hadoop', 'spark', 'data science', 'machine learning', 'ml',
+        'ai', 'artificial intelligence', 'deep learning', 'nlp', 'statistik', 'daten',
+        'analyst', 'scientist', 'engineer'
+    ],
+    'Management': [
+        'project', 'projekt', 'management', 'manager', 'pmo', 'scrum', 'agile',
+        'product owner', 'po', 'scrum master', 'kanban', 'lean', 'projektleiter',
+        'projektmanager', 'projektleitung', 'führung', 'lead', 'leitung'
+    ],
+    'Design': [
+        'design', 'ux', 'ui', 'user experience', 'user interface', 'graphic',
+        'grafik', 'visual', 'creative', 'kreativ', 'illustration', 'animation',
+        'video', 'media', 'medien', '3d', 'cad'
+    ],
+    'Infrastructure': [
+        'system', 'network', 'netzwerk', 'security', 'sicherheit', 'admin',
+        'administrator', 'it-administration', 'support', 'helpdesk', 'service desk',
+        'infrastructure', 'infrastruktur', 'server', 'hardware', 'virtualization',
+        'vmware', 'hyper-v', 'windows', 'linux', 'unix'
+    ],
+    'SAP': [
+        'sap', 'abap', 's/4hana', 'erp', 'fi', 'co', 'mm', 'sd', 'pp', 'hcm',
+        'crm', 'bw', 'fiori', 'hana'
+    ],
+    'Testing': [
+        'test', 'qa', 'quality assurance', 'qualitätssicherung', 'testing',
+        'tester', 'selenium', 'cypress', 'automation', 'automatisierung'
+    ],
+    'Consulting': [
+        'consulting', 'beratung', 'berater', 'consultant', 'strategy', 'strategie',
+        'business', 'geschäft', 'process', 'prozess', 'optimization', 'optimierung'
+    ],
+    'Marketing': [
+        'marketing', 'seo', 'sea', 'sem', 'social media', 'content', 'online marketing',
+        'digital marketing', 'e-commerce', 'ecommerce', 'crm', 'customer', 'kunde'
+    ],
+    'Healthcare': [
+        'gesundheit', 'health', 'medical', 'medizin', 'arzt', 'ärzte', 'pflege', 
+        'pharma', 'krankenhaus', 'hospital', 'klinik', 'clinic'
+    ],
+    'Engineering': [
+        'ingenieur', 'engineer', 'maschinenbau', 'mechanical', 'electrical', 
+        'elektronik', 'elektro', 'automotive', 'automobil', 'construction', 'bau'
+    ],
+    'Finance': [
+        'finanz', 'finance', 'accounting', 'buchhaltung', 'controlling', 'bank', 
+        'versicherung', 'insurance', 'steuer', 'tax', 'wirtschaft', 'economic'
+    ],
+    'Legal': [
+        'legal', 'recht', 'law', 'anwalt', 'attorney', 'compliance', 'vertrag', 
+        'contract', 'datenschutz', 'privacy'
+    ],
+    'Location': [
+        'deutschland', 'germany', 'berlin', 'hamburg', 'münchen', 'munich', 'köln', 
+        'cologne', 'frankfurt', 'stuttgart', 'düsseldorf', 'dortmund', 'essen', 
+        'bremen', 'dresden', 'leipzig', 'hannover', 'nürnberg', 'nuremberg', 
+        'duisburg', 'bochum', 'wuppertal', 'bielefeld', 'bonn', 'mannheim',
+        'nordrhein-westfalen', 'bayern', 'bavaria', 'baden-württemberg', 'hessen',
+        'niedersachsen', 'sachsen', 'rheinland-pfalz', 'berlin', 'schleswig-holstein',
+        'brandenburg', 'sachsen-anhalt', 'thüringen', 'hamburg', 'mecklenburg-vorpommern',
+        'saarland', 'bremen'
+    ],
+    'Work Model': [
+        'remote', 'vor ort', 'hybrid', 'homeoffice', 'home office', 'onsite', 
+        'on-site', 'offsite', 'off-site', 'freiberuflich', 'freelance'
+    ]
+}
+
+# Rule sets materialized in the category_groups table, by name
+RULESETS = {
+    'reports': REPORT_CATEGORY_GROUPS,
+    'trends': TREND_CATEGORY_GROUPS,
+}
+
+
+class CategoryClassifier:
+    """Classify category names with a precompiled first-group-wins regex."""
+
+    def __init__(self, category_groups, default=DEFAULT_GROUP):
+        self.groups = list(category_groups)
+        self.default = default
+
+        branches = []
+        for index, (group, keywords) in enumerate(category_groups.items()):
+            # Any keyword occurring anywhere in the name selects the group
+            lowered = sorted({keyword.lower() for keyword in keywords}, key=lambda k: (-len(k), k))
+            if not lowered:
+                continue
+            alternation = '|'.join(re.escape(keyword) for keyword in lowered)
+            branches.append(f"(?=.*?(?:{alternation}))(?P<g{index}>)")
+        self.pattern = re.compile('(?:' + '|'.join(branches) + ')', re.DOTALL) if branches else None
+
+    def classify(self, category):
+        """Return the group of a single category name."""
+        if pd.isna(category) or category == '' or self.pattern is None:
+            return self.default
+        match = self.pattern.match(str(category).lower())
+        if match is None:
+            return self.default
+        return self.groups[int(match.lastgroup[1:])]
+
+    def classify_series(self, categories):
+        """
+        Classify a Series of category names.
+
+        Each distinct name is classified once and the result is mapped back
+        through its integer code. Returns a Categorical Series whose categories
+        are the group names plus the default group, sorted like plain strings
+        so sorting and pivoting behave as they would on an object column.
+        """
+        if isinstance(categories.dtype, pd.CategoricalDtype):
+            codes = categories.cat.codes.to_numpy()
+            uniques = categories.cat.categories
+        else:
+            codes, uniques = pd.factorize(categories)
+
+        labels = sorted(set(self.groups) | {self.default})
+        label_index = {label: i for i, label in enumerate(labels)}
+        # The trailing default entry also serves missing values (code -1)
+        group_codes = np.array([label_index[self.classify(name)] for name in uniques] +
+                               [label_index[self.default]], dtype=np.int32)
+
+        return pd.Series(pd.Categorical.from_codes(group_codes[codes], labels),
+                         index=categories.index, name='group')
+
+
+def ruleset_version(category_groups):
+    """Short hash identifying the rules (groups, keywords and their order)."""
+    rules = json.dumps(list(category_groups.items()), ensure_ascii=False)
+    return hashlib.sha1(rules.encode('utf-8')).hexdigest()[:12]
+
+
+def affected_groups(old_groups, new_groups, default=DEFAULT_GROUP):
+    """
+    Groups whose categories may be classified differently under `new_groups`.
+
+    Groups are tried in order, so a category assigned to a group that comes
+    before the first changed rule still matches that same group first.
+    Only categories assigned to later groups, to a removed group or to the
+    default group have to be classified again.
+    """
+    old_items = [(group, list(keywords)) for group, keywords in old_groups.items()]
+    new_items = [(group, list(keywords)) for group, keywords in new_groups.items()]
+
+    first_change = min(len(old_items), len(new_items))
+    for i, (old, new) in enumerate(zip(old_items, new_items)):
+        if old != new:
+            first_change = i
+            break
+
+    return {group for group, _ in old_items[first_change:]} | {default}
+
+
+def _fetch_categories(cursor, ruleset, groups=None):
+    if groups is None:
+        cursor.execute("SELECT category, grp FROM category_groups WHERE ruleset = %s", (ruleset,))
+    else:
+        groups = sorted(groups)
+        placeholders = ', '.join(['%s'] * len(groups))
+        cursor.execute(f"""
+            SELECT category, grp FROM category_groups
+            WHERE ruleset = %s AND grp IN ({placeholders})
+        """, (ruleset, *groups))
+    return dict(cursor.fetchall())
+
+
+def _fetch_known(cursor, ruleset, categories, chunk_size=1000):
+    """The subset of `categories` already classified for `ruleset`, looked up by name."""
+    categories = sorted(categories)
+    known = set()
+    for i in range(0, len(categories), chunk_size):
+        chunk = categories[i:i + chunk_size]
+        placeholders = ', '.join(['%s'] * len(chunk))
+        cursor.execute(f"""
+            SELECT category FROM category_groups
+            WHERE ruleset = %s AND category IN ({placeholders})
+        """, (ruleset, *chunk))
+        known.update(row[0] for row in cursor.fetchall())
+    return known
+
+
+def _reclassify(cursor, ruleset, category_groups, old_groups, version):
+    """Re-classify the categories a rule change can affect and bump the stored version."""
+    classifier = CategoryClassifier(category_groups)
+    candidates = _fetch_categories(cursor, ruleset, affected_groups(old_groups, category_groups))
+    changed = []
+    for category, group in candidates.items():
+        new_group = classifier.classify(category)
+        if new_group != group:
+            changed.append((new_group, version, ruleset, category))
+    if changed:
+        cursor.executemany("""
+            UPDATE category_groups SET grp = %s, rules_version = %s
+            WHERE ruleset = %s AND category = %s
+        """, changed)
+    cursor.execute("UPDATE category_groups SET rules_version = %s WHERE ruleset = %s",
+                   (version, ruleset))
+    print(f"Rule set '{ruleset}' changed: re-classified {len(candidates)} categories, "
+          f"{len(changed)} moved to another group")
+
+
+def sync_category_groups(conn, categories, rulesets=None):
+    """
+    Keep the category_groups table current for `categories`.
+
+    Categories that are not in the table yet are classified and inserted.
+    If a rule set changed since it was last stored, the affected categories
+    are re-classified first. Does not commit.
+
+    Args:
+        conn: Open MySQL connection
+        categories: Iterable of category names, e.g. those just ingested
+        rulesets: Mapping of rule set name to groups, defaults to RULESETS
+    """
+    rulesets = RULESETS if rulesets is None else rulesets
+    categories = {str(c) for c in categories if not pd.isna(c) and str(c) != ''}
+
+    with conn.cursor() as cursor:
+        for ruleset, category_groups in rulesets.items():
+            classifier = CategoryClassifier(category_groups)
+            version = ruleset_version(category_groups)
+
+            cursor.execute("SELECT version, rules FROM category_group_rulesets WHERE ruleset = %s",
+                           (ruleset,))
+            stored = cursor.fetchone()
+            if stored is None or stored[0] != version:
+                if stored is not None:
+                    _reclassify(cursor, ruleset, category_groups, dict(json.loads(stored[1])), version)
+                cursor.execute("""
+                    INSERT INTO category_group_rulesets (ruleset, version, rules)
+                    VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE version = VALUES(version), rules = VALUES(rules)
+                """, (ruleset, version, json.dumps(list(category_groups.items()), ensure_ascii=False)))
+
+            # Only the batch's categories are looked up, not the whole rule set
+            known = _fetch_known(cursor, ruleset, categories)
+            new_rows = [(ruleset, category, classifier.classify(category), version)
+                        for category in sorted(categories - known)]
+            if new_rows:
+                # IGNORE: names differing only in case or trailing spaces share a key
+                cursor.executemany("""
+                    INSERT IGNORE INTO category_groups (ruleset, category, grp, rules_version)
+                    VALUES (%s, %s, %s, %s)
+                """, new_rows)
+                print(f"Classified {len(new_rows)} new categories for rule set '{ruleset}'")
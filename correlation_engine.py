@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""
+Pearson correlations between many daily series with numpy.
+
+The series (columns of a dates x series matrix) are standardized once, to
+zero mean and unit norm, after which the correlation matrix is a single
+matrix product Z.T @ Z. For many series the product can be computed in row
+blocks of `block_size` series, which bounds the memory to block_size x n
+values when only the strongest pairs are wanted.
+
+The strongest positive and negative pairs are selected from the upper
+triangle with argpartition, so only the k selected pairs are ever sorted.
+Series without variance correlate as NaN, like DataFrame.corr().
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def standardize(values):
+    """
+    Center each column and scale it to unit norm.
+
+    Args:
+        values: 2-D array, one row per observation and one column per series
+
+    Returns:
+        (z, valid): the standardized float64 matrix and a boolean mask of
+        the columns with non-zero variance (their z columns are all zero)
+    """
+    z = np.asarray(values, dtype=np.float64)
+    z = z - z.mean(axis=0)
+    norms = np.sqrt(np.einsum('ij,ij->j', z, z))
+    valid = norms > 0
+    z[:, valid] /= norms[valid]
+    z[:, ~valid] = 0.0
+    return z, valid
+
+
+def _finish(block, valid, rows):
+    """Clip rounding noise and mark constant series as NaN in a correlation block."""
+    np.clip(block, -1.0, 1.0, out=block)
+    block[~valid[rows], :] = np.nan
+    block[:, ~valid] = np.nan
+    return block
+
+
+def iter_correlation_blocks(z, valid, block_size=None):
+    """Yield (row offset, correlation rows) of Z.T @ Z, `block_size` rows at a time."""
+    n = z.shape[1]
+    block_size = n if not block_size else block_size
+    for start in range(0, n, block_size):
+        rows = slice(start, min(start + block_size, n))
+        yield start, _finish(z[:, rows].T @ z, valid, rows)
+
+
+def correlation_matrix(values, block_size=None):
+    """Correlation matrix of the columns of `values`, computed in row blocks if requested."""
+    z, valid = standardize(values)
+    n = z.shape[1]
+    corr = np.empty((n, n))
+    for start, block in iter_correlation_blocks(z, valid, block_size):
+        corr[start:start + len(block)] = block
+    # Exact ones on the diagonal, as DataFrame.corr() reports them
+    diagonal = np.arange(n)[valid]
+    corr[diagonal, diagonal] = 1.0
+    return corr
+
+
+def _select(candidates, k, largest):
+    """Keep the k largest (or smallest) of the (i, j, value) candidate arrays, sorted."""
+    i, j, values = candidates
+    keyed = -values if largest else values
+    if len(values) > k:
+        keep = np.argpartition(keyed, k - 1)[:k]
+        i, j, values, keyed = i[keep], j[keep], values[keep], keyed[keep]
+    order = np.argsort(keyed, kind='stable')
+    return i[order], j[order], values[order]
+
+
+def top_pairs(values, k=10, block_size=None):
+    """
+    Strongest positive and negative pairs among the columns of `values`.
+
+    Only the upper triangle (i < j) is considered and NaN correlations are
+    skipped. Each block contributes its own top k candidates, so at most
+    block_size x n correlations are held at once.
+
+    Returns:
+        (positive, negative): (i, j, correlation) arrays, positive sorted
+        from the highest correlation down, negative from the lowest up
+    """
+    z, valid = standardize(values)
+    empty = (np.array([], dtype=np.intp), np.array([], dtype=np.intp), np.array([]))
+    positive, negative = empty, empty
+
+    for start, block in iter_correlation_blocks(z, valid, block_size):
+        rows = np.arange(start, start + len(block))[:, None]
+        mask = (np.arange(block.shape[1])[None, :] > rows) & ~np.isnan(block)
+        i, j = np.nonzero(mask)
+        candidates = (i + start, j, block[i, j])
+        positive = _select(tuple(np.concatenate(pair) for pair in zip(positive, candidates)), k, True)
+        negative = _select(tuple(np.concatenate(pair) for pair in zip(negative, candidates)), k, False)
+
+    return positive, negative
+
+
+def correlation_frame(frame, block_size=None):
+    """numpy equivalent of `frame.corr()` for a frame without missing values."""
+    corr = correlation_matrix(frame.to_numpy(), block_size)
+    return pd.DataFrame(corr, index=frame.columns, columns=frame.columns)
+
+
+def pairs_frame(columns, i, j, correlation):
+    """Pairs as a DataFrame with group1, group2 and correlation columns."""
+    columns = np.asarray(columns, dtype=object)
+    return pd.DataFrame({'group1': columns[i], 'group2': columns[j], 'correlation': correlation})
+
+
+def all_pairs(corr_frame):
+    """Every upper-triangle pair of a correlation frame, highest correlation first (NaN last)."""
+    i, j = np.triu_indices(len(corr_frame.columns), k=1)
+    pairs = pairs_frame(corr_frame.columns, i, j, corr_frame.to_numpy()[i, j])
+    return pairs.sort_values('correlation', ascending=False, kind='stable', ignore_index=True)
+
+
+def top_correlated_pairs(frame, k=10, block_size=None):
+    """
+    The k most positively and most negatively correlated column pairs of `frame`.
+
+    Returns:
+        (positive, negative) DataFrames with group1, group2 and correlation,
+        positive from the highest correlation down and negative from the
+        lowest up
+    """
+    positive, negative = top_pairs(frame.to_numpy(), k, block_size)
+    return pairs_frame(frame.columns, *positive), pairs_frame(frame.columns, *negative)
+
+
+def top_pairs_of_frame(corr_frame, k=10):
+    """
+    top_correlated_pairs() from an already computed correlation frame, for
+    callers that need the full matrix anyway; nothing is recomputed.
+    """
+    i, j = np.triu_indices(len(corr_frame.columns), k=1)
+    values = corr_frame.to_numpy()[i, j]
+    known = ~np.isnan(values)
+    candidates = (i[known], j[known], values[known])
+    positive, negative = _select(candidates, k, True), _select(candidates, k, False)
+    return pairs_frame(corr_frame.columns, *positive), pairs_frame(corr_frame.columns, *negative)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+"""
+Materialized daily series for the Streamlit dashboard.
+
+For every table the daily_series table holds one row per date and category
+with the number of that day (0 where the category has no row) and the
+difference to the previous date, i.e. the long format of
+`pivot_table(...).fillna(0)` and its `.diff()`. The dashboard only slices
+these rows by date range and job group instead of pivoting, diffing and
+melting on every widget interaction.
+
+Category names are merged the way MySQL's case-insensitive, PAD SPACE
+collation compares them ("Java", "java" and "Java " are one category), so
+the dense rows never collide on the primary key.
+
+Runs as the last stage of run_pipeline.sh. Only dates from RECHECK_DAYS
+before the last materialized date on are recomputed, like the report cache;
+use --full-refresh after rows were rewritten further back.
+"""
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from db_utils import BATCH_SIZE, ensure_tables_exist, pooled_connection
+from report_cache import RECHECK_DAYS
+
+TABLES = ('projects', 'freelances')
+
+
+def collation_key(category):
+    """A category name as the MySQL collation compares it: without trailing spaces, case-folded."""
+    return str(category).rstrip(' ').casefold()
+
+
+def _canonical_names(df, categories=None):
+    """
+    One name per collation key: the name in `categories` if it has one (the
+    name already materialized), else the spelling of the latest row in `df`.
+    """
+    names = {}
+    latest = df.sort_values('date', kind='stable').drop_duplicates('category', keep='last')
+    for category in latest['category'].astype(str):
+        names[collation_key(category)] = category
+    for category in categories or ():
+        names[collation_key(category)] = str(category)
+    return names
+
+
+def build_daily_series(df, categories=None, base=None):
+    """
+    Dense long-format daily values and day-over-day differences.
+
+    Args:
+        df: Rows with date, category and num columns
+        categories: Categories to include besides those in `df`; variants
+            of these names in `df` are counted under them
+        base: Series of num per category on the date before the first date
+            of `df`; the first differences are taken against it (against 0
+            where it is missing). Without a base they are 0, like
+            `.diff().fillna(0)`
+
+    Returns:
+        DataFrame with date, category, num and diff, sorted by date and category
+    """
+    names = _canonical_names(df, categories)
+    raw = df['category'].astype(str)
+    df = df.assign(category=raw.map({category: names[collation_key(category)] for category in raw.unique()}))
+
+    pivot = df.pivot_table(index='date', columns='category', values='num',
+                           aggfunc='sum', observed=True).fillna(0)
+    columns = sorted(set(map(str, pivot.columns)) | set(names.values()))
+    pivot.columns = pivot.columns.astype(str)
+    pivot = pivot.reindex(columns=columns, fill_value=0).sort_index()
+
+    values = pivot.to_numpy(dtype=np.int64)
+    if base is not None:
+        previous = base.reindex(columns).fillna(0).to_numpy(dtype=np.int64)
+    else:
+        previous = values[0] if len(values) else np.zeros(len(columns), dtype=np.int64)
+    diffs = np.diff(values, axis=0, prepend=previous[None, :])
+
+    return pd.DataFrame({
+        'date': np.repeat(pivot.index.to_numpy(), len(columns)),
+        'category': np.tile(np.asarray(columns, dtype=object), len(pivot.index)),
+        'num': values.ravel(),
+        'diff': diffs.ravel(),
+    })
+
+
+def _read_rows(conn, table_name, start_date=None):
+    where = "WHERE date >= %s" if start_date else ""
+    df = pd.read_sql(f"SELECT date, category, num FROM {table_name} {where}", conn,
+                     params=(start_date,) if start_date else None)
+    df['date'] = pd.to_datetime(df['date'])
+    df['num'] = pd.to_numeric(df['num'], errors='coerce').fillna(0).astype('int64')
+    return df
+
+
+def _insert_rows(cursor, series, rows):
+    values = list(zip([series] * len(rows), rows['date'].dt.strftime("%Y-%m-%d"),
+                      rows['category'], rows['num'].tolist(), rows['diff'].tolist()))
+    query = "INSERT INTO daily_series (series, date, category, num, diff) VALUES (%s, %s, %s, %s, %s)"
+    for i in range(0, len(values), BATCH_SIZE):
+        cursor.executemany(query, values[i:i+BATCH_SIZE])
+    return len(values)
+
+
+def materialize_daily_series(conn, table_name, full_refresh=False):
+    """
+    Recompute the daily series of `table_name` from the recheck window on.
+
+    Categories that first appear in the window get zero rows on all earlier
+    materialized dates so every date has a row per category.
+
+    Returns:
+        Number of rows written
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT MAX(date) FROM daily_series WHERE series = %s", (table_name,))
+        last_date = cursor.fetchone()[0]
+
+        if full_refresh or last_date is None:
+            daily = build_daily_series(_read_rows(conn, table_name))
+            cursor.execute("DELETE FROM daily_series WHERE series = %s", (table_name,))
+            written = _insert_rows(cursor, table_name, daily)
+            conn.commit()
+            return written
+
+        start_date = (pd.Timestamp(last_date) - pd.Timedelta(days=RECHECK_DAYS)).strftime("%Y-%m-%d")
+        cursor.execute("""
+            SELECT category, num FROM daily_series
+            WHERE series = %s AND date = (SELECT MAX(date) FROM daily_series WHERE series = %s AND date < %s)
+        """, (table_name, table_name, start_date))
+        base = pd.Series({category: num for category, num in cursor.fetchall()}, dtype='int64')
+        cursor.execute("SELECT DISTINCT category FROM daily_series WHERE series = %s", (table_name,))
+        known = {row[0] for row in cursor.fetchall()}
+
+        rows = _read_rows(conn, table_name, start_date)
+        if rows.empty:
+            return 0
+        daily = build_daily_series(rows, categories=known, base=base)
+
+        new_categories = sorted(set(daily['category']) - known)
+        if new_categories:
+            cursor.execute("SELECT DISTINCT date FROM daily_series WHERE series = %s AND date < %s",
+                           (table_name, start_date))
+            old_dates = pd.to_datetime([row[0] for row in cursor.fetchall()])
+            backfill = pd.DataFrame({
+                'date': np.repeat(old_dates.to_numpy(), len(new_categories)),
+                'category': np.tile(np.asarray(new_categories, dtype=object), len(old_dates)),
+                'num': 0, 'diff': 0,
+            })
+            daily = pd.concat([backfill, daily], ignore_index=True)
+
+        cursor.execute("DELETE FROM daily_series WHERE series = %s AND date >= %s", (table_name, start_date))
+        written = _insert_rows(cursor, table_name, daily)
+    conn.commit()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Materialize the dashboard's daily series")
+    parser.add_argument('--full-refresh', action='store_true',
+                        help="Rebuild the series from the full tables")
+    parser.add_argument('--tables', nargs='+', choices=TABLES, default=list(TABLES))
+    args = parser.parse_args()
+
+    with pooled_connection() as conn:
+        ensure_tables_exist(conn)
+        for table_name in args.tables:
+            started = time.perf_counter()
+            written = materialize_daily_series(conn, table_name, args.full_refresh)
+            print(f"Materialized {written} daily rows of {table_name} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,17 @@
 Database utility functions for connecting to MySQL and performing common operations.
 """
 
+import atexit
 import os
+import queue
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 import pymysql
 import pandas as pd
 from dotenv import load_dotenv
+from category_groups import sync_category_groups
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,9 +25,24 @@ MYSQL_DB = os.getenv('DB_NAME')
 MYSQL_USER = os.getenv('DB_USER')
 MYSQL_PASSWORD = os.getenv('DB_PASSWORD')
 
-def get_mysql_connection():
+# Rows per INSERT statement / executemany batch
+BATCH_SIZE = 1000
+# From this many rows on, explicit multi-row INSERT statements replace executemany
+BULK_INSERT_THRESHOLD = int(os.getenv('DB_BULK_INSERT_THRESHOLD', 5000))
+
+# Connection pool limits
+POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 5))
+POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+
+# Set once ensure_tables_exist has run in this process
+_tables_checked = False
+_tables_lock = threading.Lock()
+
+def get_mysql_connection(**kwargs):
     """
     Get a connection to the MySQL database using environment variables.
+    
+    Extra keyword arguments (e.g. local_infile=True) are passed to pymysql.connect.
     """
     try:
         conn = pymysql.connect(
@@ -29,17 +51,122 @@ def get_mysql_connection():
             user=MYSQL_USER,
             password=MYSQL_PASSWORD,
             database=MYSQL_DB,
-            charset='utf8mb4'
+            charset='utf8mb4',
+            **kwargs
         )
         return conn
     except Exception as e:
         print(f"Error connecting to MySQL database: {e}")
         raise
 
-def ensure_tables_exist(conn):
+class ConnectionPool:
+    """
+    Process-wide pool of MySQL connections.
+    
+    At most `max_size` connections are checked out at once. Idle connections
+    are pinged before they are handed out again and replaced when the ping
+    fails, and any open transaction is rolled back when a connection is
+    returned, so the next user never reads from a stale snapshot.
+    """
+    
+    def __init__(self, max_size=POOL_MAX_SIZE, timeout=POOL_TIMEOUT):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+    
+    def acquire(self):
+        """Check out a healthy connection, opening a new one if none is idle."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No MySQL connection available after {self.timeout}s (pool size {self.max_size})")
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    return get_mysql_connection()
+                if self._is_healthy(conn):
+                    return conn
+                self._discard(conn)
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def release(self, conn):
+        """Return a connection to the pool, discarding it if it is broken."""
+        try:
+            conn.rollback()
+            self._idle.put(conn)
+        except Exception:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+    
+    def close(self):
+        """Close all idle connections."""
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+    
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+    
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool()
+            atexit.register(_pool.close)
+        return _pool
+
+@contextmanager
+def pooled_connection():
+    """
+    Borrow a connection from the process-wide pool.
+    
+    Usage:
+        with pooled_connection() as conn:
+            df = pd.read_sql(query, conn)
+    """
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+def ensure_tables_exist(conn, force=False):
     """
     Ensure that the required tables exist in the MySQL database.
+    
+    The DDL runs only once per process unless `force` is set.
     """
+    global _tables_checked
+    with _tables_lock:
+        if _tables_checked and not force:
+            return
+        _create_tables(conn)
+        _tables_checked = True
+
+def _create_tables(conn):
     cursor = conn.cursor()
     
     # Create projects table
@@ -64,9 +191,99 @@ def ensure_tables_exist(conn):
     )
     """)
     
+    # Group of each category per rule set, maintained on ingest
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS category_groups (
+        ruleset VARCHAR(32),
+        category VARCHAR(255),
+        grp VARCHAR(64),
+        rules_version CHAR(12),
+        PRIMARY KEY (ruleset, category),
+        KEY (ruleset, grp)
+    )
+    """)
+    
+    # Rules each rule set was last classified with
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS category_group_rulesets (
+        ruleset VARCHAR(32) PRIMARY KEY,
+        version CHAR(12),
+        rules TEXT
+    )
+    """)
+
+    # Dense daily values and differences per table for the dashboard (see daily_series.py)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS daily_series (
+        series VARCHAR(16),
+        date DATE,
+        category VARCHAR(255),
+        num INTEGER,
+        diff INTEGER,
+        PRIMARY KEY (series, category, date),
+        KEY (series, date)
+    )
+    """)
+
     conn.commit()
     cursor.close()
 
+def _num_column(df):
+    """`num` as nullable integers; values that are not numeric become NA."""
+    return pd.to_numeric(df['num'], errors='coerce').round().astype('Int64')
+
+def _href_column(df):
+    """`href` with None for missing values, or empty strings if the column is absent."""
+    if 'href' in df.columns:
+        return df['href'].astype(object).where(df['href'].notna(), None)
+    return pd.Series('', index=df.index, dtype=object)
+
+def prepare_values(df):
+    """
+    Build the (date, category, num, href) parameter tuples column-wise.
+    
+    `num` is coerced to integers (NULL when not numeric) and a missing
+    `href` column is filled with empty strings.
+    """
+    num = _num_column(df)
+    num = num.astype(object).where(num.notna(), None)
+    href = _href_column(df)
+    
+    return list(zip(
+        df['date'].tolist(),
+        df['category'].tolist(),
+        num.tolist(),
+        href.tolist()
+    ))
+
+def upsert_values(cursor, table_name, values, batch_size=BATCH_SIZE):
+    """
+    Insert parameter tuples with ON DUPLICATE KEY UPDATE.
+    
+    Small loads use executemany; large backfills send explicit multi-row
+    INSERT ... VALUES (...),(...) statements of `batch_size` rows each.
+    """
+    upsert_clause = """
+            ON DUPLICATE KEY UPDATE
+            num = VALUES(num),
+            href = VALUES(href)
+            """
+    
+    if len(values) < BULK_INSERT_THRESHOLD:
+        query = f"""
+            INSERT INTO {table_name} (date, category, num, href)
+            VALUES (%s, %s, %s, %s)
+            """ + upsert_clause
+        for i in range(0, len(values), batch_size):
+            cursor.executemany(query, values[i:i+batch_size])
+        return
+    
+    for i in range(0, len(values), batch_size):
+        batch = values[i:i+batch_size]
+        placeholders = ",".join(["(%s, %s, %s, %s)"] * len(batch))
+        query = f"INSERT INTO {table_name} (date, category, num, href) VALUES {placeholders}" + upsert_clause
+        cursor.execute(query, [param for row in batch for param in row])
+
 def save_to_mysql(data, table_name):
     """
     Save data to MySQL database.
@@ -89,44 +306,18 @@ def save_to_mysql(data, table_name):
     # Standardize date format
     df['date'] = pd.to_datetime(df['date']).dt.strftime("%Y-%m-%d")
     
-    # Connect to MySQL
-    conn = get_mysql_connection()
-    
-    try:
+    # Borrow a pooled MySQL connection
+    with pooled_connection() as conn:
         # Ensure tables exist
         ensure_tables_exist(conn)
         
-        # Insert data in batches
+        # Insert all rows, classify unseen categories and commit once
         cursor = conn.cursor()
-        batch_size = 1000
-        total_records = len(df)
-        records_added = 0
-        
-        for i in range(0, total_records, batch_size):
-            batch = df.iloc[i:i+batch_size]
-            
-            # Prepare the values for insertion
-            values = []
-            for _, row in batch.iterrows():
-                values.append((
-                    row['date'], 
-                    row['category'], 
-                    int(row['num']) if isinstance(row['num'], str) and row['num'].isdigit() else row['num'],
-                    row.get('href', '')
-                ))
-            
-            # Insert with ON DUPLICATE KEY UPDATE
-            query = f"""
-            INSERT INTO {table_name} (date, category, num, href)
-            VALUES (%s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-            num = VALUES(num),
-            href = VALUES(href)
-            """
-            
-            cursor.executemany(query, values)
-            conn.commit()
-            records_added += len(batch)
+        values = prepare_values(df)
+        upsert_values(cursor, table_name, values)
+        sync_category_groups(conn, df['category'].unique())
+        conn.commit()
+        records_added = len(values)
             
         # Count records for today
         today_str = df['date'].iloc[0]
@@ -134,6 +325,124 @@ def save_to_mysql(data, table_name):
         count = cursor.fetchone()[0]
         
         print(f"Added/updated {records_added} records in {table_name}. Total records for today: {count}")
+
+def _escape_infile_text(series):
+    """Escape a text column for LOAD DATA's default tab-separated format (NULL as \\N)."""
+    text = series.astype(object).where(series.notna(), None)
+    escaped = (text.astype(str)
+               .str.replace('\\', '\\\\', regex=False)
+               .str.replace('\t', '\\t', regex=False)
+               .str.replace('\n', '\\n', regex=False)
+               .str.replace('\r', '\\r', regex=False))
+    return escaped.where(text.notna(), '\\N')
+
+def _write_infile_chunk(df, handle):
+    """
+    Normalize a chunk of rows and append it to the tab-separated staging file.
+    
+    Raises:
+        ValueError: if a date is missing or cannot be parsed; nothing of the chunk is written
+    """
+    dates = pd.to_datetime(df['date'], errors='coerce')
+    if dates.isna().any():
+        bad = df.loc[dates.isna(), 'date']
+        examples = ', '.join(f"row {i}: {value!r}" for i, value in bad.head(5).items())
+        raise ValueError(f"{len(bad)} rows without a valid date ({examples})")
+    num = _num_column(df)
+    chunk = pd.DataFrame({
+        'date': dates.dt.strftime("%Y-%m-%d"),
+        'category': _escape_infile_text(df['category']),
+        'num': num.astype(str).where(num.notna(), '\\N'),
+        'href': _escape_infile_text(_href_column(df)),
+    })
+    handle.write(''.join((chunk['date'] + '\t' + chunk['category'] + '\t' +
+                          chunk['num'] + '\t' + chunk['href'] + '\n').tolist()))
+    return len(chunk)
+
+def bulk_load_mysql(data, table_name, chunksize=100000):
+    """
+    Bulk-load historical rows through a staging table.
+    
+    The rows are streamed into a temporary staging table with LOAD DATA LOCAL
+    INFILE and merged into `table_name` with a single INSERT ... SELECT ...
+    ON DUPLICATE KEY UPDATE. The (date, category) primary key stays the dedup
+    rule: when a key appears several times, the last row wins, just like
+    repeated save_to_mysql calls.
+    
+    The server must allow local loads (SET GLOBAL local_infile = 1).
+    
+    Args:
+        data: DataFrame or path to a CSV file with date, category, num and optional href columns
+        table_name: Name of the table to load into ('projects' or 'freelances')
+        chunksize: Rows read from a CSV file at a time
+    
+    Returns:
+        Number of rows loaded
+    """
+    if isinstance(data, pd.DataFrame):
+        chunks = (data.iloc[i:i+chunksize] for i in range(0, len(data), chunksize))
+    else:
+        chunks = pd.read_csv(data, chunksize=chunksize, dtype={'category': str, 'href': str})
+    
+    staging_table = f"{table_name}_staging"
+    started = time.perf_counter()
+    # Dedicated connection: local_infile is not enabled on pooled connections
+    conn = get_mysql_connection(local_infile=True)
+    
+    try:
+        ensure_tables_exist(conn)
+        cursor = conn.cursor()
+        
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.tsv') as infile:
+            total_rows = sum(_write_infile_chunk(chunk, infile) for chunk in chunks)
+            infile.flush()
+            
+            cursor.execute(f"""
+            CREATE TEMPORARY TABLE {staging_table} (
+                seq BIGINT AUTO_INCREMENT PRIMARY KEY,
+                date DATE,
+                category VARCHAR(255),
+                num INTEGER,
+                href TEXT
+            )
+            """)
+            cursor.execute(f"""
+            LOAD DATA LOCAL INFILE %s
+            INTO TABLE {staging_table}
+            CHARACTER SET utf8mb4
+            (date, category, num, href)
+            """, (infile.name,))
+        loaded = time.perf_counter()
+        
+        # Merge in file order so the last row per (date, category) wins
+        cursor.execute(f"""
+        INSERT INTO {table_name} (date, category, num, href)
+        SELECT date, category, num, href FROM {staging_table} ORDER BY seq
+        ON DUPLICATE KEY UPDATE
+        num = VALUES(num),
+        href = VALUES(href)
+        """)
+        cursor.execute(f"SELECT DISTINCT category FROM {staging_table}")
+        sync_category_groups(conn, [row[0] for row in cursor.fetchall()])
+        conn.commit()
+        cursor.execute(f"DROP TEMPORARY TABLE {staging_table}")
+        finished = time.perf_counter()
         
+        elapsed = finished - started
+        print(f"Bulk-loaded {total_rows} rows into {table_name} in {elapsed:.1f}s "
+              f"({total_rows / elapsed if elapsed else 0:,.0f} rows/s; "
+              f"staging {loaded - started:.1f}s, merge {finished - loaded:.1f}s)")
+        return total_rows
+    
     finally:
         conn.close()
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Bulk-load historical CSV data into MySQL")
+    parser.add_argument('table', choices=['projects', 'freelances'])
+    parser.add_argument('csv_path')
+    args = parser.parse_args()
+    
+    bulk_load_mysql(args.csv_path, args.table)
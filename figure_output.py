@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Named output profiles for the report figures.
+
+    web     small raster images for the browser (WebP, PNG if Pillow lacks WebP)
+    print   300 dpi PNG, the historical default
+    vector  SVG
+
+The profile is chosen with --profile on the report scripts or the
+REPORT_FIGURE_PROFILE environment variable. Figures are written through
+save_figure, which picks the file extension and resolution from the active
+profile and returns the render time and bytes written; callers add the
+result to FIGURE_STATS (also for figures saved in worker processes) and
+print its summary at the end.
+"""
+
+import os
+import time
+import matplotlib.pyplot as plt
+
+PROFILES = {
+    'web': {'format': 'webp', 'dpi': 100},
+    'print': {'format': 'png', 'dpi': 300},
+    'vector': {'format': 'svg', 'dpi': 100},
+}
+
+
+def _default_profile():
+    """Profile named by REPORT_FIGURE_PROFILE; an unknown name falls back to 'print' with a warning."""
+    name = os.getenv('REPORT_FIGURE_PROFILE', 'print')
+    if name not in PROFILES:
+        print(f"Unknown figure profile '{name}' in REPORT_FIGURE_PROFILE, using 'print' "
+              f"(choose from {', '.join(PROFILES)})")
+        return 'print'
+    return name
+
+
+DEFAULT_PROFILE = _default_profile()
+
+_FORMATS = {settings['format'] for settings in PROFILES.values()} | {'png'}
+
+
+def _webp_supported():
+    try:
+        from PIL import features
+        return bool(features.check('webp'))
+    except ImportError:
+        return False
+
+
+def _resolve(name):
+    if name not in PROFILES:
+        raise ValueError(f"Unknown figure profile '{name}', choose from {', '.join(PROFILES)}")
+    settings = dict(PROFILES[name], name=name)
+    if settings['format'] == 'webp' and not _webp_supported():
+        settings['format'] = 'png'
+    return settings
+
+
+_active = _resolve(DEFAULT_PROFILE)
+
+
+def set_profile(name):
+    """Activate a profile for this process and for worker processes started later."""
+    global _active
+    _active = _resolve(name)
+    os.environ['REPORT_FIGURE_PROFILE'] = name
+
+
+def active_profile():
+    """Settings of the active profile: name, format and dpi."""
+    return dict(_active)
+
+
+def figure_file(stem):
+    """File name of figure `stem` under the active profile, e.g. 'category_groups.svg'."""
+    return f"{stem}.{_active['format']}"
+
+
+class FigureStats:
+    """Number, render time and size of the figures written by a script."""
+
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def add(self, result):
+        """Record the (file name, bytes, seconds) tuple returned by save_figure."""
+        _, size, seconds = result
+        self.count += 1
+        self.bytes += size
+        self.seconds += seconds
+
+    def print_summary(self):
+        print(f"Figure profile '{_active['name']}' ({_active['format']}, {_active['dpi']} dpi): "
+              f"{self.count} figures, {self.bytes / 1024 ** 2:.1f} MB written, "
+              f"{self.seconds:.1f}s saving")
+
+
+FIGURE_STATS = FigureStats()
+
+
+def save_figure(directory, stem):
+    """
+    Save and close the current figure as `directory`/`stem` under the active profile.
+
+    Copies of the figure in the other profiles' formats are removed so the
+    reports only link files that are current.
+
+    Returns:
+        (file name, bytes written, seconds spent saving)
+    """
+    path = directory / figure_file(stem)
+    started = time.perf_counter()
+    plt.savefig(path, dpi=_active['dpi'], format=_active['format'])
+    seconds = time.perf_counter() - started
+    plt.close()
+
+    for extension in _FORMATS - {_active['format']}:
+        stale = directory / f"{stem}.{extension}"
+        if stale.exists():
+            stale.unlink()
+
+    return path.name, path.stat().st_size, seconds
@@ -8,18 +8,32 @@ This script creates various reports including:
 """
 
 import os
+import argparse
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
 import numpy as np
-from db_utils import get_mysql_connection
+from report_data import (load_history, load_latest, load_group_breakdown, load_stats_store,
+                         load_trending_rows, trending_rows_from_frame)
+from category_groups import CategoryClassifier, REPORT_CATEGORY_GROUPS as CATEGORY_GROUPS
+from build_cache import BuildCache
+from figure_output import (PROFILES, DEFAULT_PROFILE, FIGURE_STATS, active_profile, figure_file,
+                           save_figure, set_profile)
+from html_render import (RowTemplate, escape, format_number, format_percent, sign_class,
+                         write_table, write_grouped_tables)
 import re
 from pathlib import Path
 
 # Set style for plots
-plt.style.use('fivethirtyeight')
-sns.set_palette("Set2")
+PLOT_STYLE = 'fivethirtyeight'
+PLOT_PALETTE = 'Set2'
+plt.style.use(PLOT_STYLE)
+sns.set_palette(PLOT_PALETTE)
+
+# Rendering settings that are not part of the report code, for the build cache
+PLOT_PARAMS = {'style': PLOT_STYLE, 'palette': PLOT_PALETTE, 'matplotlib': matplotlib.__version__}
 
 # Create reports directory if it doesn't exist
 REPORTS_DIR = Path(__file__).parent / 'reports'
@@ -27,97 +41,53 @@ FIGURES_DIR = REPORTS_DIR / 'figures'
 os.makedirs(REPORTS_DIR, exist_ok=True)
 os.makedirs(FIGURES_DIR, exist_ok=True)
 
-# Category groupings for analysis
-CATEGORY_GROUPS = {
-    'Development': [
-        'Java', 'Python', 'C#', 'C++', '.NET', 'PHP', 'JavaScript', 'TypeScript',
-        'React', 'Angular', 'Vue', 'Node.js', 'Full-Stack', 'Frontend', 'Backend',
-        'Mobile', 'iOS', 'Android', 'Swift', 'Kotlin', 'Flutter', 'React Native',
-        'DevOps', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Cloud',
-        'Entwickler', 'Entwicklung', 'Software', 'Web', 'App', 'Mobile', 'Programmierung'
-    ],
-    'Data': [
-        'Data', 'Analytics', 'Business Intelligence', 'BI', 'Tableau', 'Power BI',
-        'SQL', 'Database', 'Datenbank', 'ETL', 'Data Warehouse', 'Data Lake',
-        'Big Data', 'Hadoop', 'Spark', 'Data Science', 'Machine Learning', 'ML',
-        'AI', 'Artificial Intelligence', 'Deep Learning', 'NLP', 'Natural Language',
-        'Data Engineer', 'Data Analyst', 'Data Scientist', 'Statistik', 'Daten'
-    ],
-    'Management': [
-        'Project', 'Projekt', 'Management', 'Manager', 'PMO', 'Scrum', 'Agile',
-        'Product Owner', 'PO', 'Scrum Master', 'Kanban', 'Lean', 'Projektleiter',
-        'Projektmanager', 'Projektleitung', 'Führung', 'Lead', 'Leitung'
-    ],
-    'Design': [
-        'Design', 'UX', 'UI', 'User Experience', 'User Interface', 'Graphic',
-        'Grafik', 'Visual', 'Creative', 'Kreativ', 'Illustration', 'Animation',
-        'Video', 'Media', 'Medien', '3D', 'CAD'
-    ],
-    'Infrastructure': [
-        'System', 'Network', 'Netzwerk', 'Security', 'Sicherheit', 'Admin',
-        'Administrator', 'IT-Administration', 'Support', 'Helpdesk', 'Service Desk',
-        'Infrastructure', 'Infrastruktur', 'Server', 'Hardware', 'Virtualization',
-        'VMware', 'Hyper-V', 'Windows', 'Linux', 'Unix'
-    ],
-    'SAP': [
-        'SAP', 'ABAP', 'S/4HANA', 'ERP', 'FI', 'CO', 'MM', 'SD', 'PP', 'HCM',
-        'CRM', 'BW', 'BI', 'Fiori', 'HANA'
-    ],
-    'Testing': [
-        'Test', 'QA', 'Quality Assurance', 'Qualitätssicherung', 'Testing',
-        'Tester', 'Selenium', 'Cypress', 'Automation', 'Automatisierung'
-    ],
-    'Consulting': [
-        'Consulting', 'Beratung', 'Berater', 'Consultant', 'Strategy', 'Strategie',
-        'Business', 'Geschäft', 'Process', 'Prozess', 'Optimization', 'Optimierung'
-    ],
-    'Marketing': [
-        'Marketing', 'SEO', 'SEA', 'SEM', 'Social Media', 'Content', 'Online Marketing',
-        'Digital Marketing', 'E-Commerce', 'Ecommerce', 'CRM', 'Customer', 'Kunde'
-    ]
-}
 
-def fetch_data():
-    """Fetch data from MySQL database."""
-    conn = get_mysql_connection()
-    try:
-        # Fetch projects data
-        projects_df = pd.read_sql("""
-            SELECT date, category, num, href 
-            FROM projects 
-            ORDER BY date DESC
-        """, conn)
-        
-        # Fetch freelances data
-        freelances_df = pd.read_sql("""
-            SELECT date, category, num, href 
-            FROM freelances 
-            ORDER BY date DESC
-        """, conn)
-        
-        # Convert date strings to datetime objects
-        projects_df['date'] = pd.to_datetime(projects_df['date'])
-        freelances_df['date'] = pd.to_datetime(freelances_df['date'])
-        
-        # Convert num to integer
-        projects_df['num'] = pd.to_numeric(projects_df['num'], errors='coerce').fillna(0).astype(int)
-        freelances_df['num'] = pd.to_numeric(freelances_df['num'], errors='coerce').fillna(0).astype(int)
-        
-        return projects_df, freelances_df
-    
-    finally:
-        conn.close()
+# Compiled once; classifies each distinct category a single time
+CLASSIFIER = CategoryClassifier(CATEGORY_GROUPS)
+
+# Table rows of the HTML reports, parsed once
+TOP_CATEGORY_ROW = RowTemplate("""
+                <tr>
+                    <td>$category</td>
+                    <td>$num</td>
+                    <td>$date</td>
+                </tr>
+            """)
+GROWTH_RATE_ROW = RowTemplate("""
+                <tr>
+                    <td>$category</td>
+                    <td>$first_value</td>
+                    <td>$last_value</td>
+                    <td class="$growth_class">$growth_rate</td>
+                </tr>
+            """)
+GROUP_SHARE_ROW = RowTemplate("""
+                <tr>
+                    <td>$name</td>
+                    <td>$num</td>
+                    <td>$percentage</td>
+                </tr>
+            """)
+GROUP_TABLE_HEADER = RowTemplate("""
+                    <h3>$group ($group_total projects)</h3>
+                    <table>
+                        <tr>
+                            <th>Category</th>
+                            <th>Number of Projects</th>
+                            <th>Percentage of Group</th>
+                        </tr>
+                """)
+
+def _write_top_categories(f, top_df):
+    """Rows of a top categories table."""
+    write_table(f, TOP_CATEGORY_ROW,
+                category=escape(top_df['category']),
+                num=top_df['num'].astype(str),
+                date=top_df['date'].dt.strftime("%Y-%m-%d"))
 
 def assign_category_group(category):
     """Assign a category to a group based on keywords."""
-    category_lower = category.lower()
-    
-    for group, keywords in CATEGORY_GROUPS.items():
-        for keyword in keywords:
-            if keyword.lower() in category_lower:
-                return group
-    
-    return 'Other'
+    return CLASSIFIER.classify(category)
 
 def generate_top_categories_report(projects_df, freelances_df):
     """Generate report on top categories for projects and freelancers."""
@@ -139,8 +109,7 @@ def generate_top_categories_report(projects_df, freelances_df):
     plt.ylabel('Category')
     plt.title(f'Top 20 Project Categories (as of {latest_date.strftime("%Y-%m-%d")})')
     plt.tight_layout()
-    plt.savefig(FIGURES_DIR / 'top_project_categories.png', dpi=300)
-    plt.close()
+    FIGURE_STATS.add(save_figure(FIGURES_DIR, 'top_project_categories'))
     
     # Write to CSV
     top_projects.to_csv(REPORTS_DIR / 'top_project_categories.csv', index=False)
@@ -157,8 +126,7 @@ def generate_top_categories_report(projects_df, freelances_df):
         plt.ylabel('Category')
         plt.title(f'Top 20 Freelancer Categories (as of {latest_date_freelancers.strftime("%Y-%m-%d")})')
         plt.tight_layout()
-        plt.savefig(FIGURES_DIR / 'top_freelancer_categories.png', dpi=300)
-        plt.close()
+        FIGURE_STATS.add(save_figure(FIGURES_DIR, 'top_freelancer_categories'))
         
         top_freelancers.to_csv(REPORTS_DIR / 'top_freelancer_categories.csv', index=False)
     
@@ -183,7 +151,7 @@ def generate_top_categories_report(projects_df, freelances_df):
             <p>Report generated on {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
             
             <h2>Top 20 Project Categories (as of {latest_date.strftime("%Y-%m-%d")})</h2>
-            <img src="figures/top_project_categories.png" alt="Top Project Categories">
+            <img src="figures/{figure_file("top_project_categories")}" alt="Top Project Categories">
             
             <table>
                 <tr>
@@ -193,21 +161,14 @@ def generate_top_categories_report(projects_df, freelances_df):
                 </tr>
         """)
         
-        for _, row in top_projects.iterrows():
-            f.write(f"""
-                <tr>
-                    <td>{row['category']}</td>
-                    <td>{row['num']}</td>
-                    <td>{row['date'].strftime("%Y-%m-%d")}</td>
-                </tr>
-            """)
+        _write_top_categories(f, top_projects)
         
         f.write("</table>")
         
         if not freelances_df.empty:
             f.write(f"""
                 <h2>Top 20 Freelancer Categories (as of {latest_date_freelancers.strftime("%Y-%m-%d")})</h2>
-                <img src="figures/top_freelancer_categories.png" alt="Top Freelancer Categories">
+                <img src="figures/{figure_file("top_freelancer_categories")}" alt="Top Freelancer Categories">
                 
                 <table>
                     <tr>
@@ -217,14 +178,7 @@ def generate_top_categories_report(projects_df, freelances_df):
                     </tr>
             """)
             
-            for _, row in top_freelancers.iterrows():
-                f.write(f"""
-                    <tr>
-                        <td>{row['category']}</td>
-                        <td>{row['num']}</td>
-                        <td>{row['date'].strftime("%Y-%m-%d")}</td>
-                    </tr>
-                """)
+            _write_top_categories(f, top_freelancers)
             
             f.write("</table>")
         
@@ -235,29 +189,22 @@ def generate_top_categories_report(projects_df, freelances_df):
     
     print("Top categories report generated.")
 
-def generate_trending_report(projects_df):
-    """Generate report on trending categories over time."""
+def generate_trending_report(trend_data, top_categories, stats):
+    """
+    Generate report on trending categories over time.
+    
+    Args:
+        trend_data: Daily totals of the top categories over the last 3 months
+            (see report_data.load_trending_rows)
+        top_categories: The top categories of the latest date, largest first
+        stats: Statistics store holding the first and last value of every
+            category in the trend window (see report_data.load_stats_store)
+    """
     print("Generating trending categories report...")
     
-    # Get dates for the last 3 months
-    latest_date = projects_df['date'].max()
-    three_months_ago = latest_date - pd.DateOffset(months=3)
-    
-    # Filter data for the last 3 months
-    recent_data = projects_df[projects_df['date'] >= three_months_ago]
-    
-    # Group by date and category, and sum the numbers
-    grouped = recent_data.groupby(['date', 'category'])['num'].sum().reset_index()
-    
-    # Get the top 10 categories based on the most recent date
-    latest_data = grouped[grouped['date'] == latest_date]
-    top_categories = latest_data.sort_values('num', ascending=False).head(10)['category'].unique()
-    
-    # Filter the grouped data to include only these top categories
-    trend_data = grouped[grouped['category'].isin(top_categories)]
-    
     # Pivot the data for plotting
-    pivot_data = trend_data.pivot(index='date', columns='category', values='num')
+    # Categorical keys pivot in order of appearance, so sort the columns by name
+    pivot_data = trend_data.pivot(index='date', columns='category', values='num').sort_index(axis=1)
     
     # Plot the trends
     plt.figure(figsize=(14, 8))
@@ -271,16 +218,16 @@ def generate_trending_report(projects_df):
     plt.legend(loc='upper left', bbox_to_anchor=(1, 1))
     plt.grid(True, linestyle='--', alpha=0.7)
     plt.tight_layout()
-    plt.savefig(FIGURES_DIR / 'trending_categories.png', dpi=300)
-    plt.close()
+    FIGURE_STATS.add(save_figure(FIGURES_DIR, 'trending_categories'))
     
-    # Calculate growth rates
+    # Calculate growth rates from the first and last value in the window
+    first_date, last_date, window = stats.window_first_last(top_categories)
     growth_data = []
     
     for category in top_categories:
         if category in pivot_data.columns:
-            first_value = pivot_data[category].iloc[0]
-            last_value = pivot_data[category].iloc[-1]
+            first_value = window.at[category, 'first_value']
+            last_value = window.at[category, 'last_value']
             
             if first_value > 0:  # Avoid division by zero
                 growth_rate = ((last_value - first_value) / first_value) * 100
@@ -289,14 +236,16 @@ def generate_trending_report(projects_df):
                 
             growth_data.append({
                 'category': category,
-                'first_date': pivot_data.index[0],
+                'first_date': first_date,
                 'first_value': first_value,
-                'last_date': pivot_data.index[-1],
+                'last_date': last_date,
                 'last_value': last_value,
                 'growth_rate': growth_rate
             })
     
-    growth_df = pd.DataFrame(growth_data)
+    # Keep the values in the dtype of the plotted series
+    growth_df = pd.DataFrame(growth_data).astype({'first_value': pivot_data.dtypes.iloc[0],
+                                                  'last_value': pivot_data.dtypes.iloc[0]})
     growth_df = growth_df.sort_values('growth_rate', ascending=False)
     
     # Plot growth rates
@@ -315,8 +264,7 @@ def generate_trending_report(projects_df):
                  f'{height:.1f}%', ha='center', va='bottom', rotation=0)
     
     plt.tight_layout()
-    plt.savefig(FIGURES_DIR / 'category_growth_rates.png', dpi=300)
-    plt.close()
+    FIGURE_STATS.add(save_figure(FIGURES_DIR, 'category_growth_rates'))
     
     # Save to CSV
     growth_df.to_csv(REPORTS_DIR / 'category_growth_rates.csv', index=False)
@@ -345,10 +293,10 @@ def generate_trending_report(projects_df):
             <p>Report generated on {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
             
             <h2>Trending Project Categories (Last 3 Months)</h2>
-            <img src="figures/trending_categories.png" alt="Trending Categories">
+            <img src="figures/{figure_file("trending_categories")}" alt="Trending Categories">
             
             <h2>Category Growth Rates</h2>
-            <img src="figures/category_growth_rates.png" alt="Category Growth Rates">
+            <img src="figures/{figure_file("category_growth_rates")}" alt="Category Growth Rates">
             
             <table>
                 <tr>
@@ -359,16 +307,12 @@ def generate_trending_report(projects_df):
                 </tr>
         """)
         
-        for _, row in growth_df.iterrows():
-            growth_class = "positive" if row['growth_rate'] >= 0 else "negative"
-            f.write(f"""
-                <tr>
-                    <td>{row['category']}</td>
-                    <td>{int(row['first_value'])}</td>
-                    <td>{int(row['last_value'])}</td>
-                    <td class="{growth_class}">{row['growth_rate']:.1f}%</td>
-                </tr>
-            """)
+        write_table(f, GROWTH_RATE_ROW,
+                    category=escape(growth_df['category']),
+                    first_value=format_number(np.trunc(growth_df['first_value']), '.0f'),
+                    last_value=format_number(np.trunc(growth_df['last_value']), '.0f'),
+                    growth_class=sign_class(growth_df['growth_rate']),
+                    growth_rate=format_percent(growth_df['growth_rate']))
         
         f.write("""
             </table>
@@ -378,21 +322,17 @@ def generate_trending_report(projects_df):
     
     print("Trending categories report generated.")
 
-def generate_category_groups_report(projects_df):
-    """Generate report on category groupings."""
+def generate_category_groups_report(latest_date, grouped, detailed):
+    """
+    Generate report on category groupings.
+    
+    Args:
+        latest_date: Date the totals refer to
+        grouped: Project totals per group (see report_data.load_group_breakdown)
+        detailed: Project totals per group and category
+    """
     print("Generating category groups report...")
     
-    # Get the most recent date
-    latest_date = projects_df['date'].max()
-    
-    # Filter for the most recent date
-    latest_projects = projects_df[projects_df['date'] == latest_date]
-    
-    # Assign each category to a group
-    latest_projects['group'] = latest_projects['category'].apply(assign_category_group)
-    
-    # Group by the assigned group and sum the numbers
-    grouped = latest_projects.groupby('group')['num'].sum().reset_index()
     grouped = grouped.sort_values('num', ascending=False)
     
     # Plot the results
@@ -410,8 +350,7 @@ def generate_category_groups_report(projects_df):
                  f'{height:,}', ha='center', va='bottom', rotation=0)
     
     plt.tight_layout()
-    plt.savefig(FIGURES_DIR / 'category_groups.png', dpi=300)
-    plt.close()
+    FIGURE_STATS.add(save_figure(FIGURES_DIR, 'category_groups'))
     
     # Create a pie chart for the distribution
     plt.figure(figsize=(10, 10))
@@ -420,14 +359,12 @@ def generate_category_groups_report(projects_df):
     plt.axis('equal')
     plt.title(f'Distribution of Projects by Category Group (as of {latest_date.strftime("%Y-%m-%d")})')
     plt.tight_layout()
-    plt.savefig(FIGURES_DIR / 'category_groups_pie.png', dpi=300)
-    plt.close()
+    FIGURE_STATS.add(save_figure(FIGURES_DIR, 'category_groups_pie'))
     
     # Save to CSV
     grouped.to_csv(REPORTS_DIR / 'category_groups.csv', index=False)
     
     # Also save the detailed breakdown
-    detailed = latest_projects.groupby(['group', 'category'])['num'].sum().reset_index()
     detailed = detailed.sort_values(['group', 'num'], ascending=[True, False])
     detailed.to_csv(REPORTS_DIR / 'category_groups_detailed.csv', index=False)
     
@@ -455,10 +392,10 @@ def generate_category_groups_report(projects_df):
             <h2>Projects by Category Group (as of {latest_date.strftime("%Y-%m-%d")})</h2>
             <div style="display: flex; flex-wrap: wrap; justify-content: space-between;">
                 <div style="flex: 1; min-width: 45%;">
-                    <img src="figures/category_groups.png" alt="Category Groups">
+                    <img src="figures/{figure_file("category_groups")}" alt="Category Groups">
                 </div>
                 <div style="flex: 1; min-width: 45%;">
-                    <img src="figures/category_groups_pie.png" alt="Category Groups Pie Chart">
+                    <img src="figures/{figure_file("category_groups_pie")}" alt="Category Groups Pie Chart">
                 </div>
             </div>
             
@@ -472,15 +409,10 @@ def generate_category_groups_report(projects_df):
         """)
         
         total = grouped['num'].sum()
-        for _, row in grouped.iterrows():
-            percentage = (row['num'] / total) * 100
-            f.write(f"""
-                <tr>
-                    <td>{row['group']}</td>
-                    <td>{row['num']:,}</td>
-                    <td>{percentage:.1f}%</td>
-                </tr>
-            """)
+        write_table(f, GROUP_SHARE_ROW,
+                    name=escape(grouped['group']),
+                    num=format_number(grouped['num'], ','),
+                    percentage=format_percent(grouped['num'] / total * 100))
         
         f.write(f"""
             </table>
@@ -488,36 +420,16 @@ def generate_category_groups_report(projects_df):
             <h2>Detailed Breakdown by Group</h2>
         """)
         
-        current_group = None
-        for _, row in detailed.iterrows():
-            if current_group != row['group']:
-                if current_group is not None:
-                    f.write("</table>")
-                
-                current_group = row['group']
-                group_total = detailed[detailed['group'] == current_group]['num'].sum()
-                
-                f.write(f"""
-                    <h3>{current_group} ({group_total:,} projects)</h3>
-                    <table>
-                        <tr>
-                            <th>Category</th>
-                            <th>Number of Projects</th>
-                            <th>Percentage of Group</th>
-                        </tr>
-                """)
-            
-            percentage = (row['num'] / group_total) * 100
-            f.write(f"""
-                <tr>
-                    <td>{row['category']}</td>
-                    <td>{row['num']:,}</td>
-                    <td>{percentage:.1f}%</td>
-                </tr>
-            """)
-        
-        if current_group is not None:
-            f.write("</table>")
+        # Group totals from a single groupby, in the order the groups appear
+        group_totals = detailed.groupby('group', sort=False)['num'].sum()
+        write_grouped_tables(
+            f, GROUP_TABLE_HEADER, GROUP_SHARE_ROW, detailed['group'],
+            header_columns={'group': escape(group_totals.index),
+                            'group_total': format_number(group_totals.to_numpy(), ',')},
+            row_columns={'name': escape(detailed['category']),
+                         'num': format_number(detailed['num'], ','),
+                         'percentage': format_percent(
+                             detailed['num'] / detailed['group'].map(group_totals) * 100)})
         
         f.write("""
             </body>
@@ -591,18 +503,56 @@ def generate_index_page():
     
     print("Index page generated.")
 
-def main():
-    """Main function to generate all reports."""
-    print("Starting report generation...")
+def main(argv=None):
+    """Main function to generate all reports; `argv` defaults to the command line."""
+    parser = argparse.ArgumentParser(description="Generate freelance market reports")
+    parser.add_argument('--trend-source', choices=['mysql', 'cache'], default='mysql',
+                        help="Aggregate the trending report in MySQL (default) or from the local history cache")
+    parser.add_argument('--full-refresh', action='store_true',
+                        help="Rebuild the local data cache and the statistics store from the full MySQL tables")
+    parser.add_argument('--force', action='store_true',
+                        help="Rebuild all reports even if their inputs did not change")
+    parser.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help="Figure output profile: web (small WebP), print (300 dpi PNG) or vector (SVG)")
+    args = parser.parse_args(argv)
+    set_profile(args.profile)
     
-    # Fetch data from MySQL
-    projects_df, freelances_df = fetch_data()
+    print("Starting report generation...")
     
-    # Generate reports
-    generate_top_categories_report(projects_df, freelances_df)
-    generate_trending_report(projects_df)
-    generate_category_groups_report(projects_df)
-    generate_index_page()
+    # Only the pivot-ready trending rows are transferred, unless the cache is asked for
+    if args.trend_source == 'cache':
+        trends = trending_rows_from_frame(load_history('projects', full_refresh=args.full_refresh))
+    else:
+        trends = load_trending_rows('projects')
+    
+    # The top categories report only needs the latest day, but with href
+    latest_projects = load_latest('projects')
+    latest_freelances = load_latest('freelances')
+    
+    # Generate reports, skipping those whose inputs are unchanged since the last run
+    cache = BuildCache(REPORTS_DIR, force=args.force)
+    plot_params = {**PLOT_PARAMS, 'figures': active_profile()}
+    top_outputs = [f'figures/{figure_file("top_project_categories")}',
+                   'top_project_categories.csv', 'top_categories_report.html']
+    if not latest_freelances.empty:
+        top_outputs += [f'figures/{figure_file("top_freelancer_categories")}', 'top_freelancer_categories.csv']
+    cache.build('top_categories', top_outputs, generate_top_categories_report, latest_projects, latest_freelances,
+                params=plot_params)
+    stats = load_stats_store('projects', full_refresh=args.full_refresh)
+    cache.build('trending', [f'figures/{figure_file("trending_categories")}',
+                             f'figures/{figure_file("category_growth_rates")}',
+                             'category_growth_rates.csv', 'trending_categories_data.csv',
+                             'trending_categories_report.html'],
+                generate_trending_report, *trends, stats,
+                inputs=list(trends), params=plot_params)
+    cache.build('category_groups', [f'figures/{figure_file("category_groups")}',
+                                    f'figures/{figure_file("category_groups_pie")}',
+                                    'category_groups.csv', 'category_groups_detailed.csv',
+                                    'category_groups_report.html'],
+                generate_category_groups_report, *load_group_breakdown('projects'), params=plot_params)
+    cache.build('index', ['index.html'], generate_index_page)
+    cache.save()
+    FIGURE_STATS.print_summary()
     
     print(f"All reports generated successfully. View them in the '{REPORTS_DIR}' directory.")
     print(f"Open '{REPORTS_DIR}/index.html' to access all reports.")
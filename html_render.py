@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Small rendering layer for the HTML reports.
+
+A RowTemplate is parsed once into its literal pieces and field names.
+Rendering a table formats every column in one vectorized pass and joins the
+pieces column-wise, so there is no per-row Python formatting. The rows are
+then streamed to the open file with writelines.
+"""
+
+import string
+import numpy as np
+import pandas as pd
+
+
+class RowTemplate:
+    """
+    Table row markup with $name placeholders, e.g.
+    RowTemplate('<tr><td>$category</td><td>$num</td></tr>').
+    """
+
+    def __init__(self, template):
+        self.template = template
+        self.literals = []
+        self.fields = []
+
+        literal_start = 0
+        for match in string.Template.pattern.finditer(template):
+            if match.group('escaped') is not None:
+                continue
+            name = match.group('named') or match.group('braced')
+            if name is None:
+                raise ValueError(f"Invalid placeholder in row template: {match.group()!r}")
+            self.literals.append(template[literal_start:match.start()].replace('$$', '$'))
+            self.fields.append(name)
+            literal_start = match.end()
+        self.trailer = template[literal_start:].replace('$$', '$')
+
+    def render(self, **columns):
+        """
+        Return the rendered rows as a list of strings.
+
+        Each keyword is a field of the template holding already formatted
+        strings (a Series, array or list), all of the same length.
+        """
+        missing = set(self.fields) - columns.keys()
+        if missing:
+            raise KeyError(f"Missing row template fields: {', '.join(sorted(missing))}")
+
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Row template columns differ in length")
+        n_rows = lengths.pop() if lengths else 0
+
+        rows = np.full(n_rows, '', dtype=object)
+        for literal, field in zip(self.literals, self.fields):
+            rows = rows + literal + np.asarray(columns[field], dtype=object)
+        return (rows + self.trailer).tolist()
+
+
+def escape(values):
+    """HTML-escape text values column-wise."""
+    return (pd.Series(values, dtype=object).astype(str)
+            .str.replace('&', '&amp;', regex=False)
+            .str.replace('<', '&lt;', regex=False)
+            .str.replace('>', '&gt;', regex=False)
+            .str.replace('"', '&quot;', regex=False))
+
+
+def format_number(values, spec=''):
+    """Format numbers with a format spec, e.g. ',' or '.1f'."""
+    return pd.Series(values).map(('{:' + spec + '}').format)
+
+
+def format_percent(values, decimals=1):
+    """Format numbers as percentages like '12.3%'."""
+    return format_number(values, f'.{decimals}f') + '%'
+
+
+def sign_class(values):
+    """'positive' for values >= 0, 'negative' otherwise."""
+    return np.where(np.asarray(values, dtype=float) >= 0, 'positive', 'negative')
+
+
+def write_table(f, row_template, **columns):
+    """Stream the rows of one table to the open file `f`."""
+    f.writelines(row_template.render(**columns))
+
+
+def write_grouped_tables(f, header_template, row_template, groups, header_columns, row_columns):
+    """
+    Stream one table per group to `f`.
+
+    `groups` holds the group label of each row and must be sorted so that
+    rows of a group are contiguous. The header is rendered once per group
+    from `header_columns` (one value per group, in order of appearance);
+    the rows are rendered in a single pass over all rows and written in
+    slices, so the cost is linear in the number of rows.
+    """
+    groups = np.asarray(groups, dtype=object)
+    if len(groups) == 0:
+        return
+
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    ends = np.r_[starts[1:], len(groups)]
+    headers = header_template.render(**header_columns)
+    if len(headers) != len(starts):
+        raise ValueError("Rows of a group must be contiguous")
+
+    rows = row_template.render(**row_columns)
+    for header, start, end in zip(headers, starts, ends):
+        f.write(header)
+        f.writelines(rows[start:end])
+        f.write("</table>")
@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+"""
+In-process data collection pipeline.
+
+Runs the nightly job as a DAG of stages in one process:
+
+    scrape_freelance_de ─────> ingest_freelance_de ─────┐
+                                                        ├─> daily_series ─> reports ─> publish
+    scrape_freelancermap_de ─> ingest_freelancermap_de ─┘
+
+There is a scrape and an ingest stage for every source in sources.SOURCES.
+A stage starts as soon as the stages it depends on have succeeded, so all
+sites are scraped at the same time. The sources are crawled by
+scrape_engine.ScrapeEngine on one Chromium instance
+(browser_session.BrowserSession, each source gets its own context) and the
+database stages share the connection pool of db_utils. Every stage has a timeout and a number of retries, and its
+duration is recorded; the ntfy notification lists status and time per stage.
+A retried scrape reads the pages it already fetched from the engine's page
+cache.
+
+Blocking work (MySQL, report rendering, git) runs in worker threads. A
+timeout stops waiting for such a stage but cannot interrupt the thread
+itself, so these stages are not retried after a timeout.
+
+Usage: python pipeline.py [--no-reports] [--no-publish] [--no-notify]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import time
+from pathlib import Path
+import requests
+from browser_session import BrowserSession
+from sources import SOURCES
+
+ROOT = Path(__file__).resolve().parent
+
+NTFY_URL = os.getenv('PIPELINE_NTFY_URL', 'https://ntfy.sh/FKsIl4udhZFOd0Aq')
+
+# Per-stage limits in seconds, and attempts after the first failure
+SCRAPE_TIMEOUT = float(os.getenv('PIPELINE_SCRAPE_TIMEOUT', 1800))
+SCRAPE_RETRIES = int(os.getenv('PIPELINE_SCRAPE_RETRIES', 1))
+DB_TIMEOUT = float(os.getenv('PIPELINE_DB_TIMEOUT', 600))
+DB_RETRIES = int(os.getenv('PIPELINE_DB_RETRIES', 2))
+REPORTS_TIMEOUT = float(os.getenv('PIPELINE_REPORTS_TIMEOUT', 1800))
+PUBLISH_TIMEOUT = float(os.getenv('PIPELINE_PUBLISH_TIMEOUT', 300))
+
+# Seconds before a retry; doubled for every further attempt
+RETRY_DELAY = float(os.getenv('PIPELINE_RETRY_DELAY', 30))
+
+
+class Stage:
+    """
+    One pipeline step: an async function of the shared browser session and its dependencies' results.
+
+    A stage with threaded=True does its work in a worker thread, which a
+    timeout does not stop; it is not retried after a timeout, so two attempts
+    never run at the same time.
+    """
+
+    def __init__(self, name, func, deps=(), timeout=None, retries=0, threaded=False):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.timeout = timeout
+        self.retries = retries
+        self.threaded = threaded
+
+        self.status = 'PENDING'
+        self.seconds = 0.0
+        self.attempts = 0
+        self.error = None
+        self.result = None
+
+    def summary_line(self):
+        line = f"- {self.name}: {self.status}"
+        if self.status != 'SKIPPED':
+            line += f" in {self.seconds:.1f}s"
+        if self.attempts > 1:
+            line += f" ({self.attempts} attempts)"
+        if self.error:
+            line += f" - {self.error}"
+        return line
+
+
+class Pipeline:
+    """Runs stages in dependency order, independent stages concurrently."""
+
+    def __init__(self, stages):
+        self.stages = {}
+        for stage in stages:
+            # Dependencies must be listed first, which also rules out cycles
+            unknown = set(stage.deps) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Stage {stage.name} depends on stages not listed before it: "
+                                 f"{', '.join(sorted(unknown))}")
+            self.stages[stage.name] = stage
+        self.seconds = 0.0
+        self.browser_stats = None
+
+    async def _attempt(self, stage, session, inputs):
+        if stage.timeout:
+            return await asyncio.wait_for(stage.func(session, *inputs), stage.timeout)
+        return await stage.func(session, *inputs)
+
+    async def _run_stage(self, stage, session, tasks):
+        await asyncio.gather(*(tasks[dep] for dep in stage.deps))
+        deps = [self.stages[dep] for dep in stage.deps]
+        failed = [dep.name for dep in deps if dep.status != 'SUCCESS']
+        if failed:
+            stage.status = 'SKIPPED'
+            stage.error = f"{', '.join(failed)} did not succeed"
+            print(f"[{stage.name}] skipped: {stage.error}")
+            return
+
+        started = time.perf_counter()
+        stage.status = 'FAILED'
+        for attempt in range(stage.retries + 1):
+            stage.attempts = attempt + 1
+            try:
+                print(f"[{stage.name}] starting (attempt {stage.attempts})")
+                stage.result = await self._attempt(stage, session, [dep.result for dep in deps])
+                stage.status = 'SUCCESS'
+                stage.error = None
+                break
+            except asyncio.TimeoutError:
+                stage.error = f"timed out after {stage.timeout:g}s"
+                if stage.threaded:
+                    # The worker thread is still running; a retry would run next to it
+                    stage.error += ", not retried while its worker thread may still run"
+                    print(f"[{stage.name}] attempt {stage.attempts} failed: {stage.error}")
+                    break
+            except Exception as e:
+                stage.error = f"{type(e).__name__}: {e}"
+            print(f"[{stage.name}] attempt {stage.attempts} failed: {stage.error}")
+            if attempt < stage.retries:
+                await asyncio.sleep(RETRY_DELAY * 2 ** attempt)
+        stage.seconds = time.perf_counter() - started
+        print(f"[{stage.name}] {stage.status} in {stage.seconds:.1f}s")
+
+    async def run(self):
+        """Run all stages; returns True if every stage succeeded."""
+        session = BrowserSession()
+        started = time.perf_counter()
+        tasks = {}
+        try:
+            # Each stage task first awaits the tasks of its dependencies
+            for name, stage in self.stages.items():
+                tasks[name] = asyncio.ensure_future(self._run_stage(stage, session, tasks))
+            await asyncio.gather(*tasks.values())
+        finally:
+            await session.close()
+        self.seconds = time.perf_counter() - started
+        self.browser_stats = session.stats
+        return all(stage.status == 'SUCCESS' for stage in self.stages.values())
+
+    def summary(self):
+        stage_seconds = sum(stage.seconds for stage in self.stages.values())
+        lines = ["Job Summary:"]
+        lines += [stage.summary_line() for stage in self.stages.values()]
+        lines.append(f"Total: {self.seconds:.1f}s wall time, {stage_seconds:.1f}s summed over stages")
+        if self.browser_stats is not None and self.browser_stats.contexts:
+            lines += [f"Browser: {line}" for line in self.browser_stats.summary_lines()]
+        return "\n".join(lines)
+
+
+# Stages
+
+def _stage_key(source):
+    """'freelance.de' -> 'freelance_de', used in stage names."""
+    return source.name.replace('.', '_').replace('-', '_')
+
+
+def scrape_stage(source):
+    """Stage function crawling `source` with the scrape engine on the shared session."""
+    async def scrape(session):
+        from scrape_engine import ScrapeEngine
+        return await ScrapeEngine(session).run_source(source)
+    return scrape
+
+
+async def ingest(session, scraped):
+    from scrape_engine import save_results
+    await asyncio.to_thread(save_results, scraped)
+
+
+async def daily_series(session, *_):
+    from daily_series import TABLES, materialize_daily_series
+    from db_utils import ensure_tables_exist, pooled_connection
+
+    def materialize():
+        with pooled_connection() as conn:
+            ensure_tables_exist(conn)
+            for table_name in TABLES:
+                written = materialize_daily_series(conn, table_name)
+                print(f"Materialized {written} daily rows of {table_name}")
+
+    await asyncio.to_thread(materialize)
+
+
+async def reports(session, *_):
+    import matplotlib
+    matplotlib.use('Agg')
+    import generate_reports
+    await asyncio.to_thread(generate_reports.main, [])
+
+
+def _git(*args):
+    return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True)
+
+
+async def publish(session, *_):
+    """Commit and push changed files, like the previous shell pipeline."""
+    def commit_and_push():
+        _git('add', '.')
+        if _git('diff-index', '--quiet', 'HEAD', '--').returncode == 0:
+            return "No changes to commit"
+        commit = _git('commit', '-m', 'Updated data')
+        if commit.returncode != 0:
+            raise RuntimeError(f"git commit failed: {commit.stderr.strip()}")
+        push = _git('push', 'origin', 'main')
+        if push.returncode != 0:
+            raise RuntimeError(f"git push failed: {push.stderr.strip()}")
+        return "Changes committed and pushed"
+
+    message = await asyncio.to_thread(commit_and_push)
+    print(f"Git: {message}")
+    return message
+
+
+def build_pipeline(with_reports=True, with_publish=True):
+    stages = []
+    for source in SOURCES.values():
+        key = _stage_key(source)
+        stages.append(Stage(f'scrape_{key}', scrape_stage(source), timeout=SCRAPE_TIMEOUT, retries=SCRAPE_RETRIES))
+        stages.append(Stage(f'ingest_{key}', ingest, deps=[f'scrape_{key}'], timeout=DB_TIMEOUT,
+                            retries=DB_RETRIES, threaded=True))
+    stages.append(Stage('daily_series', daily_series, deps=[f'ingest_{_stage_key(s)}' for s in SOURCES.values()],
+                        timeout=DB_TIMEOUT, retries=DB_RETRIES, threaded=True))
+    last = 'daily_series'
+    if with_reports:
+        stages.append(Stage('reports', reports, deps=[last], timeout=REPORTS_TIMEOUT, threaded=True))
+        last = 'reports'
+    if with_publish:
+        stages.append(Stage('publish', publish, deps=[last], timeout=PUBLISH_TIMEOUT, threaded=True))
+    return Pipeline(stages)
+
+
+def notify(ok, body):
+    """Send the job summary to ntfy."""
+    if ok:
+        title, priority, tags = "✅ SUCCESS - Freelance data collection complete", "low", "success"
+    else:
+        title, priority, tags = "❌ ERROR - Freelance data collection script", "high", "error"
+    try:
+        requests.post(NTFY_URL, data=body.encode('utf-8'), timeout=30, headers={
+            'Title': title.encode('utf-8'),
+            'Priority': priority,
+            'Tags': f"{tags},pipeline,automation,job-scraper",
+        })
+    except requests.RequestException as e:
+        print(f"Could not send the ntfy notification: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the data collection pipeline")
+    parser.add_argument('--no-reports', action='store_true', help="Do not regenerate the reports")
+    parser.add_argument('--no-publish', action='store_true', help="Do not commit and push changes")
+    parser.add_argument('--no-notify', action='store_true', help="Do not send the ntfy notification")
+    args = parser.parse_args()
+
+    pipeline = build_pipeline(with_reports=not args.no_reports, with_publish=not args.no_publish)
+    try:
+        ok = asyncio.run(pipeline.run())
+        summary = pipeline.summary()
+    except Exception as e:
+        ok = False
+        summary = f"The pipeline itself failed: {type(e).__name__}: {e}"
+    print(summary)
+
+    if not args.no_notify:
+        notify(ok, summary)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Render report figures in a pool of worker processes.
+
+Saving large PNGs is CPU bound and matplotlib is not thread-safe, so figures
+are drawn in separate processes with the non-interactive Agg backend. Each
+task is a module-level function plus the plain arrays it plots; workers
+never receive whole DataFrames. With a single worker the tasks run in the
+calling process instead.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+# Number of rendering processes, defaults to the number of cores
+PLOT_WORKERS = int(os.getenv('REPORT_PLOT_WORKERS', os.cpu_count() or 1))
+
+
+def init_worker(style=None, palette=None):
+    """Switch a worker to the Agg backend and the report's plot style."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    if style:
+        plt.style.use(style)
+    if palette:
+        sns.set_palette(palette)
+
+
+class _SerialExecutor:
+    """Runs tasks immediately; mimics the part of the executor API used here."""
+
+    class _Done:
+        def __init__(self, value):
+            self._value = value
+
+        def result(self):
+            return self._value
+
+    def submit(self, fn, *args, **kwargs):
+        return self._Done(fn(*args, **kwargs))
+
+
+@contextmanager
+def figure_pool(workers=PLOT_WORKERS, style=None, palette=None):
+    """
+    Context manager yielding an executor for figure rendering tasks.
+
+    All submitted figures are written when the block exits; call result()
+    on the returned futures to surface errors earlier.
+
+    Args:
+        workers: Number of processes; 1 renders in the calling process
+        style: Matplotlib style applied in each worker
+        palette: Seaborn palette applied in each worker
+    """
+    if workers <= 1:
+        yield _SerialExecutor()
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(style, palette)) as executor:
+        futures = []
+        original_submit = executor.submit
+
+        def submit(fn, *args, **kwargs):
+            future = original_submit(fn, *args, **kwargs)
+            futures.append(future)
+            return future
+
+        executor.submit = submit
+        yield executor
+        # Re-raise the first rendering error, if any
+        for future in futures:
+            future.result()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""
+Record and replay of the pages the scrapers fetch.
+
+A crawl with ScrapeEngine(archive=PageArchive(directory)) records the
+response of every request it makes: the start pages and subcategory pages
+of freelance.de (projekte and Freelancer), the freelancermap projektboerse,
+and in the browser also the scripts and XHR responses those pages load.
+The archive is a directory with one file per response and an index.json
+mapping URLs to them.
+
+Replay(archive) starts a local HTTP stand-in for every recorded host, and
+ScrapeEngine(replay=...) fetches from these instead of the live sites:
+the engine maps each page URL to the stand-in of its host. Requests a
+browser page makes to absolute URLs (scripts, XHR) are answered from the
+archive directly, and requests that are not in it are aborted, so a
+replay never reaches the network. The stand-ins can add latency, so a
+replayed crawl can approximate a crawl of the real site.
+
+Usage:
+    python scrape_engine.py --record .cache/archive --no-save
+    python scrape_engine.py --replay .cache/archive
+    python replay.py [.cache/archive]                 # list the archive
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+ARCHIVE_DIR = Path(os.getenv('SCRAPER_ARCHIVE_DIR', Path(__file__).parent / '.cache' / 'archive'))
+
+DEFAULT_CONTENT_TYPE = 'text/html; charset=utf-8'
+
+
+def _key(url):
+    """Archive key of a URL: without fragment, with at least '/' as path."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path or '/', parts.query, ''))
+
+
+class PageArchive:
+    """Recorded responses by URL in `directory`."""
+
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        try:
+            self.index = json.loads((self.directory / 'index.json').read_text())
+        except (OSError, ValueError):
+            self.index = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def record(self, url, body, status=200, content_type=DEFAULT_CONTENT_TYPE, source=None):
+        """Store the response of `url`, replacing an earlier recording."""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        url = _key(url)
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:20]
+        with self._lock:
+            path = self.directory / 'responses' / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+            self.index[url] = {
+                'file': name,
+                'status': status,
+                'content_type': content_type,
+                'source': source,
+                'bytes': len(body),
+                'recorded_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+
+    def save(self):
+        """Write the index; call once the crawl is done."""
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.directory / 'index.json.tmp'
+            tmp_path.write_text(json.dumps(self.index, indent=1, sort_keys=True))
+            os.replace(tmp_path, self.directory / 'index.json')
+
+    def get(self, url):
+        """(status, content_type, body) of a recorded URL, or None."""
+        entry = self.index.get(_key(url))
+        if entry is None:
+            return None
+        body = (self.directory / 'responses' / entry['file']).read_bytes()
+        return entry['status'], entry['content_type'], body
+
+    def hosts(self):
+        return sorted({urlsplit(url).netloc for url in self.index})
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """Serves the recorded responses of one host."""
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+        entry = None
+        for scheme in ('https', 'http'):
+            entry = server.archive.get(f"{scheme}://{server.host}{self.path}")
+            if entry is not None:
+                break
+        if entry is None:
+            server.misses.append(self.path)
+            self.send_error(404, "Not in the archive")
+            return
+        server.hits += 1
+        status, content_type, body = entry
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # one line per request would drown the crawl output
+
+
+class Replay:
+    """
+    Local HTTP stand-ins for the hosts of a PageArchive.
+
+    Usage:
+        with Replay(PageArchive('.cache/archive')) as replay:
+            engine = ScrapeEngine(replay=replay)
+            ...
+
+    Args:
+        archive: PageArchive to serve
+        latency_ms: Delay added to every response
+    """
+
+    def __init__(self, archive, latency_ms=0):
+        self.archive = archive
+        self.latency_ms = latency_ms
+        self._servers = {}
+        # Requests answered from the archive outside the stand-ins, and those not in it
+        self.fulfilled = 0
+        self.misses = []
+
+    def start(self):
+        for host in self.archive.hosts():
+            server = ThreadingHTTPServer(('127.0.0.1', 0), _ReplayHandler)
+            server.daemon_threads = True
+            server.archive = self.archive
+            server.host = host
+            server.latency = self.latency_ms / 1000
+            server.hits = 0
+            server.misses = []
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self._servers[host] = server
+        return self
+
+    def stop(self):
+        for server in self._servers.values():
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def map_url(self, url):
+        """URL of the stand-in serving `url`; URLs of unrecorded hosts are returned unchanged."""
+        parts = urlsplit(url)
+        server = self._servers.get(parts.netloc)
+        if server is None:
+            return url
+        return urlunsplit(('http', f"127.0.0.1:{server.server_address[1]}", parts.path or '/', parts.query, ''))
+
+    def is_local(self, url):
+        return urlsplit(url).hostname == '127.0.0.1'
+
+    def lookup(self, url):
+        """Recorded (status, content_type, body) of a URL requested outside the stand-ins, or None (a miss)."""
+        response = self.archive.get(url)
+        if response is None:
+            self.misses.append(url)
+        else:
+            self.fulfilled += 1
+        return response
+
+    def summary_line(self):
+        hits = sum(server.hits for server in self._servers.values()) + self.fulfilled
+        misses = sum(len(server.misses) for server in self._servers.values()) + len(self.misses)
+        return (f"[replay] {hits} responses served by {len(self._servers)} stand-ins and the archive, "
+                f"{misses} requests not in the archive")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List a recorded page archive")
+    parser.add_argument('directory', nargs='?', type=Path, default=ARCHIVE_DIR)
+    args = parser.parse_args()
+
+    archive = PageArchive(args.directory)
+    if not len(archive):
+        print(f"No archive in {args.directory}")
+        return
+    by_source = {}
+    for entry in archive.index.values():
+        counts = by_source.setdefault(entry['source'] or '-', [0, 0])
+        counts[0] += 1
+        counts[1] += entry['bytes']
+    print(f"{len(archive)} responses from {', '.join(archive.hosts())}")
+    for source, (responses, size) in sorted(by_source.items()):
+        print(f"  {source}: {responses} responses, {size / 1024 ** 2:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Local columnar cache of the MySQL tables used by the reports.
+
+The first run pulls the whole table and stores it as a Parquet file. Later
+runs only read rows on or after `max_cached_date - RECHECK_DAYS` from MySQL,
+which picks up new days as well as late upserts to recent days, and replace
+that tail of the cache. Pass full_refresh=True to rebuild the cache, e.g.
+after rows were deleted or rewritten further back than the re-check window.
+"""
+
+import os
+from datetime import timedelta
+from pathlib import Path
+import pandas as pd
+from db_utils import MYSQL_DB
+
+CACHE_DIR = Path(os.getenv('REPORT_CACHE_DIR', Path(__file__).parent / '.cache'))
+
+# Days before the newest cached date that are re-read on every run
+RECHECK_DAYS = int(os.getenv('REPORT_CACHE_RECHECK_DAYS', 3))
+
+try:
+    import pyarrow  # noqa: F401  (Parquet engine)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+def cache_path(table_name, columns):
+    """Parquet file holding the cached `columns` of `table_name`."""
+    return CACHE_DIR / f"{MYSQL_DB or 'default'}_{table_name}__{'-'.join(columns)}.parquet"
+
+
+def normalize_frame(df):
+    """
+    Convert raw rows to compact dtypes.
+
+    date becomes datetime64[s] (pandas has no day resolution), num int32 with
+    non-numeric values as 0 and category a pandas Categorical.
+    """
+    df['date'] = pd.to_datetime(df['date']).astype('datetime64[s]')
+    df['num'] = pd.to_numeric(df['num'], errors='coerce').fillna(0).astype('int32')
+    df['category'] = df['category'].astype('category')
+    return df
+
+
+def _read_cache(path, columns):
+    if not path.exists():
+        return None
+    try:
+        cached = pd.read_parquet(path)
+    except Exception as e:
+        print(f"Ignoring unreadable cache {path.name}: {e}")
+        return None
+    if list(cached.columns) != list(columns):
+        return None
+    return cached
+
+
+def _write_cache(df, path):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def fetch_table(conn, table_name, columns=('date', 'category', 'num'), full_refresh=False, ascending=False):
+    """
+    Return `columns` of all rows of `table_name`, reading only the recent delta from MySQL.
+
+    `columns` must include date, category and num. Rows are sorted by date
+    and category, newest first unless `ascending` is set.
+    """
+    columns = list(columns)
+    select = f"SELECT {', '.join(columns)} FROM {table_name}"
+    path = cache_path(table_name, columns)
+
+    if not PARQUET_AVAILABLE:
+        print("pyarrow is not installed, reading the full table without cache")
+        df = normalize_frame(pd.read_sql(select, conn))
+        return df.sort_values(['date', 'category'], ascending=ascending, ignore_index=True)
+
+    cached = None if full_refresh else _read_cache(path, columns)
+
+    if cached is None or cached.empty:
+        df = normalize_frame(pd.read_sql(select, conn))
+        print(f"Cached {len(df)} rows of {table_name} (full read)")
+    else:
+        since = cached['date'].max() - timedelta(days=RECHECK_DAYS)
+        delta = pd.read_sql(f"{select} WHERE date >= %s", conn, params=(since.strftime("%Y-%m-%d"),))
+        # Concatenating categoricals with different categories yields objects, so normalize afterwards
+        df = normalize_frame(pd.concat([cached[cached['date'] < since], delta], ignore_index=True))
+        print(f"Read {len(delta)} rows of {table_name} since {since.strftime('%Y-%m-%d')} "
+              f"({len(df)} rows in cache)")
+
+    df = df.sort_values(['date', 'category'], ascending=False, ignore_index=True)
+    _write_cache(df, path)
+    if ascending:
+        df = df.iloc[::-1].reset_index(drop=True)
+    return df
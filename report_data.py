@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+"""
+Shared data access for the report scripts.
+
+All frames come back with compact dtypes (see report_cache.normalize_frame):
+category as a pandas Categorical, num as int32 and date as datetime64[s].
+Only the columns a report needs are selected in SQL; href is left out unless
+it is asked for.
+
+The trending rows and the group totals are aggregated in MySQL by joining the category_groups table,
+which ingestion keeps current (see category_groups.sync_category_groups).
+"""
+
+import pandas as pd
+from category_groups import sync_category_groups
+from db_utils import MYSQL_DB, ensure_tables_exist, pooled_connection
+from report_cache import CACHE_DIR, RECHECK_DAYS, fetch_table, normalize_frame
+from stats_store import RebuildRequired, StatsStore
+
+BASE_COLUMNS = ('date', 'category', 'num')
+
+# Window and size of the trending categories report
+TREND_MONTHS = 3
+TREND_TOP_N = 10
+
+
+def frame_memory_mb(df):
+    """Memory used by a DataFrame including object payloads, in MB."""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def load_history(table_name='projects', include_href=False, full_refresh=False, ascending=False):
+    """
+    Load the full history of `table_name` through the local cache.
+
+    Args:
+        table_name: 'projects' or 'freelances'
+        include_href: Also load the href column
+        full_refresh: Rebuild the local cache from the full table
+        ascending: Sort oldest first instead of newest first
+    """
+    columns = BASE_COLUMNS + (('href',) if include_href else ())
+    with pooled_connection() as conn:
+        df = fetch_table(conn, table_name, columns, full_refresh=full_refresh, ascending=ascending)
+    print(f"Loaded {len(df)} rows of {table_name} ({frame_memory_mb(df):.1f} MB)")
+    return df
+
+
+def load_latest(table_name='projects', include_href=True):
+    """Load only the rows of the most recent date of `table_name`."""
+    columns = BASE_COLUMNS + (('href',) if include_href else ())
+    with pooled_connection() as conn:
+        df = pd.read_sql(f"""
+            SELECT {', '.join(columns)}
+            FROM {table_name}
+            WHERE date = (SELECT MAX(date) FROM {table_name})
+            ORDER BY category DESC
+        """, conn)
+    return normalize_frame(df)
+
+
+def _classify_missing(conn, table_name, ruleset, date):
+    """Classify categories of `date` that have no category_groups row yet, e.g. older data."""
+    with conn.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT DISTINCT t.category
+            FROM {table_name} t
+            LEFT JOIN category_groups g ON g.ruleset = %s AND g.category = t.category
+            WHERE t.date = %s AND g.category IS NULL
+        """, (ruleset, date))
+        missing = [row[0] for row in cursor.fetchall()]
+    if missing:
+        sync_category_groups(conn, missing)
+        conn.commit()
+
+
+def load_group_breakdown(table_name='projects', ruleset='reports'):
+    """
+    Totals per group and per (group, category) for the latest date of `table_name`.
+
+    Both are aggregated in MySQL with a JOIN on category_groups and a GROUP BY,
+    so only one row per group or category leaves the database.
+
+    Returns:
+        (latest_date, grouped, detailed): grouped has columns group and num,
+        detailed group, category and num, both ordered by group and category
+    """
+    with pooled_connection() as conn:
+        ensure_tables_exist(conn)
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT MAX(date) FROM {table_name}")
+            latest_date = pd.Timestamp(cursor.fetchone()[0])
+        date = latest_date.strftime("%Y-%m-%d")
+        _classify_missing(conn, table_name, ruleset, date)
+
+        join = f"""
+            FROM {table_name} t
+            JOIN category_groups g ON g.ruleset = %s AND g.category = t.category
+            WHERE t.date = %s
+        """
+        detailed = pd.read_sql(f"""
+            SELECT g.grp AS `group`, t.category, CAST(SUM(COALESCE(t.num, 0)) AS SIGNED) AS num
+            {join}
+            GROUP BY g.grp, t.category
+        """, conn, params=(ruleset, date))
+        grouped = pd.read_sql(f"""
+            SELECT g.grp AS `group`, CAST(SUM(COALESCE(t.num, 0)) AS SIGNED) AS num
+            {join}
+            GROUP BY g.grp
+        """, conn, params=(ruleset, date))
+
+    # Order like a pandas groupby would (binary, not by the column collation)
+    detailed = detailed.sort_values(['group', 'category'], kind='mergesort', ignore_index=True)
+    grouped = grouped.sort_values('group', kind='mergesort', ignore_index=True)
+    return latest_date, grouped, detailed
+
+
+def _top_categories(latest_totals, top_n):
+    """Names of the `top_n` largest categories, ordered by num descending."""
+    latest_totals = latest_totals.sort_values('category', kind='mergesort')
+    return latest_totals.sort_values('num', ascending=False).head(top_n)['category'].unique()
+
+
+def trending_rows_from_frame(df, months=TREND_MONTHS, top_n=TREND_TOP_N):
+    """
+    In-memory equivalent of load_trending_rows for a frame from load_history.
+
+    Returns:
+        (trend_data, top_categories) as described in load_trending_rows
+    """
+    latest_date = df['date'].max()
+    recent_data = df[df['date'] >= latest_date - pd.DateOffset(months=months)]
+    grouped = recent_data.groupby(['date', 'category'], observed=True)['num'].sum().reset_index()
+    top_categories = _top_categories(grouped[grouped['date'] == latest_date], top_n)
+    trend_data = grouped[grouped['category'].isin(top_categories)]
+    return trend_data.reset_index(drop=True), top_categories
+
+
+def build_trend_query(table_name, top_n=TREND_TOP_N):
+    """
+    SQL returning the per-(date, category) totals of the trend window.
+
+    Only categories that can be among the `top_n` largest on the latest
+    date are returned: those whose total reaches the `top_n`-th largest
+    total, so ties at the cut-off come back too and are resolved by the
+    caller. Parameters: latest date (twice), window start.
+    """
+    totals = f"""
+        SELECT category, SUM(COALESCE(num, 0)) AS num
+        FROM {table_name}
+        WHERE date = %s
+        GROUP BY category
+    """
+    cutoff = f"SELECT num FROM ({totals}) totals ORDER BY num DESC LIMIT 1 OFFSET {int(top_n) - 1}"
+    return f"""
+        SELECT t.date, t.category, SUM(COALESCE(t.num, 0)) AS num, MAX(top.num) AS latest_num
+        FROM {table_name} t
+        JOIN ({totals}) top ON top.category = t.category
+        WHERE top.num >= COALESCE(({cutoff}), 0)
+          AND t.date >= %s
+        GROUP BY t.date, t.category
+    """
+
+
+def load_trending_rows(table_name='projects', months=TREND_MONTHS, top_n=TREND_TOP_N):
+    """
+    Daily totals of the top categories over the last `months` months, computed in MySQL.
+
+    The date window, the per-(date, category) grouping and the top-N
+    selection on the latest date run in the database; only the rows of the
+    selected categories are transferred.
+
+    Returns:
+        (trend_data, top_categories): trend_data has columns date, category
+        and num ordered by date and category, top_categories the category
+        names ordered by their latest total, largest first
+    """
+    with pooled_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT MAX(date) FROM {table_name}")
+            latest_date = pd.Timestamp(cursor.fetchone()[0])
+        since = latest_date - pd.DateOffset(months=months)
+        rows = pd.read_sql(build_trend_query(table_name, top_n), conn,
+                           params=(latest_date.strftime("%Y-%m-%d"),
+                                   latest_date.strftime("%Y-%m-%d"),
+                                   since.strftime("%Y-%m-%d")))
+
+    latest_totals = rows[['category', 'latest_num']].drop_duplicates('category')
+    top_categories = _top_categories(latest_totals.rename(columns={'latest_num': 'num'}), top_n)
+
+    trend_data = normalize_frame(rows.loc[rows['category'].isin(top_categories), ['date', 'category', 'num']].copy())
+    trend_data = trend_data.sort_values(['date', 'category'], ignore_index=True)
+    print(f"Loaded {len(trend_data)} trending rows of {table_name} since {since.strftime('%Y-%m-%d')}")
+    return trend_data, top_categories
+
+
+def stats_store_path(table_name, ruleset='trends'):
+    """JSON file holding the statistics store of `table_name`."""
+    return CACHE_DIR / f"{MYSQL_DB or 'default'}_{table_name}__stats_{ruleset}.json"
+
+
+def load_stats_store(table_name='projects', ruleset='trends', full_refresh=False):
+    """
+    Bring the incremental statistics store of `table_name` up to date.
+
+    Only rows on or after the stored last date minus RECHECK_DAYS are read
+    from MySQL and applied day by day. The store is rebuilt from the full
+    table on the first run, after a rule set change, with `full_refresh`
+    or when older days changed.
+    """
+    path = stats_store_path(table_name, ruleset)
+    store = None if full_refresh else StatsStore.load(path, ruleset)
+    select = f"SELECT date, category, num FROM {table_name}"
+
+    with pooled_connection() as conn:
+        if store is not None:
+            since = store.resume_date(RECHECK_DAYS)
+            delta = normalize_frame(pd.read_sql(f"{select} WHERE date >= %s", conn, params=(since,)))
+            try:
+                store.update(delta)
+                print(f"Updated statistics of {table_name} with {delta['date'].nunique()} days since {since}")
+            except RebuildRequired as e:
+                print(f"Rebuilding statistics of {table_name}: {e}")
+                store = None
+        if store is None:
+            store = StatsStore(ruleset)
+            store.update(normalize_frame(pd.read_sql(select, conn)))
+            print(f"Built statistics of {table_name} over {store.n_days} days")
+
+    store.save(path)
+    return store
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Request interception for the scrapers.
+
+The scrapers only read the text of the category lists, so images, media,
+fonts and stylesheets are aborted, as are requests to known tracking and
+advertising hosts. Each source has its own policy with an allowlist of hosts
+(e.g. the consent provider freelance.de needs for its cookie dialog) and
+resource types that are never blocked.
+
+A policy is attached per page. It routes every request of the page through
+the policy and meters the bytes received and the requests blocked, so
+CrawlStats can log bytes and load time per page (see wait_utils).
+Set SCRAPER_BLOCK_RESOURCES=0 to load pages in full and compare.
+"""
+
+import os
+import weakref
+from urllib.parse import urlparse
+
+BLOCK_RESOURCES = os.getenv('SCRAPER_BLOCK_RESOURCES', '1') != '0'
+
+# Playwright resource types that are never needed to read the lists
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+# Tracking and advertising hosts, matched with their subdomains
+TRACKER_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'googlesyndication.com', 'googleadservices.com',
+    'doubleclick.net', 'adservice.google.com', 'facebook.net', 'facebook.com', 'connect.facebook.net',
+    'hotjar.com', 'hotjar.io', 'clarity.ms', 'bing.com', 'linkedin.com', 'licdn.com', 'criteo.com',
+    'criteo.net', 'taboola.com', 'outbrain.com', 'adnxs.com', 'amazon-adsystem.com', 'xing.com',
+    'matomo.cloud', 'etracker.com', 'etracker.de', 'trustpilot.com', 'intercom.io', 'hubspot.com',
+)
+
+# Meter of every page a policy is attached to
+_meters = weakref.WeakKeyDictionary()
+
+
+def _matches(host, domains):
+    return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+
+class TrafficMeter:
+    """Requests, bytes received and requests blocked on one page."""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.blocked = 0
+
+    def add_response(self, sizes):
+        self.requests += 1
+        self.bytes += max(0, sizes.get('responseHeadersSize', 0)) + max(0, sizes.get('responseBodySize', 0))
+
+
+class RoutePolicy:
+    """
+    Which requests a source's pages may make.
+
+    Args:
+        allow_hosts: Hosts (with subdomains) whose requests are never blocked
+        allow_types: Resource types that are not blocked for this source
+    """
+
+    def __init__(self, allow_hosts=(), allow_types=(), enabled=BLOCK_RESOURCES):
+        self.allow_hosts = tuple(allow_hosts)
+        self.blocked_types = BLOCKED_RESOURCE_TYPES - set(allow_types)
+        self.enabled = enabled
+
+    def should_block(self, url, resource_type):
+        if not self.enabled:
+            return False
+        host = urlparse(url).hostname or ''
+        if _matches(host, self.allow_hosts):
+            return False
+        return resource_type in self.blocked_types or _matches(host, TRACKER_HOSTS)
+
+    async def attach_async(self, page):
+        """Route the requests of a playwright.async_api page through the policy; returns its meter."""
+        meter = TrafficMeter()
+
+        async def handle(route):
+            request = route.request
+            if self.should_block(request.url, request.resource_type):
+                meter.blocked += 1
+                await route.abort()
+            else:
+                await route.continue_()
+
+        async def finished(request):
+            try:
+                meter.add_response(await request.sizes())
+            except Exception:
+                pass  # the page may have navigated away; metering must not fail the crawl
+
+        if self.enabled:
+            await page.route('**/*', handle)
+        page.on('requestfinished', finished)
+        _meters[page] = meter
+        return meter
+
+
+def meter_for(page):
+    """Meter of a page a policy was attached to, or None."""
+    return _meters.get(page)
@@ -1,5 +1,7 @@
 #!/bin/bash
 # Script to generate freelance market analysis reports
+# Extra arguments are passed to generate_reports.py (e.g. --full-refresh, --force)
+# Reports whose inputs did not change are skipped (see reports/.build_manifest.json)
 
 # Get the directory where the script is located
 SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )"
@@ -15,9 +17,13 @@ if [ $? -ne 0 ]; then
   exit 1
 fi
 
+# Figure output profile: web (small WebP), print (300 dpi PNG, default) or vector (SVG)
+# e.g. REPORT_FIGURE_PROFILE=web ./run_reports.sh, or ./run_reports.sh --profile web
+export REPORT_FIGURE_PROFILE="${REPORT_FIGURE_PROFILE:-print}"
+
 # Run the report generation script
-echo "Generating freelance market analysis reports..."
-python "$SCRIPT_DIR/generate_reports.py"
+echo "Generating freelance market analysis reports (figure profile: $REPORT_FIGURE_PROFILE)..."
+python "$SCRIPT_DIR/generate_reports.py" "$@"
 if [ $? -eq 0 ]; then
   echo "Reports generated successfully."
 else
@@ -0,0 +1,482 @@
+#!/usr/bin/env python
+"""
+Common crawl engine for the source adapters in sources.py.
+
+For every source the engine discovers the start pages, fetches each page
+(from the page cache, over plain HTTP or in the shared browser), parses it
+and follows the links the adapter returns. It provides:
+
+    concurrency  a pool of pages per source on one browser_session.BrowserSession,
+                 at most PER_HOST_LIMIT requests per host and a politeness delay
+    caching      pages that parsed to rows are kept for PAGE_CACHE_TTL seconds
+                 (per crawl date), so a retried or repeated crawl does not fetch
+                 them again; a start page whose list is missing, partly
+                 expanded or empty raises PageNotReady and is not cached
+    metrics      pages, cache hits, fetch and parse time and rows per source,
+                 plus the CrawlStats page timings and traffic (see wait_utils)
+    replay       a crawl can be recorded into an archive and run again against
+                 local stand-ins of the sites (see replay.py)
+
+Rows keep the order of a sequential crawl: each row is followed by the rows
+of the page it links to.
+
+Usage: python scrape_engine.py [--sources freelance.de ...] [--fetch static] [--no-cache] [--no-save]
+                              [--record DIR | --replay DIR [--latency-ms 50]]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+from lxml import html as lxml_html
+from browser_session import BrowserSession
+from replay import PageArchive, Replay
+from route_policy import meter_for
+from sources import SOURCES
+from static_extract import StaticFetchError, fetch_html, new_session
+from wait_utils import (CrawlStats, PAGE_WAIT_BUDGET_MS, count_list_items_async, wait_for_list_growth_async,
+                        wait_for_network_idle_async, wait_for_selector_async)
+
+POOL_SIZE = int(os.getenv('SCRAPER_POOL_SIZE', 4))
+PER_HOST_LIMIT = int(os.getenv('SCRAPER_PER_HOST_LIMIT', 4))
+POLITENESS_DELAY = float(os.getenv('SCRAPER_POLITENESS_DELAY', 0.5))
+
+PAGE_CACHE_DIR = Path(os.getenv('SCRAPER_PAGE_CACHE_DIR', Path(__file__).parent / '.cache' / 'pages'))
+# Seconds a fetched page is reused; 0 disables the cache
+PAGE_CACHE_TTL = float(os.getenv('SCRAPER_PAGE_CACHE_TTL', 3600))
+
+# Responses of browser pages kept in a recording (the other types are blocked by the route policies)
+RECORDED_TYPES = frozenset({'document', 'script', 'xhr', 'fetch'})
+
+
+class PageNotReady(Exception):
+    """A fetched page is incomplete: its list did not appear, was only partly expanded or has no rows."""
+
+
+class PageCache:
+    """
+    Fetched HTML per source, crawl date and URL on disk, reused for `ttl` seconds.
+
+    The crawl date is part of the key, so a run after midnight does not
+    reuse the counts of the previous day under the new date.
+    """
+
+    def __init__(self, directory=PAGE_CACHE_DIR, ttl=PAGE_CACHE_TTL):
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    def _path(self, source, date, url):
+        return self.directory / source / date / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:20]}.html"
+
+    def get(self, source, date, url):
+        if self.ttl <= 0:
+            return None
+        path = self._path(source, date, url)
+        if not path.exists() or time.time() - path.stat().st_mtime > self.ttl:
+            return None
+        return path.read_text(encoding='utf-8')
+
+    def put(self, source, date, url, html):
+        if self.ttl <= 0:
+            return
+        path = self._path(source, date, url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(html, encoding='utf-8')
+        os.replace(tmp_path, path)
+
+
+class SourceMetrics:
+    """Counters of one source's crawl."""
+
+    def __init__(self, name):
+        self.name = name
+        self.pages = 0
+        self.cache_hits = 0
+        self.empty_pages = 0
+        self.browser_fallbacks = 0
+        self.fetch_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.rows = 0
+        self.seconds = 0.0
+
+    def summary_line(self):
+        fetched = self.pages - self.cache_hits
+        rate = self.pages / self.seconds if self.seconds else 0.0
+        # Page time summed as if the pages were fetched one after another
+        serial = self.fetch_seconds + self.parse_seconds
+        speedup = serial / self.seconds if self.seconds else 0.0
+        return (f"[{self.name}] {self.rows} rows from {self.pages} pages in {self.seconds:.1f}s "
+                f"({rate:.1f} pages/s): {fetched} fetched in {self.fetch_seconds:.1f}s, "
+                f"{self.cache_hits} from cache, {self.empty_pages} without a list, "
+                f"{self.browser_fallbacks} browser fallbacks, "
+                f"parsing {self.parse_seconds * 1000:.0f}ms "
+                f"(sequential page time {serial:.1f}s, speedup {speedup:.1f}x)")
+
+
+class _PagePool:
+    """Pages of one browser context, opened on demand up to `size` and prepared by `setup`."""
+
+    def __init__(self, context, size, setup):
+        self.context = context
+        self.size = size
+        self.setup = setup
+        self.created = 0
+        self.idle = asyncio.Queue()
+
+    async def get(self):
+        if self.idle.empty() and self.created < self.size:
+            # Counted before awaiting, so concurrent callers do not exceed `size`
+            self.created += 1
+            page = None
+            try:
+                page = await self.context.new_page()
+                await self.setup(page)
+            except BaseException:
+                # Give the slot back, or the pool would wait for a page that never comes
+                self.created -= 1
+                if page is not None:
+                    await page.close()
+                raise
+            return page
+        return await self.idle.get()
+
+    def put(self, page):
+        self.idle.put_nowait(page)
+
+
+class ScrapeEngine:
+    """
+    Runs source adapters.
+
+    Args:
+        session: BrowserSession to use; the engine starts and closes its own if None
+        cache: PageCache, or None for the default cache (disabled when
+            recording or replaying)
+        fetch_mode: Override of every source's fetch_mode ('browser' or 'static')
+        archive: replay.PageArchive recording every response of the crawl
+        replay: replay.Replay to fetch from instead of the live sites
+    """
+
+    def __init__(self, session=None, cache=None, pool_size=POOL_SIZE, per_host=PER_HOST_LIMIT,
+                 delay=POLITENESS_DELAY, fetch_mode=None, archive=None, replay=None):
+        self.session = session
+        self._owns_session = session is None
+        if cache is None:
+            cache = PageCache(ttl=0) if archive is not None or replay is not None else PageCache()
+        self.cache = cache
+        self.pool_size = pool_size
+        self.per_host = per_host
+        self.delay = delay
+        self.fetch_mode = fetch_mode
+        self.archive = archive
+        self.replay = replay
+
+        self.metrics = {}
+        self.stats = {}
+        self._pools = {}
+        self._pool_locks = {}
+        self._host_limits = {}
+        self._http = None
+        self._dates = {}
+        # Pages fetched in this run, cached once they parsed to rows
+        self._fetched = {}
+
+    # Fetching
+
+    def _url(self, url):
+        """Where `url` is fetched from: the replay stand-in of its host, or the site itself."""
+        return self.replay.map_url(url) if self.replay is not None else url
+
+    async def _setup_page(self, source, page):
+        await source.route_policy.attach_async(page)
+        if self.replay is not None:
+            # Registered last, so it runs before the route policy
+            await page.route('**/*', self._replay_route)
+        if self.archive is not None:
+            async def record(response):
+                if response.request.resource_type not in RECORDED_TYPES or not response.ok:
+                    return
+                try:
+                    body = await response.body()
+                except Exception:
+                    return  # e.g. the page navigated away before the body arrived
+                self.archive.record(response.url, body, response.status,
+                                    response.headers.get('content-type', 'text/html'), source.name)
+            page.on('response', record)
+
+    async def _replay_route(self, route):
+        """
+        Keep a replayed page offline: requests to the stand-ins go on to the
+        route policy, absolute URLs the page loads (scripts, XHR) are answered
+        from the archive and everything else is aborted.
+        """
+        url = route.request.url
+        if self.replay.is_local(url):
+            await route.fallback()
+            return
+        response = self.replay.lookup(url)
+        if response is None:
+            await route.abort()
+            return
+        status, content_type, body = response
+        await route.fulfill(status=status, headers={'content-type': content_type}, body=body)
+
+    async def _pool(self, source):
+        """Page pool of `source`, opening its context (and accepting its consent) on first use."""
+        lock = self._pool_locks.setdefault(source.name, asyncio.Lock())
+        async with lock:
+            if source.name not in self._pools:
+                if self.session is None:
+                    self.session = BrowserSession()
+                consent = source.consent
+                context, consented = await self.session.new_context(source.name, consent.cookie if consent else None)
+                pool = _PagePool(context, self.pool_size, lambda page: self._setup_page(source, page))
+                # The consent dialog comes from its provider, which a replay does not serve
+                if consent and not consented and self.replay is None:
+                    page = await pool.get()
+                    try:
+                        seconds = await self._accept_consent(source, page)
+                        await self.session.save_state(context, source.name, seconds)
+                    finally:
+                        pool.put(page)
+                self._pools[source.name] = pool
+            return self._pools[source.name]
+
+    async def _accept_consent(self, source, page):
+        consent = source.consent
+        with self.stats[source.name].page(consent.url, budget_ms=5000, meter=meter_for(page)) as timer:
+            try:
+                await page.goto(consent.url, wait_until='domcontentloaded')
+                if await wait_for_selector_async(page, consent.button, timer, state='visible'):
+                    await page.click(consent.button)
+                    await wait_for_selector_async(page, consent.dialog, timer, state='hidden')
+            except Exception:
+                print(f"[{source.name}] Cookie popup not found or already accepted. Continue ...")
+        return timer.seconds
+
+    async def _expand(self, page, expand, items, timer):
+        """Open a collapsed list as described by a sources.Expand; returns False if it stayed partly collapsed."""
+        if expand.until_text is None:
+            button = await page.query_selector(expand.button)
+            if button:
+                count = await count_list_items_async(page, items)
+                await button.click()
+                return await wait_for_list_growth_async(page, items, count, timer)
+            return True
+        for button in await page.query_selector_all(expand.button):
+            while (await button.inner_text()).strip() != expand.until_text:
+                count = await count_list_items_async(page, items)
+                await button.click()
+                if not await wait_for_list_growth_async(page, items, count, timer, watch=button):
+                    print("Wait budget exhausted while expanding the category lists")
+                    return False
+        return True
+
+    async def _fetch_browser(self, source, target):
+        pool = await self._pool(source)
+        page = await pool.get()
+        try:
+            section = target.section
+            budget_ms = source.page_budget_ms or PAGE_WAIT_BUDGET_MS
+            with self.stats[source.name].page(target.url, budget_ms, meter=meter_for(page)) as timer:
+                await page.goto(self._url(target.url), wait_until='domcontentloaded')
+                ready = await wait_for_selector_async(page, section.ready, timer)
+                # Linked pages of leaf categories have no list; a start page must have one
+                if not ready and target.depth == 0:
+                    raise PageNotReady(f"{section.ready} did not appear on {target.url}")
+                if ready and section.expand:
+                    # A start page must be complete; a linked page is read with what it shows
+                    try:
+                        expanded = await self._expand(page, section.expand, section.items.items, timer)
+                        problem = None if expanded else f"the list on {target.url} was only partly expanded"
+                    except Exception as e:
+                        problem = f"expanding the list on {target.url} failed: {e}"
+                    if problem and target.depth == 0:
+                        raise PageNotReady(problem)
+                    if problem:
+                        print(f"{problem}, reading the page as it is")
+                if ready and section.settle and not await wait_for_network_idle_async(page, timer):
+                    print(f"Network did not go idle on {target.url}, reading the page as it is")
+                return await page.content()
+        finally:
+            pool.put(page)
+
+    def _get(self, source, url):
+        html = fetch_html(self._http, self._url(url))
+        if self.archive is not None:
+            self.archive.record(url, html, source=source.name)
+        return html
+
+    def _fetch_static(self, source, target):
+        """Plain HTTP fetch; raises StaticFetchError if the page needs the browser."""
+        if self._http is None:
+            self._http = new_session()
+        section = target.section
+        if section.expand and section.expand.link is None:
+            raise StaticFetchError("the list is only expanded in the browser")
+        with self.stats[source.name].page(target.url):
+            html = self._get(source, target.url)
+            tree = lxml_html.fromstring(html)
+            if section.expand:
+                links = tree.xpath(section.expand.link)
+                if links:
+                    href = (links[0].get('href') or '').strip()
+                    if not href or href.startswith('#') or href.startswith('javascript:'):
+                        raise StaticFetchError("the expand link is not a plain link")
+                    html = self._get(source, urljoin(target.url, href))
+                    tree = lxml_html.fromstring(html)
+            # Linked pages of leaf categories have no list
+            if target.depth == 0 and not tree.xpath(section.items.items):
+                raise StaticFetchError("no list items found")
+        return html
+
+    async def fetch_page(self, source, target):
+        """HTML of a page: from the cache, else fetched as the source (or the engine) asks."""
+        metrics = self.metrics[source.name]
+        metrics.pages += 1
+        html = self.cache.get(source.name, self._dates[source.name], target.url)
+        if html is not None:
+            metrics.cache_hits += 1
+            return html
+
+        host = urlparse(target.url).netloc
+        limit = self._host_limits.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with limit:
+            print(f"Accessing {target.url}")
+            started = time.perf_counter()
+            if (self.fetch_mode or source.fetch_mode) == 'static':
+                try:
+                    html = await asyncio.to_thread(self._fetch_static, source, target)
+                except StaticFetchError as e:
+                    print(f"Static fetch failed for {target.url} ({e}), using the browser")
+                    metrics.browser_fallbacks += 1
+                    html = await self._fetch_browser(source, target)
+            else:
+                html = await self._fetch_browser(source, target)
+            metrics.fetch_seconds += time.perf_counter() - started
+            # Politeness delay before the host slot is released
+            await asyncio.sleep(self.delay)
+
+        self._fetched[(source.name, target.url)] = html
+        return html
+
+    # Crawling
+
+    async def _crawl(self, source, target, date):
+        html = await source.fetch(self, target)
+        started = time.perf_counter()
+        rows, links = source.parse(target, html, date)
+        metrics = self.metrics[source.name]
+        metrics.parse_seconds += time.perf_counter() - started
+
+        fetched = self._fetched.pop((source.name, target.url), None)
+        if not rows:
+            if target.depth == 0:
+                raise PageNotReady(f"no rows on {target.url}")
+            metrics.empty_pages += 1
+        elif fetched is not None:
+            # Only complete pages are cached, so a retry fetches the others again
+            self.cache.put(source.name, date, target.url, fetched)
+
+        children = await asyncio.gather(*(self._crawl(source, link, date) for link in links.values()))
+        linked_rows = dict(zip(links, children))
+        ordered = []
+        for i, row in enumerate(rows):
+            ordered.append(row)
+            ordered.extend(linked_rows.get(i, ()))
+        return ordered
+
+    async def run_source(self, source):
+        """
+        Crawl one source.
+
+        Returns:
+            dict of table name -> rows (dicts with category, num, date and href)
+        """
+        self.metrics[source.name] = metrics = SourceMetrics(source.name)
+        self.stats[source.name] = CrawlStats(source.name)
+        self._dates[source.name] = date = datetime.now().strftime("%Y-%m-%d")
+        started = time.perf_counter()
+
+        targets = source.discover()
+        sections = await asyncio.gather(*(self._crawl(source, target, date) for target in targets))
+        results = {}
+        for target, rows in zip(targets, sections):
+            results.setdefault(target.section.table, []).extend(rows)
+
+        pool = self._pools.pop(source.name, None)
+        if pool is not None:
+            if self.replay is None:
+                await self.session.save_state(pool.context, source.name)
+            await pool.context.close()
+        if self.archive is not None:
+            self.archive.save()
+
+        metrics.rows = sum(len(rows) for rows in results.values())
+        metrics.seconds = time.perf_counter() - started
+        print(metrics.summary_line())
+        self.stats[source.name].print_summary()
+        return results
+
+    async def run(self, sources):
+        """Crawl `sources` concurrently; returns {source name: {table: rows}}."""
+        try:
+            results = await asyncio.gather(*(self.run_source(source) for source in sources))
+        finally:
+            if self._owns_session and self.session is not None:
+                self.session.print_summary()
+                await self.session.close()
+        return {source.name: result for source, result in zip(sources, results)}
+
+
+def save_results(results):
+    """Save the rows of one source ({table: rows}) to MySQL."""
+    from db_utils import save_to_mysql
+    for table_name, rows in results.items():
+        if rows:
+            save_to_mysql(rows, table_name)
+        else:
+            print(f"WARNING: no rows for {table_name}, nothing saved")
+
+
+def run_sources(names, fetch_mode=None, use_cache=True, save=True, **options):
+    """Crawl the named sources with a new engine and save their rows; `options` go to ScrapeEngine."""
+    engine = ScrapeEngine(cache=None if use_cache else PageCache(ttl=0), fetch_mode=fetch_mode, **options)
+    results = asyncio.run(engine.run([SOURCES[name] for name in names]))
+    if save:
+        print("\nSaving data to MySQL database...")
+        for result in results.values():
+            save_results(result)
+        print("Data has been saved to MySQL database")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl job boards with the source adapters")
+    parser.add_argument('--sources', nargs='+', choices=list(SOURCES), default=list(SOURCES))
+    parser.add_argument('--fetch', choices=['browser', 'static'], default=None,
+                        help="Fetch every source this way instead of its own fetch_mode")
+    parser.add_argument('--no-cache', action='store_true', help="Fetch every page even if it was fetched recently")
+    parser.add_argument('--no-save', action='store_true', help="Do not save the rows to MySQL")
+    parser.add_argument('--record', type=Path, metavar='DIR', help="Record every response into this archive")
+    parser.add_argument('--replay', type=Path, metavar='DIR',
+                        help="Crawl a recorded archive on local stand-ins instead of the live sites (never saved)")
+    parser.add_argument('--latency-ms', type=float, default=0, help="Latency the replay stand-ins add per response")
+    args = parser.parse_args()
+
+    if args.replay:
+        with Replay(PageArchive(args.replay), latency_ms=args.latency_ms) as replay:
+            run_sources(args.sources, args.fetch, save=False, replay=replay)
+            print(replay.summary_line())
+    else:
+        archive = PageArchive(args.record) if args.record else None
+        run_sources(args.sources, args.fetch, use_cache=not args.no_cache, save=not args.no_save, archive=archive)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""
+Job boards as declarative source adapters.
+
+A Source describes a site: its sections (start URL, target table and the
+selectors of the category list), an optional cookie consent, how the list
+is expanded in the browser and the route policy of its pages. The steps of
+a crawl are methods of the adapter:
+
+    discover()  the start pages of the sections
+    fetch()     the HTML of a page, through the engine (browser or plain HTTP)
+    parse()     the rows of a page and the pages it links to
+
+The defaults work from the declarative fields, so a board with a category
+list only needs a new entry in SOURCES; scrape_engine.ScrapeEngine supplies
+the shared browser, concurrency, page cache and metrics. Override a step
+only for sites that do not fit the pattern.
+"""
+
+from urllib.parse import urljoin
+from lxml import html as lxml_html
+from route_policy import RoutePolicy
+from static_extract import LIST_SELECTORS, COUNT_XPATHS, SHOW_ALL_XPATH
+
+
+def _has_class(name):
+    """XPath predicate matching elements with the CSS class `name`."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class ListSpec:
+    """
+    Selectors of a category list.
+
+    Args:
+        items: XPath of the list items
+        label: XPath of the label element inside an item (its text is the category)
+        count: XPath of the count element inside an item
+        href_attr: Attribute of the label element holding the link, None if
+            the list has no links
+        label_cut: Character after which the label text is dropped, e.g. '('
+            for labels like 'Java (123)'
+        thousands_sep: Separator removed from the counts
+    """
+
+    def __init__(self, items, label, count, href_attr=None, label_cut=None, thousands_sep=None):
+        self.items = items
+        self.label = label
+        self.count = count
+        self.href_attr = href_attr
+        self.label_cut = label_cut
+        self.thousands_sep = thousands_sep
+
+
+class Expand:
+    """
+    How a collapsed list is opened in the browser.
+
+    Without `until_text` the first `button` is clicked once; with it every
+    `button` is clicked until its text reads `until_text`. `link` is the
+    XPath of a plain link to the full list, followed when fetching without
+    a browser.
+    """
+
+    def __init__(self, button, until_text=None, link=None):
+        self.button = button
+        self.until_text = until_text
+        self.link = link
+
+
+class Consent:
+    """A cookie consent dialog accepted once and then kept in the saved browser state."""
+
+    def __init__(self, url, button, dialog, cookie):
+        self.url = url
+        self.button = button
+        self.dialog = dialog
+        self.cookie = cookie
+
+
+class Section:
+    """
+    One category list of a source.
+
+    Args:
+        name: Section name, e.g. 'jobs'
+        url: Start page
+        table: MySQL table the rows go to
+        items: ListSpec of the list
+        follow: Also crawl the pages the start page's items link to
+        ready: Selector to wait for before reading the page (default: the items)
+        expand: Expand of the list, if it is collapsed
+        settle: In the browser, also wait for the network to go idle after
+            expanding, for lists whose counts arrive by XHR
+    """
+
+    def __init__(self, name, url, table, items, follow=False, ready=None, expand=None, settle=False):
+        self.name = name
+        self.url = url
+        self.table = table
+        self.items = items
+        self.follow = follow
+        self.ready = ready or items.items
+        self.expand = expand
+        self.settle = settle
+
+
+class Target:
+    """A page to crawl: its URL, section and depth (0 for the start page)."""
+
+    def __init__(self, url, section, depth=0):
+        self.url = url
+        self.section = section
+        self.depth = depth
+
+
+class Source:
+    """
+    A job board.
+
+    Args:
+        name: Source name, also the key of its saved browser state
+        sections: Section list
+        fetch_mode: 'browser', or 'static' to fetch plain HTML and use the
+            browser only for pages that cannot be read that way
+        consent: Consent of the site, if any
+        route_policy: RoutePolicy of its pages
+        page_budget_ms: Wait budget of one page visit
+    """
+
+    def __init__(self, name, sections, fetch_mode='browser', consent=None, route_policy=None,
+                 page_budget_ms=None):
+        self.name = name
+        self.sections = sections
+        self.fetch_mode = fetch_mode
+        self.consent = consent
+        self.route_policy = route_policy or RoutePolicy()
+        self.page_budget_ms = page_budget_ms
+
+    def discover(self):
+        """Start pages of all sections."""
+        return [Target(section.url, section) for section in self.sections]
+
+    async def fetch(self, engine, target):
+        """HTML of `target`; the engine decides between cache, plain HTTP and browser."""
+        return await engine.fetch_page(self, target)
+
+    def parse(self, target, html, date):
+        """
+        Rows of a fetched page and the pages to crawl next.
+
+        Returns:
+            (rows, links): rows are dicts with category, num, date and href;
+            links maps the index of a row to the Target it links to
+        """
+        rows = parse_list(lxml_html.fromstring(html), target.section.items, date)
+        links = {}
+        if target.section.follow and target.depth == 0:
+            links = {i: Target(urljoin(target.url, row['href']), target.section, depth=1)
+                     for i, row in enumerate(rows) if row['href']}
+        return rows, links
+
+
+def parse_list(tree, spec, date):
+    """Rows of the list described by `spec` in a parsed lxml document."""
+    rows = []
+    for item in tree.xpath(spec.items):
+        labels = item.xpath(spec.label)
+        if not labels:
+            continue
+        label = labels[0].text_content()
+        if spec.label_cut:
+            label = label.split(spec.label_cut)[0]
+
+        counts = item.xpath(spec.count)
+        count = counts[0].text_content().strip().strip('()').strip() if counts else '0'
+        if spec.thousands_sep:
+            count = count.replace(spec.thousands_sep, '')
+
+        rows.append({
+            'category': label.strip(),
+            'num': count,
+            'date': date,
+            'href': labels[0].get(spec.href_attr) if spec.href_attr else '',
+        })
+    return rows
+
+
+FREELANCE_DE = Source(
+    'freelance.de',
+    sections=[
+        Section('jobs', 'https://www.freelance.de/projekte', 'projects',
+                ListSpec(LIST_SELECTORS['jobs'], './/a', COUNT_XPATHS['jobs'], href_attr='href', label_cut='('),
+                follow=True,
+                expand=Expand('a.badge:has-text("Alle anzeigen")', link=SHOW_ALL_XPATH)),
+        Section('freelancers', 'https://www.freelance.de/Freelancer', 'freelances',
+                ListSpec(LIST_SELECTORS['freelancers'], './/a', COUNT_XPATHS['freelancers'],
+                         href_attr='href', label_cut='('),
+                follow=True,
+                expand=Expand('a.badge:has-text("Alle anzeigen")', link=SHOW_ALL_XPATH)),
+    ],
+    consent=Consent('https://www.freelance.de', '#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll',
+                    '#CybotCookiebotDialog', 'CookieConsent'),
+    route_policy=RoutePolicy(allow_hosts=('cookiebot.com',)),
+)
+
+FREELANCERMAP_DE = Source(
+    'freelancermap.de',
+    sections=[
+        Section('jobs', 'https://www.freelancermap.de/projektboerse.html', 'projects',
+                ListSpec(f"//div[{_has_class('checkbox-item')}]", f".//span[{_has_class('item-name')}]",
+                         f".//span[{_has_class('count')}]", thousands_sep='.'),
+                ready='.show-more-button',
+                expand=Expand('.show-more-button', until_text='weniger anzeigen'),
+                settle=True),
+    ],
+    # The list is expanded click by click, so its page gets a larger wait budget
+    page_budget_ms=60000,
+)
+
+# All boards, by name; the pipeline scrapes each of them
+SOURCES = {source.name: source for source in (FREELANCE_DE, FREELANCERMAP_DE)}
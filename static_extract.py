@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Browser-free fetching of the freelance.de category lists.
+
+scrape_engine uses fetch_html for sources fetched statically and falls back
+to the browser when a page cannot be handled that way. The selectors below
+are those of sources.FREELANCE_DE, whose parse step (sources.parse_list)
+extracts the rows.
+"""
+
+import os
+import requests
+
+# XPath of the category list items
+LIST_SELECTORS = {
+    'jobs': "//div[@class='mt-2']//ul[contains(@class, 'list-inline')]//li",
+    'freelancers': "//div[@class='mt-2']//ul//li",
+}
+
+# Count badge inside a list item ('span.ms-2' for jobs, the first span for freelancers)
+COUNT_XPATHS = {
+    'jobs': ".//span[contains(concat(' ', normalize-space(@class), ' '), ' ms-2 ')]",
+    'freelancers': ".//span",
+}
+
+SHOW_ALL_XPATH = "//a[contains(concat(' ', normalize-space(@class), ' '), ' badge ')][contains(., 'Alle anzeigen')]"
+
+REQUEST_TIMEOUT = float(os.getenv('SCRAPER_REQUEST_TIMEOUT', 20))
+USER_AGENT = os.getenv(
+    'SCRAPER_USER_AGENT',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36'
+)
+
+
+class StaticFetchError(Exception):
+    """Raised when a page cannot be extracted without a browser."""
+
+
+def new_session():
+    """Create an HTTP session with browser-like headers."""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
+    })
+    return session
+
+
+def fetch_html(session, url):
+    """GET a page and return its HTML text."""
+    try:
+        response = session.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        raise StaticFetchError(f"request failed: {e}") from e
+    return response.text
+
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+"""
+Incrementally maintained trend statistics.
+
+The store keeps, per category group, the running totals, the values of the
+first and of the last WINDOW_DAYS dates with a rolling sum over the latter,
+and weekly buckets (days and sums per ISO week). Per category it keeps the
+daily values of the trend window (the last TREND_MONTHS months), from which
+the first and last value of every category in the window are read.
+
+Adding a day costs O(groups) for the group statistics plus one dict per day
+for the category window, so the reports never rescan the history. A date
+that is already in the store is replaced as long as it is one of the last
+WINDOW_DAYS dates, which covers the late upserts the report cache re-reads.
+Anything older requires a rebuild (see report_data.load_stats_store).
+"""
+
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+import pandas as pd
+from category_groups import RULESETS, CategoryClassifier, ruleset_version
+
+# Dates in the first/last averages of the daily trends report
+WINDOW_DAYS = 30
+
+# Months of daily category values kept for the trending report
+TREND_MONTHS = 3
+
+STORE_VERSION = 1
+
+
+class RebuildRequired(Exception):
+    """Raised when rows cannot be applied incrementally."""
+
+
+def _week_label(date):
+    year, week, _ = date.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class StatsStore:
+    """Trend statistics of one table, grouped with one rule set."""
+
+    def __init__(self, ruleset='trends'):
+        self.ruleset = ruleset
+        self.rules_version = ruleset_version(RULESETS[ruleset])
+        self.classifier = CategoryClassifier(RULESETS[ruleset])
+        self._group_of = {}
+
+        self.groups = set()
+        self.n_days = 0
+        self.last_date = None
+        self.totals = defaultdict(int)
+        self.first = []      # [(date, {group: num})] of the first WINDOW_DAYS dates
+        self.recent = []     # [(date, {group: num})] of the last WINDOW_DAYS dates
+        self.rolling = defaultdict(int)
+        self.weekly = {}     # week label -> [days, {group: num}]
+        self.trend_days = []  # [(date, {category: num})] of the trend window
+
+    # Persistence
+
+    def to_dict(self):
+        return {
+            'store_version': STORE_VERSION,
+            'ruleset': self.ruleset,
+            'rules_version': self.rules_version,
+            'groups': sorted(self.groups),
+            'n_days': self.n_days,
+            'last_date': self.last_date,
+            'totals': dict(self.totals),
+            'first': self.first,
+            'recent': self.recent,
+            'rolling': dict(self.rolling),
+            'weekly': self.weekly,
+            'trend_days': self.trend_days,
+        }
+
+    @classmethod
+    def from_dict(cls, data, ruleset='trends'):
+        """Restore a store; returns None if it was built with other rules or format."""
+        store = cls(ruleset)
+        if (data.get('store_version') != STORE_VERSION or data.get('ruleset') != ruleset
+                or data.get('rules_version') != store.rules_version):
+            return None
+        store.groups = set(data['groups'])
+        store.n_days = data['n_days']
+        store.last_date = data['last_date']
+        store.totals.update(data['totals'])
+        store.first = [tuple(day) for day in data['first']]
+        store.recent = [tuple(day) for day in data['recent']]
+        store.rolling.update(data['rolling'])
+        store.weekly = data['weekly']
+        store.trend_days = [tuple(day) for day in data['trend_days']]
+        return store
+
+    @classmethod
+    def load(cls, path, ruleset='trends'):
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            return cls.from_dict(json.loads(path.read_text()), ruleset)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable statistics store {path.name}: {e}")
+            return None
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(self.to_dict()))
+        os.replace(tmp_path, path)
+
+    # Updates
+
+    def resume_date(self, recheck_days):
+        """First date to re-read from the table, or None for a full read."""
+        if self.last_date is None:
+            return None
+        return (pd.Timestamp(self.last_date) - pd.Timedelta(days=recheck_days)).strftime("%Y-%m-%d")
+
+    def _group(self, category):
+        group = self._group_of.get(category)
+        if group is None:
+            group = self._group_of[category] = self.classifier.classify(category)
+        return group
+
+    def update(self, df):
+        """
+        Apply rows with date, category and num columns.
+
+        Days after the last stored date are appended; days among the last
+        WINDOW_DAYS stored dates replace the stored values.
+
+        Raises:
+            RebuildRequired: if a day is older than that, or missing in between
+        """
+        if df.empty:
+            return
+        df = df[['date', 'category', 'num']]
+        for date, day in df.groupby(df['date'].dt.strftime("%Y-%m-%d"), sort=True):
+            categories = day.groupby('category', observed=True)['num'].sum()
+            by_category = {str(c): int(n) for c, n in categories.items()}
+            by_group = defaultdict(int)
+            for category, num in by_category.items():
+                by_group[self._group(category)] += num
+            self.add_day(date, dict(by_group), by_category)
+
+    def add_day(self, date, by_group, by_category):
+        """Append or replace one day given its group and category totals."""
+        recent_dates = [d for d, _ in self.recent]
+        if self.last_date is not None and date <= self.last_date:
+            if date not in recent_dates:
+                raise RebuildRequired(f"{date} is not among the last {WINDOW_DAYS} stored dates")
+            self._replace_day(date, by_group, by_category)
+            return
+
+        self.groups.update(by_group)
+        self.n_days += 1
+        self.last_date = date
+        for group, num in by_group.items():
+            self.totals[group] += num
+            self.rolling[group] += num
+
+        bucket = self.weekly.setdefault(_week_label(pd.Timestamp(date)), [0, {}])
+        bucket[0] += 1
+        for group, num in by_group.items():
+            bucket[1][group] = bucket[1].get(group, 0) + num
+
+        if len(self.first) < WINDOW_DAYS:
+            self.first.append((date, by_group))
+        self.recent.append((date, by_group))
+        if len(self.recent) > WINDOW_DAYS:
+            _, dropped = self.recent.pop(0)
+            for group, num in dropped.items():
+                self.rolling[group] -= num
+
+        self.trend_days.append((date, by_category))
+        window_start = (pd.Timestamp(date) - pd.DateOffset(months=TREND_MONTHS)).strftime("%Y-%m-%d")
+        while self.trend_days and self.trend_days[0][0] < window_start:
+            self.trend_days.pop(0)
+
+    def _replace_day(self, date, by_group, by_category):
+        index = next(i for i, (d, _) in enumerate(self.recent) if d == date)
+        old = self.recent[index][1]
+        self.groups.update(by_group)
+
+        bucket = self.weekly[_week_label(pd.Timestamp(date))][1]
+        for group in set(old) | set(by_group):
+            diff = by_group.get(group, 0) - old.get(group, 0)
+            self.totals[group] += diff
+            self.rolling[group] += diff
+            bucket[group] = bucket.get(group, 0) + diff
+
+        self.recent[index] = (date, by_group)
+        self.first = [(d, by_group if d == date else values) for d, values in self.first]
+        self.trend_days = [(d, by_category if d == date else values) for d, values in self.trend_days]
+
+    # Statistics
+
+    def group_means(self):
+        """Mean daily total per group over all dates (0 on dates without rows)."""
+        groups = sorted(self.groups)
+        return pd.Series([self.totals[g] / self.n_days for g in groups], index=groups, dtype=float)
+
+    def first_mean(self, group):
+        """Mean daily total of `group` over the first WINDOW_DAYS dates."""
+        return sum(values.get(group, 0) for _, values in self.first) / len(self.first)
+
+    def last_mean(self, group):
+        """Mean daily total of `group` over the last WINDOW_DAYS dates (rolling sum)."""
+        return self.rolling[group] / len(self.recent)
+
+    def weekly_means(self):
+        """Mean daily total per ISO week (rows, labelled like '2025-W07') and group (columns)."""
+        groups = sorted(self.groups)
+        weeks = sorted(self.weekly)
+        return pd.DataFrame([[self.weekly[w][1].get(g, 0) / self.weekly[w][0] for g in groups]
+                             for w in weeks], index=weeks, columns=groups)
+
+    def window_first_last(self, categories):
+        """
+        First and last value of each of `categories` in the trend window.
+
+        The first date is the earliest window date on which any of the
+        categories has a row and the last date the latest stored date.
+        Values are NaN where a category has no row on that date.
+
+        Returns:
+            (first_date, last_date, DataFrame indexed by category with
+            first_value and last_value)
+        """
+        categories = [str(c) for c in categories]
+        first_date, first_values = next(((d, values) for d, values in self.trend_days
+                                         if any(c in values for c in categories)), (None, {}))
+        last_date, last_values = self.trend_days[-1] if self.trend_days else (None, {})
+        frame = pd.DataFrame({
+            'first_value': [first_values.get(c, float('nan')) for c in categories],
+            'last_value': [last_values.get(c, float('nan')) for c in categories],
+        }, index=categories)
+        return (pd.Timestamp(first_date) if first_date else None,
+                pd.Timestamp(last_date) if last_date else None, frame)
@@ -4,6 +4,7 @@ import streamlit as st
 from datetime import timedelta
 import math
 import altair as alt
+from sqlalchemy import text
 
     
 project_path = os.path.dirname(os.path.realpath(__file__))
@@ -19,32 +20,64 @@ buy_me_a_coffee_html = """
 # Initialize connection using Streamlit's recommended approach
 conn = st.connection('mysql', type='sql')
 
-# Read data from both tables
-projects_df = conn.query("""
-    SELECT 
-        date,
-        category as job_group,
-        num
-    FROM projects ORDER BY date DESC
-""", ttl=600)
-
-freelancers_df = conn.query("""
-    SELECT 
-        date,
-        category as job_group,
-        num
-    FROM freelances ORDER BY date DESC
-""", ttl=600)
-
-# Convert date columns to datetime
-projects_df['date'] = pd.to_datetime(projects_df['date'])
-freelancers_df['date'] = pd.to_datetime(freelancers_df['date'])
+# Jobs groups shown when the dashboard opens
+DEFAULT_JOB_GROUPS = ["SQL", "ERP / CRM Systeme", "SAP", "Web", "Softwareentwicklung / -programmierung"]
+
+
+@st.cache_data(ttl=3600)
+def load_job_groups():
+    """Distinct job groups of the projects table, cached separately from the data."""
+    groups = pd.read_sql(text("SELECT DISTINCT category AS job_group FROM projects ORDER BY job_group"),
+                         conn.engine)
+    return groups['job_group'].tolist()
+
+
+@st.cache_data(ttl=600)
+def load_date_bounds():
+    """First and last date of the projects table."""
+    bounds = pd.read_sql(text("SELECT MIN(date) AS min_date, MAX(date) AS max_date FROM projects"), conn.engine)
+    return pd.to_datetime(bounds['min_date'].iloc[0]).date(), pd.to_datetime(bounds['max_date'].iloc[0]).date()
+
+
+@st.cache_data(ttl=600)
+def load_series(table_name, start_date, end_date, job_groups):
+    """
+    Daily values and day-over-day differences of `table_name` for the
+    selected date range and job groups.
+
+    Reads the dense rows materialized by daily_series.py, so the charts can
+    use them as they are. Cached per (table, date range, job groups);
+    `job_groups` is a sorted tuple so the same selection in any order hits
+    the same entry.
+    """
+    if not job_groups:
+        return pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'), 'job_group': pd.Series(dtype=object),
+                             'num': pd.Series(dtype='int64'), 'diff': pd.Series(dtype='int64')})
+
+    placeholders = ', '.join(f':group_{i}' for i in range(len(job_groups)))
+    params = {'series': table_name, 'start_date': start_date, 'end_date': end_date}
+    params.update({f'group_{i}': group for i, group in enumerate(job_groups)})
+    df = pd.read_sql(text(f"""
+        SELECT 
+            date,
+            category as job_group,
+            num,
+            diff
+        FROM daily_series
+        WHERE series = :series
+          AND date BETWEEN :start_date AND :end_date
+          AND category IN ({placeholders})
+        ORDER BY date, job_group
+    """), conn.engine, params=params)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
 
 # Sidebar 
 st.sidebar.header('Filters')
 
 # Date Slider - use projects date range since that's what we're primarily interested in
-min_date, max_date = projects_df['date'].min().date(), projects_df['date'].max().date()
+min_date, max_date = load_date_bounds()
 
 _ago_date = max_date - timedelta(days=90)
 
@@ -55,46 +88,16 @@ selected_date_range = st.sidebar.slider("Select Date Range:",
                                      )
 
 # Job Group Multiselect - use unique categories from projects
-job_groups = projects_df['job_group'].unique()
-selected_job_groups = st.sidebar.multiselect("Select Job Groups:", job_groups, default=["SQL","ERP / CRM Systeme", "SAP", "Web", "Softwareentwicklung / -programmierung"])
-
-# Filter data based on selections
-start_date, end_date = pd.to_datetime(selected_date_range[0]), pd.to_datetime(selected_date_range[1])
-
-filtered_projects = projects_df[
-    (projects_df['date'] >= start_date) & 
-    (projects_df['date'] <= end_date) &
-    (projects_df['job_group'].isin(selected_job_groups))
-]
-
-filtered_freelancers = freelancers_df[
-    (freelancers_df['date'] >= start_date) & 
-    (freelancers_df['date'] <= end_date) &
-    (freelancers_df['job_group'].isin(selected_job_groups))
-]
-
-# Preparing data for the line charts
-job_pivot_df = filtered_projects.pivot_table(
-    index='date', 
-    columns='job_group', 
-    values='num', 
-    aggfunc='sum'
-).fillna(0)
-
-expert_pivot_df = filtered_freelancers.pivot_table(
-    index='date', 
-    columns='job_group', 
-    values='num', 
-    aggfunc='sum'
-).fillna(0)
-
+job_groups = load_job_groups()
+selected_job_groups = st.sidebar.multiselect("Select Job Groups:", job_groups,
+                                             default=[g for g in DEFAULT_JOB_GROUPS if g in job_groups])
 
+# Only the selected range and groups are queried
+start_date, end_date = selected_date_range
+selection = (start_date, end_date, tuple(sorted(selected_job_groups)))
 
-# Calculate the daily differences for jobs
-job_daily_diff = job_pivot_df.diff().fillna(0)  # Calculate day-to-day difference and fill NaN with 0
-
-# Calculate the daily differences for experts
-expert_daily_diff = expert_pivot_df.diff().fillna(0)  # Similar calculation for experts
+filtered_projects = load_series('projects', *selection)
+filtered_freelancers = load_series('freelances', *selection)
 
 st.title('Germany\'s freelancer market in daily numbers')
 st.markdown(buy_me_a_coffee_html, unsafe_allow_html=True)
@@ -102,9 +105,9 @@ st.markdown(buy_me_a_coffee_html, unsafe_allow_html=True)
 st.header('Jobs :money_with_wings:')
 
 # Plotting with st.altair_chart to rotate labels
-job_chart = alt.Chart(job_pivot_df.reset_index().melt('date')).mark_line().encode(
+job_chart = alt.Chart(filtered_projects).mark_line().encode(
     x=alt.X('date:T', axis=alt.Axis(labelAngle=45)), 
-    y='value:Q', 
+    y=alt.Y('num:Q', title='value'), 
     color='job_group:N'
 ).properties(
     width=800,
@@ -116,9 +119,9 @@ st.altair_chart(job_chart)
 
 # Visualize the daily differences
 st.header('Daily Difference in Jobs :chart_with_upwards_trend:')
-daily_diff_chart_jobs = alt.Chart(job_daily_diff.reset_index().melt('date')).mark_bar().encode(
+daily_diff_chart_jobs = alt.Chart(filtered_projects).mark_bar().encode(
     x=alt.X('date:T', axis=alt.Axis(labelAngle=45)), 
-    y='value:Q', 
+    y=alt.Y('diff:Q', title='value'), 
     color='job_group:N'
 ).properties(
     width=800,
@@ -128,9 +131,9 @@ daily_diff_chart_jobs = alt.Chart(job_daily_diff.reset_index().melt('date')).mar
 st.altair_chart(daily_diff_chart_jobs)
 
 st.header('Daily Difference in Experts :chart_with_upwards_trend:')
-daily_diff_chart_experts = alt.Chart(expert_daily_diff.reset_index().melt('date')).mark_bar().encode(
+daily_diff_chart_experts = alt.Chart(filtered_freelancers).mark_bar().encode(
     x=alt.X('date:T', axis=alt.Axis(labelAngle=45)), 
-    y='value:Q', 
+    y=alt.Y('diff:Q', title='value'), 
     color='job_group:N'
 ).properties(
     width=800,
@@ -149,14 +152,4 @@ st.dataframe(filtered_projects)  # Use st.table(filtered_projects) for a static
 st.subheader("Filtered Freelancers Data")
 st.dataframe(filtered_freelancers)
 
-st.header("Debugging: Original DataFrames")
-
-# Show the filtered projects table
-st.subheader("Projects Data")
-st.dataframe(projects_df)  
-
-# Show the filtered freelancers table
-st.subheader("Freelancers Data")
-st.dataframe(freelancers_df)
-
 # Note: Streamlit connections are automatically managed
@@ -0,0 +1,26 @@
+import pickle
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from build_cache import fingerprint
+
+
+def test_object_arrays_are_fingerprinted_by_value():
+    values = np.array(['Python', 'Java', 'SAP'], dtype=object)
+    # A pickle round trip gives equal strings at other addresses, like a new process would
+    copy = pickle.loads(pickle.dumps(values))
+
+    assert fingerprint(values) == fingerprint(copy)
+    assert fingerprint(values) != fingerprint(np.array(['Python', 'Java', 'SAP-Basis'], dtype=object))
+
+
+def test_extension_arrays_are_fingerprinted_in_full():
+    values = pd.array([f"category {i}" for i in range(1000)], dtype='string')
+    changed = values.copy()
+    changed[500] = 'changed'
+
+    assert fingerprint(values) != fingerprint(changed)
@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from correlation_engine import correlation_frame, top_correlated_pairs, top_pairs_of_frame
+
+
+def test_top_pairs_of_frame_match_top_correlated_pairs():
+    rng = np.random.default_rng(1)
+    frame = pd.DataFrame(rng.integers(0, 50, (200, 40)).astype(float), columns=[f"g{i}" for i in range(40)])
+    frame['constant'] = 3.0
+
+    expected = top_correlated_pairs(frame, k=10)
+    actual = top_pairs_of_frame(correlation_frame(frame), k=10)
+
+    for want, got in zip(expected, actual):
+        pd.testing.assert_frame_equal(got, want)
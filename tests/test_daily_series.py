@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from daily_series import build_daily_series, collation_key
+
+
+def rows(*records):
+    df = pd.DataFrame(records, columns=['date', 'category', 'num'])
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def test_case_and_trailing_space_variants_are_one_category():
+    df = rows(('2025-01-01', 'Java', 10), ('2025-01-02', 'java', 12), ('2025-01-03', 'Java ', 15),
+              ('2025-01-01', 'Python', 5), ('2025-01-03', 'Python', 7))
+
+    daily = build_daily_series(df)
+
+    keys = daily.assign(key=daily['category'].map(collation_key))
+    assert not keys.duplicated(['date', 'key']).any()
+    # All three spellings are counted under one name
+    java = daily[daily['category'].map(collation_key) == 'java']
+    assert java['category'].nunique() == 1
+    assert java['num'].tolist() == [10, 12, 15]
+    assert java['diff'].tolist() == [0, 2, 3]
+    assert daily[daily['category'] == 'Python']['num'].tolist() == [5, 0, 7]
+
+
+def test_variants_of_materialized_categories_keep_the_materialized_name():
+    df = rows(('2025-01-05', 'JAVA', 20), ('2025-01-06', 'java  ', 22))
+    base = pd.Series({'Java': 18}, dtype='int64')
+
+    daily = build_daily_series(df, categories={'Java', 'Rust'}, base=base)
+
+    assert sorted(daily['category'].unique()) == ['Java', 'Rust']
+    java = daily[daily['category'] == 'Java']
+    assert java['num'].tolist() == [20, 22]
+    assert java['diff'].tolist() == [2, 2]
@@ -0,0 +1,26 @@
+import io
+import sys
+from pathlib import Path
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db_utils import _write_infile_chunk
+
+
+def test_infile_chunk_rejects_rows_without_a_valid_date():
+    df = pd.DataFrame({'date': ['2024-01-02', 'not a date', None], 'category': ['a', 'b', 'c'], 'num': [1, 2, 3]})
+    handle = io.StringIO()
+
+    with pytest.raises(ValueError, match=r"2 rows without a valid date \(row 1: 'not a date', row 2: "):
+        _write_infile_chunk(df, handle)
+    assert handle.getvalue() == ''
+
+
+def test_infile_chunk_writes_normalized_rows():
+    df = pd.DataFrame({'date': ['2024-01-02'], 'category': ['C\tD'], 'num': [5], 'href': [None]})
+    handle = io.StringIO()
+
+    assert _write_infile_chunk(df, handle) == 1
+    assert handle.getvalue() == '2024-01-02\tC\\tD\t5\t\\N\n'
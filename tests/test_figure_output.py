@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def import_with_profile(value):
+    """Output of importing figure_output in a fresh process with REPORT_FIGURE_PROFILE=`value`."""
+    env = dict(os.environ, REPORT_FIGURE_PROFILE=value, MPLBACKEND='Agg')
+    return subprocess.run([sys.executable, '-c', "import figure_output; print(figure_output.active_profile()['name'])"],
+                          cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout.splitlines()
+
+
+def test_unknown_profile_in_the_environment_falls_back_to_print():
+    warning, active = import_with_profile('poster')
+    assert "Unknown figure profile 'poster'" in warning
+    assert active == 'print'
+
+
+def test_profile_from_the_environment_is_used():
+    assert import_with_profile('vector') == ['vector']
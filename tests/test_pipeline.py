@@ -0,0 +1,47 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pipeline
+from pipeline import Pipeline, Stage
+
+
+def test_threaded_stage_is_not_retried_after_a_timeout():
+    running = []
+    release = threading.Event()
+
+    def work():
+        running.append(1)
+        release.wait(0.5)
+
+    async def stage_func(session):
+        await asyncio.to_thread(work)
+
+    stage = Stage('db', stage_func, timeout=0.1, retries=2, threaded=True)
+    try:
+        assert asyncio.run(Pipeline([stage]).run()) is False
+    finally:
+        release.set()
+    assert stage.status == 'FAILED'
+    assert stage.attempts == 1
+    assert len(running) == 1
+
+
+def test_async_stage_is_retried_after_a_timeout(monkeypatch):
+    monkeypatch.setattr(pipeline, 'RETRY_DELAY', 0)
+    calls = []
+
+    async def stage_func(session):
+        calls.append(time.perf_counter())
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+        return 'done'
+
+    stage = Stage('scrape', stage_func, timeout=0.1, retries=1)
+    assert asyncio.run(Pipeline([stage]).run()) is True
+    assert stage.attempts == 2
+    assert stage.result == 'done'
@@ -0,0 +1,65 @@
+import asyncio
+import sys
+from pathlib import Path
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from replay import PageArchive, Replay
+from scrape_engine import ScrapeEngine
+
+PAGE_URL = 'https://www.freelancermap.de/projektboerse.html'
+XHR_URL = 'https://www.freelancermap.de/api/categories?page=2'
+
+
+class FakeRoute:
+    """The parts of a Playwright route the replay handler uses."""
+
+    def __init__(self, url):
+        self.request = type('Request', (), {'url': url})()
+        self.outcome = None
+
+    async def fallback(self):
+        self.outcome = ('fallback',)
+
+    async def abort(self):
+        self.outcome = ('abort',)
+
+    async def fulfill(self, status, headers, body):
+        self.outcome = ('fulfill', status, headers['content-type'], body)
+
+
+def archive(tmp_path):
+    archive = PageArchive(tmp_path)
+    archive.record(PAGE_URL, '<html><body><div class="checkbox-item"></div></body></html>',
+                   source='freelancermap.de')
+    archive.record(XHR_URL, b'{"items": ["SAP"]}', content_type='application/json', source='freelancermap.de')
+    archive.save()
+    return PageArchive(tmp_path)
+
+
+def route(engine, url):
+    fake = FakeRoute(url)
+    asyncio.run(engine._replay_route(fake))
+    return fake.outcome
+
+
+def test_stand_in_serves_the_recorded_page(tmp_path):
+    with Replay(archive(tmp_path)) as replay:
+        response = requests.get(replay.map_url(PAGE_URL), timeout=5)
+        missing = requests.get(replay.map_url('https://www.freelancermap.de/other'), timeout=5)
+    assert response.status_code == 200
+    assert 'checkbox-item' in response.text
+    assert missing.status_code == 404
+
+
+def test_recorded_xhr_is_served_and_unrecorded_requests_are_aborted(tmp_path):
+    with Replay(archive(tmp_path)) as replay:
+        engine = ScrapeEngine(session=object(), replay=replay)
+
+        assert route(engine, XHR_URL) == ('fulfill', 200, 'application/json', b'{"items": ["SAP"]}')
+        assert route(engine, 'https://cdn.example.com/app.js') == ('abort',)
+        assert route(engine, replay.map_url(PAGE_URL)) == ('fallback',)
+
+        assert replay.fulfilled == 1
+        assert replay.misses == ['https://cdn.example.com/app.js']
@@ -0,0 +1,113 @@
+import asyncio
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import scrape_engine
+from scrape_engine import PageCache, PageNotReady, ScrapeEngine
+from sources import Expand, ListSpec, Section, Source, Target
+from wait_utils import CrawlStats
+
+LIST = "<html><body><ul>{}</ul></body></html>"
+ITEM = '<li><a href="/{0}">{0}</a><span>({1})</span></li>'
+
+
+def source(follow=False):
+    """A static source whose start page links to one page per row."""
+    spec = ListSpec('//ul/li', './/a', './/span', href_attr='href', label_cut='(')
+    return Source('example.test', [Section('jobs', 'https://example.test/start', 'projects', spec, follow=follow)],
+                  fetch_mode='static')
+
+
+def crawl(pages, tmp_path):
+    def fetch_html(session, url):
+        return pages[url]
+    scrape_engine.fetch_html, original = fetch_html, scrape_engine.fetch_html
+    scrape_engine.new_session, original_session = (lambda: None), scrape_engine.new_session
+    try:
+        engine = ScrapeEngine(session=object(), cache=PageCache(tmp_path, ttl=60), delay=0)
+        return engine, asyncio.run(engine.run_source(source(follow=True)))
+    finally:
+        scrape_engine.fetch_html, scrape_engine.new_session = original, original_session
+
+
+def test_complete_pages_are_cached_per_crawl_date(tmp_path):
+    pages = {
+        'https://example.test/start': LIST.format(ITEM.format('a', 3) + ITEM.format('b', 4)),
+        'https://example.test/a': LIST.format(ITEM.format('a1', 1)),
+        'https://example.test/b': LIST.format(''),
+    }
+    engine, results = crawl(pages, tmp_path)
+
+    assert [row['category'] for row in results['projects']] == ['a', 'a1', 'b']
+    date = engine._dates['example.test']
+    assert sorted(p.parent.name for p in tmp_path.rglob('*.html')) == [date, date]
+    assert engine.metrics['example.test'].empty_pages == 1
+
+
+def test_start_page_without_rows_fails_and_is_not_cached(tmp_path):
+    pages = {'https://example.test/start': '<html><body><ul><li>no link</li></ul></body></html>'}
+    with pytest.raises(PageNotReady):
+        crawl(pages, tmp_path)
+    assert not list(tmp_path.rglob('*.html'))
+
+
+class FakePage:
+    async def goto(self, url, wait_until=None):
+        pass
+
+    async def content(self):
+        return LIST.format(ITEM.format('a1', 1))
+
+
+def fetch_browser(depth):
+    """_fetch_browser of a page at `depth` whose list fails to expand."""
+    async def ready(page, selector, timer, **kwargs):
+        return True
+
+    async def expand(page, expand, items, timer):
+        raise RuntimeError("button detached")
+
+    section = Section('jobs', 'https://example.test/start', 'projects', source().sections[0].items,
+                      expand=Expand('button'))
+    src = Source('example.test', [section])
+    engine = ScrapeEngine(session=object(), cache=PageCache(ttl=0), delay=0)
+    engine.stats[src.name] = CrawlStats(src.name)
+    engine._pools[src.name] = pool = scrape_engine._PagePool(None, 1, None)
+    pool.put(FakePage())
+    engine._expand = expand
+    scrape_engine.wait_for_selector_async, original = ready, scrape_engine.wait_for_selector_async
+    try:
+        return asyncio.run(engine._fetch_browser(src, Target(section.url, section, depth=depth)))
+    finally:
+        scrape_engine.wait_for_selector_async = original
+
+
+def test_failed_expansion_fails_a_start_page_only():
+    with pytest.raises(PageNotReady):
+        fetch_browser(depth=0)
+    assert 'a1' in fetch_browser(depth=1)
+
+
+def test_page_pool_frees_the_slot_of_a_page_it_could_not_open():
+    class Context:
+        calls = 0
+
+        async def new_page(self):
+            Context.calls += 1
+            if Context.calls == 1:
+                raise RuntimeError("target closed")
+            return FakePage()
+
+    async def setup(page):
+        pass
+
+    async def get_twice():
+        pool = scrape_engine._PagePool(Context(), 1, setup)
+        with pytest.raises(RuntimeError):
+            await pool.get()
+        return await asyncio.wait_for(pool.get(), 1)
+
+    assert isinstance(asyncio.run(get_twice()), FakePage)
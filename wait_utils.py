@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+Readiness waits and per-page timing shared by the scrapers.
+
+Instead of sleeping for a fixed time, the scrapers wait for a selector, for
+the network to go idle or for a list to grow. All waits on one page draw from
+a single timeout budget, and every page visit is timed so a crawl can report
+where its time went.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+# Total time all waits on a single page may take, in milliseconds
+PAGE_WAIT_BUDGET_MS = int(os.getenv('SCRAPER_WAIT_BUDGET_MS', 15000))
+
+# Resolves once the list matched by `selector` holds more than `count` items,
+# or once the text of the watched element changes. XPath selectors start with '//'.
+_LIST_GROWTH_JS = """
+([selector, count, watch, text]) => {
+    let length;
+    if (selector.startsWith('//')) {
+        length = document.evaluate(selector, document, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+    } else {
+        length = document.querySelectorAll(selector).length;
+    }
+    if (length > count) return true;
+    return watch !== null && watch.innerText.trim() !== text;
+}
+"""
+
+_LIST_COUNT_JS = """
+(selector) => selector.startsWith('//')
+    ? document.evaluate(selector, document, null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength
+    : document.querySelectorAll(selector).length
+"""
+
+
+class PageTimer:
+    """Wall-clock timer and wait budget for a single page visit."""
+
+    def __init__(self, url, budget_ms=PAGE_WAIT_BUDGET_MS):
+        self.url = url
+        self.started = time.perf_counter()
+        self.deadline = self.started + budget_ms / 1000
+        self.seconds = 0.0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        # Traffic of the visit, when the page has a route_policy meter
+        self.bytes = 0
+        self.blocked = 0
+
+    def remaining_ms(self):
+        """Milliseconds left in the wait budget."""
+        return max(0, int((self.deadline - time.perf_counter()) * 1000))
+
+    def add_wait(self, seconds, timed_out=False):
+        self.wait_seconds += seconds
+        if timed_out:
+            self.timeouts += 1
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+
+
+class CrawlStats:
+    """Collects PageTimer results for one crawl and prints a summary."""
+
+    def __init__(self, name):
+        self.name = name
+        self.pages = []
+
+    @contextmanager
+    def page(self, url, budget_ms=PAGE_WAIT_BUDGET_MS, meter=None):
+        """
+        Time a page visit; the yielded timer is passed to the wait functions.
+
+        With the route_policy meter of the page, the bytes received and the
+        requests blocked during the visit are recorded and logged as well.
+        """
+        timer = PageTimer(url, budget_ms)
+        start_bytes, start_blocked = (meter.bytes, meter.blocked) if meter is not None else (0, 0)
+        try:
+            yield timer
+        finally:
+            timer.finish()
+            if meter is not None:
+                timer.bytes = meter.bytes - start_bytes
+                timer.blocked = meter.blocked - start_blocked
+                print(f"  loaded {url} in {timer.seconds:.2f}s, {timer.bytes / 1024:.0f} KB received, "
+                      f"{timer.blocked} requests blocked")
+            self.pages.append(timer)
+
+    def summary(self):
+        """Return aggregate timing figures for the crawl."""
+        durations = sorted(timer.seconds for timer in self.pages)
+        if not durations:
+            return {'pages': 0, 'total_seconds': 0.0, 'wait_seconds': 0.0,
+                    'mean_seconds': 0.0, 'p95_seconds': 0.0, 'max_seconds': 0.0, 'timeouts': 0,
+                    'bytes': 0, 'blocked': 0}
+        p95_index = min(len(durations) - 1, int(round(0.95 * (len(durations) - 1))))
+        return {
+            'pages': len(durations),
+            'total_seconds': sum(durations),
+            'wait_seconds': sum(timer.wait_seconds for timer in self.pages),
+            'mean_seconds': sum(durations) / len(durations),
+            'p95_seconds': durations[p95_index],
+            'max_seconds': durations[-1],
+            'timeouts': sum(timer.timeouts for timer in self.pages),
+            'bytes': sum(timer.bytes for timer in self.pages),
+            'blocked': sum(timer.blocked for timer in self.pages),
+        }
+
+    def print_summary(self):
+        s = self.summary()
+        print(f"[{self.name}] {s['pages']} pages in {s['total_seconds']:.1f}s page time "
+              f"({s['wait_seconds']:.1f}s waiting), mean {s['mean_seconds']:.2f}s, "
+              f"p95 {s['p95_seconds']:.2f}s, max {s['max_seconds']:.2f}s, "
+              f"{s['timeouts']} wait timeouts, {s['bytes'] / 1024 ** 2:.1f} MB received, "
+              f"{s['blocked']} requests blocked")
+
+
+async def _timed_wait_async(timer, wait):
+    """Run a Playwright wait against the timer's remaining budget."""
+    remaining = timer.remaining_ms()
+    if remaining <= 0:
+        # A timeout of 0 disables Playwright's timeout, so never pass it on
+        timer.add_wait(0.0, timed_out=True)
+        return False
+    started = time.perf_counter()
+    try:
+        await wait(remaining)
+        timer.add_wait(time.perf_counter() - started)
+        return True
+    except PlaywrightTimeoutError:
+        timer.add_wait(time.perf_counter() - started, timed_out=True)
+        return False
+
+
+async def wait_for_selector_async(page, selector, timer, state='attached'):
+    """Wait until `selector` reaches `state`. Returns False if the budget ran out."""
+    return await _timed_wait_async(timer, lambda ms: page.wait_for_selector(selector, state=state, timeout=ms))
+
+
+async def wait_for_network_idle_async(page, timer):
+    """Wait until the page has had no network activity for 500 ms."""
+    return await _timed_wait_async(timer, lambda ms: page.wait_for_load_state('networkidle', timeout=ms))
+
+
+async def count_list_items_async(page, selector):
+    """Number of elements matched by a CSS or XPath selector."""
+    return await page.evaluate(_LIST_COUNT_JS, selector)
+
+
+async def wait_for_list_growth_async(page, selector, previous_count, timer, watch=None):
+    """
+    Wait until the list matched by `selector` has more than `previous_count` items.
+
+    If `watch` is an element handle, a change of its text (e.g. a "show more"
+    button turning into "show less") also counts as progress.
+    """
+    text = (await watch.inner_text()).strip() if watch is not None else ''
+    return await _timed_wait_async(timer, lambda ms: page.wait_for_function(
+        _LIST_GROWTH_JS, arg=[selector, previous_count, watch, text], timeout=ms))